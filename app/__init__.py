@@ -1,4 +1,25 @@
-from app.api import *
-from app.client import *
-from app.enums import *
-from app.utils import *
\ No newline at end of file
+import importlib
+
+# Names of these subpackages are reachable as `app.<name>` (as with the former star
+# imports, later ones win), but a subpackage is only imported on first access, so
+# importing one `app` module does not pull in every dependency of the others.
+_EXPORTING = ('app.api', 'app.client', 'app.enums', 'app.utils')
+
+def __getattr__(name: str):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    for module_name in reversed(_EXPORTING):
+        module = importlib.import_module(module_name)
+        if hasattr(module, name) and not name.startswith('_'):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module 'app' has no attribute '{name}'")
+
+def __dir__() -> list:
+    return sorted(set(globals()) | {
+        name
+        for module_name in _EXPORTING
+        for name in dir(importlib.import_module(module_name))
+        if not name.startswith('_')
+    })
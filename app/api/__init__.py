@@ -1,3 +1,4 @@
 from .binance_http_client import fetch_tickers_24h, fetch_candles
 from .binance_http_parser import process_message as process_http_message
-from .binance_ws_parser import process_message as process_ws_message, STREAM_KLINE
\ No newline at end of file
+from .binance_ws_parser import process_message as process_ws_message, STREAM_KLINE, STREAM_MINI_TICKER_ARR
+from .binance_backfill import backfill_candles, BackfillReport
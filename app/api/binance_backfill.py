@@ -0,0 +1,132 @@
+import asyncio
+import random
+import time
+
+from typing import Callable
+
+from app.model import UpdateEvent
+from app.utils import unix_millis, previous_moment, seconds
+from app.enums import MarketType, TimeFrame, MessageType
+from app.api.binance_http_client import fetch_candles, max_candles_per_request
+from app.api.binance_http_parser import process_message
+
+class BackfillReport:
+    def __init__(self, requested: int, latencies: list, failed: list, elapsed: float):
+        self.requested = requested
+        self.latencies = sorted(latencies)
+        self.failed = failed
+        self.elapsed = elapsed
+
+    @property
+    def loaded(self) -> int:
+        return self.requested - len(self.failed)
+
+    @property
+    def throughput(self) -> float:
+        return self.loaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        return self.latencies[min(len(self.latencies) - 1, int(q * len(self.latencies)))]
+
+    def __str__(self):
+        return (
+            f"BackfillReport(loaded={self.loaded}/{self.requested}, elapsed={self.elapsed:.2f}s, "
+            f"throughput={self.throughput:.1f}/s, p50={self.percentile(0.5) * 1000:.0f}ms, "
+            f"p99={self.percentile(0.99) * 1000:.0f}ms, failed={[f'{s} {i}' for s, i in self.failed]})"
+        )
+
+def __retryable(error: Exception) -> bool:
+    """Timeouts, connection failures, server errors and rate limiting (418/429) are worth another attempt."""
+    import aiohttp
+    
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status in (418, 429)
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+
+async def backfill_candles(
+    market: MarketType,
+    symbols: list,
+    intervals: list,
+    model: dict,
+    limit: int = 25,
+    workers: int = 16,
+    retries: int = 3,
+    backoff: float = 0.5,
+    on_loaded: Callable[[UpdateEvent], None] = None,
+    since: dict = None
+) -> BackfillReport:
+    """
+    Loads candle history for every symbol/interval pair using a bounded pool of
+    workers. Transient failures are retried with jittered exponential backoff, other
+    errors (e.g. 400 for an unknown symbol) fail the pair at once; the request rate
+    itself is governed by the shared HTTP client's weight limiter. Latencies are
+    those of successful loads.
+
+    `since` maps (symbol, interval) to the last open time already held locally;
+    for those pairs only the gap after it is requested when it fits in `limit`.
+    A `limit` above the exchange's per-request maximum is loaded in pages.
+    """
+    queue = asyncio.Queue()
+    for symbol in symbols:
+        for interval in intervals:
+            queue.put_nowait((symbol, interval))
+    requested = queue.qsize()
+    latencies = []
+    failed = []
+
+    def requested_range(symbol: str, interval: TimeFrame) -> tuple:
+        last_open_time = since.get((symbol, interval)) if since else None
+        if last_open_time is None:
+            return None, limit
+        interval_millis = seconds(interval) * 1000
+        missing = (unix_millis(previous_moment(interval)) - last_open_time) // interval_millis
+        if missing >= limit:
+            return None, limit
+        return last_open_time + interval_millis, max(missing, 1)
+
+    def requested_pages(interval: TimeFrame, start_time: int, pair_limit: int) -> list:
+        page = max_candles_per_request(market)
+        if pair_limit <= page:
+            return [(start_time, pair_limit)]
+        interval_millis = seconds(interval) * 1000
+        if start_time is None:
+            start_time = unix_millis(previous_moment(interval)) - (pair_limit - 1) * interval_millis
+        return [
+            (start_time + offset * interval_millis, min(page, pair_limit - offset))
+            for offset in range(0, pair_limit, page)
+        ]
+
+    async def worker():
+        while not queue.empty():
+            symbol, interval = queue.get_nowait()
+            pages = requested_pages(interval, *requested_range(symbol, interval))
+            for attempt in range(retries + 1):
+                started = time.perf_counter()
+                try:
+                    data = []
+                    for start_time, page_limit in pages:
+                        data.extend(await fetch_candles(market, symbol, interval, limit=page_limit, start_time=start_time))
+                    latencies.append(time.perf_counter() - started)
+                    update_event = process_message(
+                        MessageType.CANDLE_HISTORY,
+                        market,
+                        symbol,
+                        interval,
+                        data,
+                        model
+                    )
+                    if on_loaded is not None:
+                        on_loaded(update_event)
+                    break
+                except Exception as e:
+                    if attempt == retries or not __retryable(e):
+                        print(f"Failed to load {symbol} {interval} candles: {e}")
+                        failed.append((symbol, interval))
+                        break
+                    await asyncio.sleep(backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(min(workers, requested))])
+    return BackfillReport(requested, latencies, failed, time.perf_counter() - started)
@@ -1,24 +1,24 @@
 import asyncio
-import pyjq
 
 from urllib.parse import urlencode
-from aiohttp import hdrs
 
-from app.client import execute_http_request
+from app.client import http_client
 from app.utils import unix_millis, previous_moment
 from app.enums import MarketType, TimeFrame
 
 async def fetch_exchange_info(market: MarketType) -> dict:
-    response = await execute_http_request(
-        hdrs.METH_GET, 
-        f"{__build_uri_base(market)}/exchangeInfo"
+    response = await http_client.request(
+        'GET', 
+        f"{__build_uri_base(market)}/exchangeInfo",
+        weight=1
     ) 
     return response;
 
-async def fetch_tickers_24h(market: MarketType) -> dict:
-    response = await execute_http_request(
-        hdrs.METH_GET, 
-        f"{__build_uri_base(market)}/ticker/24hr"
+async def fetch_tickers_24h(market: MarketType, base_uri: str = None) -> dict:
+    response = await http_client.request(
+        'GET', 
+        f"{base_uri or __build_uri_base(market)}/ticker/24hr",
+        weight=40
     ) 
     return response;
 
@@ -26,7 +26,8 @@ async def fetch_candles(
     market: MarketType, 
     symbol: str, 
     interval: TimeFrame, 
-    limit=25
+    limit=25,
+    start_time: int = None
 ) -> dict:
     base_url = f"{__build_uri_base(market)}/klines"
     params = {
@@ -35,11 +36,26 @@ async def fetch_candles(
         'endTime': unix_millis(previous_moment(interval)),
         'limit': limit
     } 
-    return await execute_http_request(
-        method=hdrs.METH_GET, 
+    if start_time is not None:
+        params['startTime'] = start_time
+    return await http_client.request(
+        method='GET', 
         url=f"{base_url}?{urlencode(params)}",
+        weight=__candles_weight(limit)
     );
 
+def max_candles_per_request(market: MarketType) -> int:
+    return 1500 if market == MarketType.FUTURES else 1000
+
+def __candles_weight(limit: int) -> int:
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
 def __build_uri_base(marketType: MarketType) -> str:
     if MarketType.FUTURES == marketType:
         return 'https://fapi.binance.com/fapi/v1'
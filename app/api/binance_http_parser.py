@@ -8,13 +8,19 @@ def __parse_candles(
     message: list, 
     model: dict
 ) -> UpdateEvent:
-    for _, item in enumerate(message):
-        timestamp = item[0]
-        candle = model['ohlc'][market.value][symbol][interval.value][timestamp]
-        candle['open'] = item[1]
-        candle['high'] = item[2]
-        candle['low'] = item[3]
-        candle['close'] = item[4]
+    candles = model['ohlc']
+    for item in message:
+        candles.upsert(
+            market,
+            symbol,
+            interval,
+            int(item[0]),
+            float(item[1]),
+            float(item[2]),
+            float(item[3]),
+            float(item[4]),
+            float(item[5])
+        )
     return UpdateEvent.create_update_event(
         EventType.CANDLE_UPDATE, 
         market, 
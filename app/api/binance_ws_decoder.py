@@ -0,0 +1,25 @@
+from app.model import Kline
+from app.utils import loads
+from app.enums import TimeFrame
+
+def decode_message(message) -> dict:
+    """Decodes a raw websocket frame (str or bytes); already decoded frames pass through."""
+    if isinstance(message, dict):
+        return message
+    return loads(message)
+
+def decode_kline(data: dict) -> Kline:
+    """Extracts the kline fields we use from a 'kline' event payload, skipping the rest."""
+    k = data["k"]
+    return Kline(
+        k["s"],
+        TimeFrame(k["i"]),
+        k["t"],
+        float(k["o"]),
+        float(k["h"]),
+        float(k["l"]),
+        float(k["c"]),
+        float(k["v"]),
+        k["x"],
+        data.get("E", 0)
+    )
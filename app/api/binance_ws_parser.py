@@ -1,48 +1,40 @@
-import asyncio
-import pyjq
-import json
-
-from urllib.parse import urlencode
-from aiocache import cached
-from aiohttp import hdrs
-from decimal import Decimal
-
-from app.model import UpdateEvent
-from app.utils import unix_millis, previous_moment
+from app.model import UpdateEvent, Kline
 from app.enums import MarketType, TimeFrame, EventType
-from typing import Callable, Tuple, Dict
+from app.api.binance_ws_decoder import decode_message, decode_kline
+from typing import Callable
 
 STREAM_KLINE: Callable[[str, TimeFrame], str] = lambda symbol, interval: f"{symbol.lower()}@kline_{interval.value}"
+# 24h rolling statistics of all symbols that changed in the last second
+STREAM_MINI_TICKER_ARR = '!miniTicker@arr'
 
 def __parse_candles(
     market: MarketType, 
-    data: dict, 
+    kline: Kline, 
     model: dict
 ) -> UpdateEvent:
-    symbol = data.get("s", None)
-    interval = data.get("i", None)
-    timestamp = data.get("t", None)
-    open = data.get("o", None);
-    high = data.get("h", None);
-    close = data.get("c", None);
-    low = data.get("l", None);
-    candle = model['ohlc'][market.value][symbol][interval][timestamp]
-    candle['open'] = open
-    candle['high'] = high
-    candle['low'] = low
-    candle['close'] = close
+    model['ohlc'].upsert(
+        market,
+        kline.symbol,
+        kline.interval,
+        kline.open_time,
+        kline.open,
+        kline.high,
+        kline.low,
+        kline.close,
+        kline.volume
+    )
     return UpdateEvent.create_update_event(
-        EventType.CANDLE_UPDATE, 
+        EventType.CANDLE_CLOSED if kline.closed else EventType.CANDLE_TICK, 
         market, 
-        symbol, 
-        TimeFrame.from_string(interval)
+        kline.symbol, 
+        kline.interval
     )
 
-def process_message(market: MarketType, message: dict, model: dict) -> UpdateEvent: 
-    data = message.get("data", {})
+def process_message(market: MarketType, message, model: dict) -> UpdateEvent: 
+    """Accepts a raw frame (str or bytes) or an already decoded combined stream message."""
+    data = decode_message(message).get("data", {})
     type = data.get("e", None)
     if type == 'kline':
-        return __parse_candles(market, data.get("k", {}), model)
+        return __parse_candles(market, decode_kline(data), model)
     else:
         raise ValueError(f"Unsupported message type {type}")
-    
\ No newline at end of file
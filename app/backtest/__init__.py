@@ -0,0 +1,2 @@
+from .history import load_history, fetch_history, to_candles
+from .backtest import run_backtest, evaluate_series, as_of_candles, forward_returns, debounce_signals, SymbolBacktest, BacktestReport
@@ -0,0 +1,206 @@
+import time
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from app.enums import MarketType, TimeFrame
+from app.indicators import IndicatorEngine, create_indicator
+from app.model import CandleStore, MetricsTable, CANDLE_DTYPE
+from app.signals import SignalRule, compile_rule
+from app.utils import seconds
+
+SIDES = {'BUY': 1.0, 'SELL': -1.0}
+
+def as_of_candles(candles: np.ndarray, millis: int) -> tuple:
+    """
+    The `millis` candle as it stood at the close of every base candle (the live
+    resampler's partial bucket), plus the bucket index of every base candle and
+    the base index closing each bucket.
+    """
+    count = len(candles)
+    buckets = candles['open_time'] - candles['open_time'] % millis
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], count) - 1
+    segment = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    first = starts[segment]
+    partial = np.zeros(count, dtype=CANDLE_DTYPE)
+    partial['open_time'] = buckets
+    partial['open'] = candles['open'][first]
+    partial['close'] = candles['close']
+    volume = np.cumsum(candles['volume'])
+    partial['volume'] = volume - volume[first] + candles['volume'][first]
+    high = candles['high'].copy()
+    low = candles['low'].copy()
+    offsets = np.arange(count) - first
+    for offset in range(1, int(offsets.max()) + 1 if count else 0):
+        behind = np.flatnonzero(offsets >= offset)
+        high[behind] = np.maximum(high[behind], candles['high'][behind - offset])
+        low[behind] = np.minimum(low[behind], candles['low'][behind - offset])
+    partial['high'] = high
+    partial['low'] = low
+    return partial, segment, ends
+
+def evaluate_series(candles: np.ndarray, engine: IndicatorEngine, intervals: list, base: TimeFrame, chunk: int = 4096) -> MetricsTable:
+    """
+    Metrics of every interval as they stood at the close of every base candle,
+    one table row per base candle. The windows fed to the engine are the ones the
+    live pipeline sees: closed candles of the interval plus its current partial one.
+    """
+    count = len(candles)
+    table = MetricsTable(intervals, engine.fields, count)
+    back = np.arange(engine.window - 1, 0, -1)
+    for interval in intervals:
+        millis = seconds(interval) * 1000
+        partial, segment, ends = as_of_candles(candles, millis) if interval != base else (candles, np.arange(count), np.arange(count))
+        for begin in range(0, count, chunk):
+            rows = np.arange(begin, min(begin + chunk, count))
+            buckets = segment[rows, None] - back
+            positions = np.concatenate((np.where(buckets >= 0, ends[np.maximum(buckets, 0)], -1), rows[:, None]), axis=1)
+            missing = positions < 0
+            matrices = {}
+            for field in engine.inputs:
+                values = partial[field][positions].astype(np.float64)
+                values[missing] = np.nan
+                matrices[field] = values
+            table.update(rows, interval, engine.compute(matrices, partial['open_time'][rows]))
+    return table
+
+def forward_returns(candles: np.ndarray, rows: np.ndarray, horizons: tuple, base_millis: int) -> np.ndarray:
+    """Close-to-close returns `horizons` base candles after `rows`, NaN past the end or across gaps."""
+    returns = np.full((len(rows), len(horizons)), np.nan)
+    for column, horizon in enumerate(horizons):
+        ahead = rows + horizon
+        valid = ahead < len(candles)
+        valid[valid] &= candles['open_time'][ahead[valid]] - candles['open_time'][rows[valid]] == horizon * base_millis
+        returns[valid, column] = candles['close'][ahead[valid]] / candles['close'][rows[valid]] - 1
+    return returns
+
+def debounce_signals(matches: list, open_times: np.ndarray, period_millis: int) -> list:
+    """
+    Rows every rule fires at under the live RuleEngine debounce, given the boolean
+    match mask of every rule: a symbol fires at most once per period (the base
+    candle live), for the first rule matching at the first matching row.
+    """
+    if not matches:
+        return []
+    matched = np.vstack(matches)
+    rows = np.flatnonzero(matched.any(axis=0))
+    periods = open_times[rows] - open_times[rows] % period_millis
+    rows = rows[np.concatenate(([True], np.diff(periods) != 0))] if len(rows) else rows
+    first_rule = matched[:, rows].argmax(axis=0)
+    return [rows[first_rule == index] for index in range(len(matches))]
+
+class SymbolBacktest:
+    """The live indicator set and signal rules, evaluated over a whole candle history at once."""
+
+    def __init__(self, indicators: dict, rules: list, intervals: list, base: TimeFrame, horizons: tuple):
+        self.engine = IndicatorEngine([create_indicator(name, **params) for name, params in indicators.items()])
+        self.rules = [SignalRule.from_config(rule) for rule in rules]
+        self.intervals = list(intervals)
+        self.base = base
+        self.horizons = tuple(horizons)
+        table = MetricsTable(self.intervals, self.engine.fields, 1)
+        self.compiled = [
+            compile_rule(rule.when, table.interval_index, table.field_index, base)
+            for rule in self.rules
+        ]
+
+    def run(self, candles: np.ndarray) -> list:
+        """
+        Returns (open times, closes, side-signed forward returns) of the signals of every
+        rule, debounced like the live RuleEngine (once per symbol and base candle).
+        """
+        table = evaluate_series(candles, self.engine, self.intervals, self.base)
+        base_millis = seconds(self.base) * 1000
+        fired = debounce_signals([compiled(table.values) for compiled in self.compiled], candles['open_time'], base_millis)
+        results = []
+        for rule, rows in zip(self.rules, fired):
+            returns = forward_returns(candles, rows, self.horizons, base_millis) * SIDES.get(rule.side.upper(), 1.0)
+            results.append((candles['open_time'][rows], candles['close'][rows], returns))
+        return results
+
+class BacktestReport:
+    def __init__(self, rules: list, horizons: tuple, results: dict, failed: list, elapsed: float):
+        self.rules = rules
+        self.horizons = horizons
+        self.results = results
+        self.failed = failed
+        self.elapsed = elapsed
+
+    def returns(self, index: int) -> np.ndarray:
+        matrices = [rules[index][2] for rules in self.results.values()]
+        return np.concatenate(matrices) if matrices else np.empty((0, len(self.horizons)))
+
+    def signals(self):
+        """Yields (symbol, rule, side, open_time, close, returns) for every signal."""
+        for symbol, rules in self.results.items():
+            for rule, (open_times, closes, returns) in zip(self.rules, rules):
+                for open_time, close, row in zip(open_times.tolist(), closes.tolist(), returns.tolist()):
+                    yield symbol, rule['name'], rule['side'], open_time, close, row
+
+    def __str__(self):
+        lines = [f"Backtest of {len(self.results)} symbols in {self.elapsed:.1f}s, failed={self.failed}"]
+        for index, rule in enumerate(self.rules):
+            returns = self.returns(index)
+            lines.append(f"  {rule['name']} ({rule['side']}): {len(returns)} signals")
+            for column, horizon in enumerate(self.horizons):
+                values = returns[:, column]
+                values = values[~np.isnan(values)]
+                if len(values) == 0:
+                    continue
+                lines.append(
+                    f"    +{horizon:<4} hit rate={np.mean(values > 0) * 100:5.1f}% "
+                    f"mean={values.mean() * 100:+.3f}% median={np.median(values) * 100:+.3f}% n={len(values)}"
+                )
+        return '\n'.join(lines)
+
+_backtest: SymbolBacktest = None
+_store: CandleStore = None
+
+def _initialize(directory: str, indicators: dict, rules: list, intervals: list, base: TimeFrame, horizons: tuple):
+    global _backtest, _store
+    _backtest = SymbolBacktest(indicators, rules, intervals, base, horizons)
+    _store = CandleStore(directory)
+
+def _run_symbol(market: MarketType, symbol: str, start: int) -> tuple:
+    candles = _store.load(market, symbol, _backtest.base)
+    candles = np.array(candles[candles['open_time'] >= start])
+    if len(candles) == 0:
+        raise ValueError(f"No stored {_backtest.base} candles")
+    return symbol, _backtest.run(candles)
+
+def run_backtest(
+    store: CandleStore,
+    market: MarketType,
+    symbols: list,
+    start: int,
+    indicators: dict,
+    rules: list,
+    intervals: list,
+    base: TimeFrame,
+    horizons: tuple = (5, 15, 60),
+    processes: int = None
+) -> BacktestReport:
+    """
+    Evaluates the rules over the stored base candles of every symbol since `start`,
+    one symbol per task on a process pool. Signals are taken at base candle closes.
+    """
+    started = time.perf_counter()
+    results = {}
+    failed = []
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=get_context('spawn'),
+        initializer=_initialize,
+        initargs=(store.directory, indicators, rules, intervals, base, tuple(horizons))
+    ) as executor:
+        futures = {executor.submit(_run_symbol, market, symbol, start): symbol for symbol in symbols}
+        for future, symbol in futures.items():
+            try:
+                symbol, result = future.result()
+                results[symbol] = result
+            except Exception as e:
+                print(f"Backtest of {symbol} failed: {e}")
+                failed.append(symbol)
+    return BacktestReport(rules, tuple(horizons), results, failed, time.perf_counter() - started)
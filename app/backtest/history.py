@@ -0,0 +1,84 @@
+import asyncio
+import random
+import numpy as np
+
+from app.api import fetch_candles
+from app.enums import MarketType, TimeFrame
+from app.model import CandleStore, CANDLE_DTYPE
+from app.utils import unix_millis, previous_moment, seconds
+
+# 1000 candles cost 5 request weight, 1500 cost 10: the smaller page is cheaper per candle
+PAGE_LIMIT = 1000
+
+def to_candles(data: list) -> np.ndarray:
+    """Converts REST klines ([open_time, "open", "high", "low", "close", "volume", ...]) to CANDLE_DTYPE records."""
+    candles = np.zeros(len(data), dtype=CANDLE_DTYPE)
+    if len(data):
+        columns = list(zip(*data))
+        candles['open_time'] = np.array(columns[0], dtype=np.int64)
+        for index, field in enumerate(('open', 'high', 'low', 'close', 'volume'), start=1):
+            candles[field] = np.array(columns[index], dtype=np.float64)
+    return candles
+
+async def fetch_history(market: MarketType, symbol: str, interval: TimeFrame, start: int, end: int, retries: int = 3) -> np.ndarray:
+    """Pages closed candles with open times in [start, end) through `fetch_candles`."""
+    interval_millis = seconds(interval) * 1000
+    pages = []
+    start_time = start
+    while start_time < end:
+        for attempt in range(retries + 1):
+            try:
+                data = await fetch_candles(market, symbol, interval, limit=PAGE_LIMIT, start_time=start_time)
+                break
+            except Exception:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(0.5 * (2 ** attempt) * random.uniform(0.5, 1.5))
+        candles = to_candles(data)
+        candles = candles[(candles['open_time'] >= start_time) & (candles['open_time'] < end)]
+        if len(candles) == 0:
+            break
+        pages.append(candles)
+        start_time = int(candles['open_time'][-1]) + interval_millis
+    return np.concatenate(pages) if pages else np.empty(0, dtype=CANDLE_DTYPE)
+
+async def load_history(
+    store: CandleStore,
+    market: MarketType,
+    symbols: list,
+    interval: TimeFrame,
+    start: int,
+    workers: int = 8
+) -> dict:
+    """
+    Makes sure the store holds the closed candles of every symbol since `start`
+    (unix millis). Stored history is reused: only candles after the last stored
+    one are fetched, or everything when the store starts later than `start`.
+    Returns {symbol: candles loaded}, -1 for symbols that failed.
+    """
+    end = unix_millis(previous_moment(interval))
+    interval_millis = seconds(interval) * 1000
+    queue = asyncio.Queue()
+    for symbol in symbols:
+        queue.put_nowait(symbol)
+    loaded = {}
+
+    async def worker():
+        while not queue.empty():
+            symbol = queue.get_nowait()
+            stored = store.load(market, symbol, interval)
+            try:
+                if len(stored) and int(stored['open_time'][0]) <= start + interval_millis:
+                    candles = await fetch_history(market, symbol, interval, int(stored['open_time'][-1]) + interval_millis, end)
+                    loaded[symbol] = store.append(market, symbol, interval, candles)
+                else:
+                    candles = await fetch_history(market, symbol, interval, start, end)
+                    loaded[symbol] = store.write(market, symbol, interval, candles)
+            except Exception as e:
+                print(f"Failed to load {symbol} {interval} history: {e}")
+                loaded[symbol] = -1
+            if len(loaded) % 50 == 0:
+                print(f"History loaded for {len(loaded)}/{len(symbols)} symbols")
+
+    await asyncio.gather(*[worker() for _ in range(min(workers, len(symbols)))])
+    return loaded
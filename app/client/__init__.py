@@ -1,2 +1,4 @@
-from .http_client import execute_http_request
-from .websocket_client import WebSocketClient
\ No newline at end of file
+from .http_client import execute_http_request, http_client, HttpClient, WeightRateLimiter
+from .message_dispatcher import MessageDispatcher, stream_name, stream_symbol
+from .websocket_client import WebSocketClient
+from .stream_manager import StreamManager, StreamShard
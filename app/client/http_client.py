@@ -1,11 +1,117 @@
-import aiohttp
 import asyncio
 import datetime
+import time
+import weakref
 
-from aiocache import cached
+from urllib.parse import urlsplit
+
+from app.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUEST_WEIGHT, HTTP_USED_WEIGHT
+
+class WeightRateLimiter:
+    """
+    Token bucket over the exchange's per-minute request weight. Weight is reserved
+    locally before every request and re-synchronised from the X-MBX-USED-WEIGHT-1M
+    header of every response; the bucket refills when the minute window rolls over.
+    """
+
+    def __init__(self, limit: int = 2400, headroom: float = 0.9):
+        self.limit = limit
+        self.capacity = int(limit * headroom)
+        self.used = 0
+        self.window = int(time.time() // 60)
+        self.blocked_until = 0.0
+
+    async def acquire(self, weight: int):
+        if weight > self.capacity:
+            # Would wait for a window that never has room for it
+            raise ValueError(f"Unsupported request weight {weight}, above the limiter capacity {self.capacity}")
+        while True:
+            now = time.time()
+            self.__roll(now)
+            if now >= self.blocked_until and self.used + weight <= self.capacity:
+                self.used += weight
+                return
+            await asyncio.sleep(max(self.blocked_until, (self.window + 1) * 60) - now)
+
+    def update(self, used_weight: int):
+        self.__roll(time.time())
+        # Requests still in flight are not included in the header value yet
+        self.used = max(self.used, used_weight)
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+    def __roll(self, now: float):
+        window = int(now // 60)
+        if window != self.window:
+            self.window = window
+            self.used = 0
+
+class HttpClient:
+    """
+    Long-lived HTTP client: one pooled keep-alive session per event loop, a cap on
+    requests in flight and weight-aware rate limiting shared by all loops.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_in_flight: int = 20,
+        weight_limit: int = 2400,
+        weight_headroom: float = 0.9,
+        timeout: float = 10
+    ):
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.rate_limiter = WeightRateLimiter(weight_limit, weight_headroom)
+        self.__sessions = weakref.WeakKeyDictionary()
+        HTTP_USED_WEIGHT.function = lambda: self.rate_limiter.used
+
+    async def request(self, method: str, url: str, payload=None, headers=None, weight: int = 1):
+        session, semaphore = self.__session()
+        async with semaphore:
+            await self.rate_limiter.acquire(weight)
+            HTTP_REQUEST_WEIGHT.inc(weight)
+            started = time.perf_counter()
+            async with session.request(method, url, json=payload, headers=headers) as response:
+                HTTP_REQUEST_SECONDS.labels(urlsplit(url).path, str(response.status)).observe(time.perf_counter() - started)
+                used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M')
+                if used_weight is not None:
+                    self.rate_limiter.update(int(used_weight))
+                if response.status in (418, 429):
+                    self.rate_limiter.block(float(response.headers.get('Retry-After', 60)))
+                response.raise_for_status()
+                return await response.json()
+
+    async def close(self):
+        """Closes the session of the running loop, before that loop is closed (see `run_until_complete`)."""
+        state = self.__sessions.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].close()
+
+    def __session(self) -> tuple:
+        # aiohttp is imported on the first request, not when the client is created
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        state = self.__sessions.get(loop)
+        if state is None or state[0].closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            state = (session, asyncio.Semaphore(self.max_in_flight))
+            self.__sessions[loop] = state
+        return state
+
+http_client = HttpClient()
 
 # @cached(ttl=60)  # Cache the result for 60 seconds
-async def execute_http_request(method: str, url: str, payload=None, headers=None):
-    async with aiohttp.ClientSession() as session:
-                async with session.request(method, url, json=payload, headers=headers) as response:
-                    return await response.json()
\ No newline at end of file
+async def execute_http_request(method: str, url: str, payload=None, headers=None, weight: int = 1):
+    return await http_client.request(method, url, payload=payload, headers=headers, weight=weight)
@@ -0,0 +1,146 @@
+import asyncio
+import queue
+import threading
+import time
+import traceback
+
+from typing import Callable
+
+from app.enums import BackpressurePolicy
+from app.metrics import PIPELINE_STAGE_SECONDS, DISPATCH_QUEUE_DEPTH, DISPATCH_DROPPED, DISPATCH_ERRORS
+
+def stream_name(message) -> str:
+    """Extracts the stream from a combined stream frame ('{"stream":"btcusdt@kline_1m",...') without decoding it."""
+    if message.startswith('{"stream":"'):
+        end = message.find('"', 11)
+        if end > 0:
+            return message[11:end]
+    return ''
+
+def stream_symbol(message) -> str:
+    """Extracts the symbol from a combined stream frame ('{"stream":"btcusdt@kline_1m",...') without decoding it."""
+    if message.startswith('{"stream":"'):
+        end = message.find('@', 11)
+        if end > 0:
+            return message[11:end]
+    return ''
+
+class MessageDispatcher:
+    """
+    Bounded hand-off of websocket frames to a fixed set of worker threads. Frames
+    are partitioned by key (the symbol by default), so every symbol is always
+    processed by the same worker and its updates keep their arrival order.
+
+    When a worker queue is full, BLOCK makes the producer wait (which pushes back
+    on the socket), while DROP_OLDEST discards the oldest queued frame. Frames are
+    queued with their receive time, the time spent queued is the receive_parse stage.
+    Producers running on an event loop use `submit_async`, which only suspends the
+    calling coroutine while it waits.
+    """
+
+    def __init__(
+        self,
+        message_handler: Callable,
+        workers: int = 4,
+        max_queue: int = 10000,
+        backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK,
+        partition_key: Callable = stream_symbol
+    ):
+        self.message_handler = message_handler
+        self.backpressure = backpressure
+        self.partition_key = partition_key
+        self.queues = [queue.Queue(maxsize=max_queue) for _ in range(workers)]
+        self.dropped = [0] * workers
+        self.processed = [0] * workers
+        self.errors = [0] * workers
+        self.threads = []
+        self.__lock = threading.Lock()
+
+    def start(self):
+        with self.__lock:
+            if self.threads:
+                return
+            self.threads = [
+                threading.Thread(target=self.__work, args=(index,), daemon=True)
+                for index in range(len(self.queues))
+            ]
+            for thread in self.threads:
+                thread.start()
+            for index, worker_queue in enumerate(self.queues):
+                DISPATCH_QUEUE_DEPTH.labels(str(index)).function = worker_queue.qsize
+
+    def stop(self):
+        with self.__lock:
+            for worker_queue in self.queues:
+                worker_queue.put(None)
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+
+    def submit(self, message):
+        index = hash(self.partition_key(message)) % len(self.queues)
+        worker_queue = self.queues[index]
+        item = (time.perf_counter(), message)
+        if self.backpressure == BackpressurePolicy.DROP_OLDEST:
+            self.__put_dropping_oldest(index, item)
+        else:
+            worker_queue.put(item)
+
+    async def submit_async(self, message):
+        """
+        `submit` for producers on an event loop. A full queue under BLOCK waits on an
+        executor thread, the loop keeps serving other connections, pings and requests.
+        """
+        index = hash(self.partition_key(message)) % len(self.queues)
+        worker_queue = self.queues[index]
+        item = (time.perf_counter(), message)
+        if self.backpressure == BackpressurePolicy.DROP_OLDEST:
+            self.__put_dropping_oldest(index, item)
+            return
+        try:
+            worker_queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.get_running_loop().run_in_executor(None, worker_queue.put, item)
+
+    def __put_dropping_oldest(self, index: int, item: tuple):
+        worker_queue = self.queues[index]
+        while True:
+            try:
+                worker_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    worker_queue.get_nowait()
+                    self.dropped[index] += 1
+                    DISPATCH_DROPPED.inc()
+                except queue.Empty:
+                    pass
+
+    def depth(self) -> list:
+        return [worker_queue.qsize() for worker_queue in self.queues]
+
+    def stats(self) -> dict:
+        return {
+            'depth': self.depth(),
+            'dropped': list(self.dropped),
+            'processed': list(self.processed),
+            'errors': list(self.errors),
+        }
+
+    def __work(self, index: int):
+        worker_queue = self.queues[index]
+        waited = PIPELINE_STAGE_SECONDS.labels('receive_parse')
+        clock = time.perf_counter
+        while True:
+            item = worker_queue.get()
+            if item is None:
+                break
+            received, message = item
+            waited.observe(clock() - received)
+            try:
+                self.message_handler(message)
+            except Exception:
+                self.errors[index] += 1
+                DISPATCH_ERRORS.inc()
+                traceback.print_exc()
+            self.processed[index] += 1
@@ -0,0 +1,203 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from app.enums import BackpressurePolicy
+from app.client.websocket_client import WebSocketClient
+from app.client.message_dispatcher import MessageDispatcher, stream_name
+from app.metrics import STREAM_MESSAGES, SHARD_LAG_MS
+
+class StreamShard:
+    def __init__(self, index: int, streams: list, recorder=None):
+        self.index = index
+        self.streams = list(streams)
+        self.recorder = recorder
+        self.client = None
+        self.messages = 0
+        self.lag = 0.0
+        self.rate = 0.0
+        self.__sampled_messages = 0
+        self.__sampled_at = time.monotonic()
+        SHARD_LAG_MS.labels(str(index)).function = lambda: self.lag
+
+    def record(self, message):
+        """Called from the event loop for every frame, keeps the counters single-writer."""
+        self.messages += 1
+        STREAM_MESSAGES.labels(stream_name(message)).inc()
+        if self.recorder is not None:
+            self.recorder.record(message)
+        event_time = _event_time(message)
+        if event_time:
+            self.lag = time.time() * 1000 - event_time
+
+    def sample(self) -> dict:
+        now = time.monotonic()
+        elapsed = now - self.__sampled_at
+        if elapsed > 0:
+            self.rate = (self.messages - self.__sampled_messages) / elapsed
+        self.__sampled_messages = self.messages
+        self.__sampled_at = now
+        return {
+            'shard': self.index,
+            'streams': len(self.streams),
+            'messages': self.messages,
+            'rate': self.rate,
+            'lag_ms': self.lag,
+            'connected': self.client is not None and self.client.connection is not None and self.client.connection.open,
+        }
+
+class StreamManager:
+    """
+    Spreads websocket streams over several combined-stream connections of at most
+    `streams_per_connection` streams each. All shards run on one event loop in a
+    single thread; messages are handed to a shared dispatcher for processing.
+    Stream list changes are applied to live connections without reconnecting.
+    """
+
+    def __init__(
+        self, 
+        base_uri: str, 
+        message_handler, 
+        streams_per_connection: int = 200, 
+        max_workers: int = 4,
+        max_queue: int = 10000,
+        backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK,
+        recorder=None
+    ):
+        self.base_uri = base_uri
+        self.recorder = recorder
+        self.message_handler = message_handler
+        self.streams_per_connection = streams_per_connection
+        self.dispatcher = MessageDispatcher(
+            message_handler, 
+            workers=max_workers, 
+            max_queue=max_queue, 
+            backpressure=backpressure
+        )
+        self.loop = asyncio.new_event_loop()
+        self.thread = None
+        self.shards: list[StreamShard] = []
+        self.__lock = threading.Lock()
+
+    def start(self, streams: list):
+        if self.thread is None:
+            self.dispatcher.start()
+            self.thread = threading.Thread(target=self.__run_forever, daemon=True)
+            self.thread.start()
+        self.update_streams(streams)
+
+    def update_streams(self, streams: list):
+        """
+        Diffs a new stream list against the live one. Changes are applied in place with
+        SUBSCRIBE/UNSUBSCRIBE, a shard only reconnects when that fails.
+        """
+        with self.__lock:
+            wanted = list(dict.fromkeys(streams))
+            wanted_set = set(wanted)
+            added = {}
+            removed = {}
+            for shard in self.shards:
+                kept = [stream for stream in shard.streams if stream in wanted_set]
+                if len(kept) != len(shard.streams):
+                    removed[shard.index] = [stream for stream in shard.streams if stream not in wanted_set]
+                    shard.streams = kept
+            assigned = {stream for shard in self.shards for stream in shard.streams}
+            pending = [stream for stream in wanted if stream not in assigned]
+            for shard in self.shards:
+                if not pending:
+                    break
+                free = self.streams_per_connection - len(shard.streams)
+                if free > 0:
+                    added[shard.index] = pending[:free]
+                    shard.streams.extend(pending[:free])
+                    pending = pending[free:]
+            while pending:
+                shard = StreamShard(len(self.shards), pending[:self.streams_per_connection], self.recorder)
+                added[shard.index] = list(shard.streams)
+                pending = pending[self.streams_per_connection:]
+                self.shards.append(shard)
+            for shard in self.shards:
+                if shard.index in added or shard.index in removed:
+                    self.__submit(self.__apply(
+                        shard, 
+                        added.get(shard.index, []), 
+                        removed.get(shard.index, [])
+                    ))
+            print(f"Listening {len(wanted)} websocket streams over {len([s for s in self.shards if s.streams])} connections")
+
+    def stats(self) -> list:
+        return [shard.sample() for shard in self.shards]
+
+    def stop(self, timeout: float = 5.0):
+        """Closes every connection, waiting up to `timeout` seconds for the close handshakes, then the loop."""
+        if self.thread is not None:
+            closing = [self.__submit(shard.client.shutdown()) for shard in self.shards if shard.client is not None]
+            if closing:
+                concurrent.futures.wait(closing, timeout)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.thread = None
+        self.dispatcher.stop()
+
+    async def __apply(self, shard: StreamShard, added: list, removed: list):
+        if not shard.streams:
+            if shard.client is not None:
+                await shard.client.shutdown()
+                shard.client = None
+            return
+        uri = self.__build_uri(shard.streams)
+        if shard.client is None:
+            shard.client = WebSocketClient(
+                uri,
+                self.message_handler,
+                dispatcher=self.dispatcher,
+                on_receive=shard.record
+            )
+            asyncio.ensure_future(shard.client.run())
+            return
+        # A reconnect picks up the new stream list from the URI
+        shard.client.uri = uri
+        if not shard.client.connected:
+            return
+        try:
+            if removed:
+                await shard.client.unsubscribe(removed)
+            if added:
+                await shard.client.subscribe(added)
+        except Exception as e:
+            print(f"Live stream update failed on shard {shard.index} ({e}), reconnecting")
+            await shard.client.reconnect()
+
+    def __build_uri(self, streams: list) -> str:
+        return f"{self.base_uri}?streams={'/'.join(streams)}"
+
+    def __submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def __run_forever(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            # Clients still backing off or reconnecting are cancelled before the loop is closed
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            asyncio.set_event_loop(None)
+            self.loop.close()
+
+def _event_time(message) -> int:
+    # Cheap lookup of the event time ("E") without decoding the whole frame
+    position = message.find('"E":')
+    if position < 0:
+        return 0
+    start = position + 4
+    while start < len(message) and message[start] == ' ':
+        start += 1
+    end = start
+    while end < len(message) and message[end].isdigit():
+        end += 1
+    return int(message[start:end]) if end > start else 0
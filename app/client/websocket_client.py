@@ -1,39 +1,60 @@
 import asyncio
+import json
 import websockets
 import threading
-import concurrent.futures
+
+from app.client.message_dispatcher import MessageDispatcher
+from app.metrics import WEBSOCKET_RECONNECTS
 
 class WebSocketClient:
-    def __init__(self, uri, message_handler):
+    def __init__(self, uri, message_handler, dispatcher: MessageDispatcher = None, on_receive=None):
         self.uri = uri
         self.connection = None
         self.message_handler = message_handler
-        self.loop = asyncio.new_event_loop()
+        self.on_receive = on_receive
+        # Only the threaded `start` needs a loop of its own, `run` uses the caller's loop
+        self.loop = None
         self.reconnect_delay = 5
         self.running = False
         self.thread = None
         self.ping_interval = 20
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.dispatcher = dispatcher or MessageDispatcher(message_handler)
+        self.request_timeout = 10
+        self.__request_id = 0
+        self.__pending = {}
+        self.__reconnect_requested = False
 
     async def connect(self):
         while self.running:
             try:
                 async with websockets.connect(self.uri) as websocket:
                     self.connection = websocket
+                    self.reconnect_delay = 5
                     print(f"Connected to WebSocket server: {(self.uri[:47] + '...') if len(self.uri) > 50 else self.uri}")
                     ping_task = asyncio.ensure_future(self.send_pings(websocket))
-                    await self.message_handler_with_offloading(websocket)
-                    ping_task.cancel()
+                    try:
+                        await self.message_handler_with_offloading(websocket)
+                    finally:
+                        ping_task.cancel()
+                # The handler swallows closures, a return while running is a dropped connection
+                # unless `reconnect` asked for a new one
+                if self.running and not self.__reconnect_requested:
+                    print("Connection dropped, reconnecting")
+                    await self.__back_off()
+                self.__reconnect_requested = False
 
             except (websockets.ConnectionClosedError, websockets.ConnectionClosedOK) as e:
                 print(f"Connection closed normally: {e}")
-                await asyncio.sleep(self.reconnect_delay)
-                self.reconnect_delay = min(self.reconnect_delay * 2, 60)
+                await self.__back_off()
 
             except Exception as e:
                 print(f"Connection error: {e}")
-                await asyncio.sleep(self.reconnect_delay)
-                self.reconnect_delay = min(self.reconnect_delay * 2, 60)
+                await self.__back_off()
+
+    async def __back_off(self):
+        WEBSOCKET_RECONNECTS.inc()
+        await asyncio.sleep(self.reconnect_delay)
+        self.reconnect_delay = min(self.reconnect_delay * 2, 60)
 
     async def send_pings(self, websocket):
         """Send pings to keep the WebSocket connection alive."""
@@ -53,22 +74,81 @@ class WebSocketClient:
             print(f"Error sending ping: {e}")
 
     async def message_handler_with_offloading(self, websocket):
-        """Handles WebSocket messages and offloads post-processing to a separate thread."""
+        """Handles WebSocket messages and hands post-processing over to the dispatcher workers."""
         try:
             async for message in websocket:
-                loop = asyncio.get_event_loop()
-                loop.run_in_executor(self.executor, self.post_process, message)
+                if message.startswith(('{"result"', '{"error"', '{"id"')):
+                    self.__resolve(message)
+                    continue
+                if self.on_receive is not None:
+                    self.on_receive(message)
+                await self.dispatcher.submit_async(message)
 
         except websockets.ConnectionClosedError as e:
             print(f"WebSocket connection closed: {e}")
         except Exception as e:
             print(f"Error handling messages: {e}")
 
-    def post_process(self, message):
-        self.message_handler(message)
+    async def run(self):
+        """Runs the connection on the caller's event loop instead of a dedicated thread."""
+        self.running = True
+        self.dispatcher.start()
+        await self.connect()
+
+    async def shutdown(self):
+        self.running = False
+        if self.connection is not None:
+            await self.connection.close()
+
+    async def reconnect(self):
+        """Closes the current connection, `connect` opens a new one using the current `uri`."""
+        if self.connection is not None:
+            self.__reconnect_requested = True
+            await self.connection.close()
+
+    @property
+    def connected(self) -> bool:
+        return self.connection is not None and self.connection.open
+
+    async def subscribe(self, streams: list):
+        """Adds streams to the live connection (Binance SUBSCRIBE method)."""
+        return await self.__request('SUBSCRIBE', list(streams))
+
+    async def unsubscribe(self, streams: list):
+        """Removes streams from the live connection (Binance UNSUBSCRIBE method)."""
+        return await self.__request('UNSUBSCRIBE', list(streams))
+
+    async def list_subscriptions(self) -> list:
+        return await self.__request('LIST_SUBSCRIPTIONS')
+
+    async def __request(self, method: str, params: list = None):
+        if not self.connected:
+            raise ConnectionError(f"Cannot send {method}, WebSocket is not connected")
+        self.__request_id += 1
+        request_id = self.__request_id
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[request_id] = future
+        payload = {'method': method, 'id': request_id}
+        if params is not None:
+            payload['params'] = params
+        try:
+            await self.connection.send(json.dumps(payload))
+            response = await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self.__pending.pop(request_id, None)
+        if 'error' in response:
+            raise RuntimeError(f"{method} failed: {response['error']}")
+        return response.get('result')
+
+    def __resolve(self, message):
+        response = json.loads(message)
+        future = self.__pending.get(response.get('id'))
+        if future is not None and not future.done():
+            future.set_result(response)
 
     def __run_forever(self):
         asyncio.set_event_loop(self.loop)
+        self.dispatcher.start()
         self.loop.run_until_complete(self.connect())
 
     def restart(self):
@@ -83,11 +163,14 @@ class WebSocketClient:
 
     def start(self):
         if not self.running:
+            self.loop = asyncio.new_event_loop()
             self.running = True
             self.thread = threading.Thread(target=self.__run_forever, daemon=True)
             self.thread.start()
 
     def stop(self):
         self.running = False
+        if self.thread is None:
+            return
         self.loop.call_soon_threadsafe(self.loop.stop)
         self.thread.join()
@@ -1,4 +1,5 @@
 from .event_type import EventType
 from .time_frame import TimeFrame
 from .market_type import MarketType
-from .message_type import MessageType
\ No newline at end of file
+from .message_type import MessageType
+from .backpressure_policy import BackpressurePolicy
@@ -0,0 +1,8 @@
+from enum import Enum
+
+class BackpressurePolicy(Enum):
+    BLOCK = 'BLOCK'
+    DROP_OLDEST = 'DROP_OLDEST'
+    
+    def __str__(self):
+        return self.value
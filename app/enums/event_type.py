@@ -2,9 +2,12 @@ from enum import Enum
 
 class EventType(Enum):
     CANDLE_UPDATE = 'CANDLE_UPDATE'
+    CANDLE_TICK = 'CANDLE_TICK'
+    CANDLE_CLOSED = 'CANDLE_CLOSED'
     SYMBOL_UPDATE = 'SYMBOL_UPDATE'
     METRIC_UPDATE = 'METRIC_UPDATE'
     CANDLE_CLEANUP = 'CANDLE_CLEANUP'
+    SIGNAL = 'SIGNAL'
     
     def __str__(self):
         return self.value
\ No newline at end of file
@@ -11,10 +11,10 @@ class TimeFrame(Enum):
     
     @classmethod
     def from_string(cls, value: str):
-        for item in cls:
-            if item.value == value:
-                return item
-        raise ValueError(f"{value} is not a valid {cls.__name__}")
+        try:
+            return cls(value)
+        except ValueError:
+            raise ValueError(f"{value} is not a valid {cls.__name__}") from None
     
     def __str__(self):
         return self.value
\ No newline at end of file
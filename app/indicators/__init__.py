@@ -0,0 +1,4 @@
+from .bollinger import IncrementalBollinger
+from .indicator import Indicator, INDICATORS, register_indicator, create_indicator, recursive_weights
+from .standard import BollingerBands, ExponentialMovingAverage, RelativeStrengthIndex, AverageTrueRange, RollingVwap, VolumeZScore
+from .indicator_engine import IndicatorEngine, CANDLE_FIELDS
@@ -0,0 +1,106 @@
+import math
+
+class IncrementalBollinger:
+    """
+    Bollinger Bands over a rolling window of closes, updated in O(1).
+
+    Running sums are kept relative to a shift value (close to the window mean),
+    which keeps the sum-of-squares variance numerically stable. The sums are
+    re-anchored from the raw window once per `window` roll-overs, so rounding
+    error cannot accumulate. Matches pandas `rolling(window).std()` (ddof=1).
+    """
+
+    def __init__(self, window: int = 20, std_dev_factor: float = 2.0):
+        self.window = window
+        self.std_dev_factor = std_dev_factor
+        self.open_time = None
+        self.count = 0
+        self.__values = [0.0] * window
+        self.__head = -1
+        self.__shift = 0.0
+        self.__sum = 0.0
+        self.__sum_sq = 0.0
+        self.__rolls = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count == self.window
+
+    @property
+    def sma(self) -> float:
+        if self.count == 0:
+            return math.nan
+        return self.__shift + self.__sum / self.count
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return math.nan
+        variance = (self.__sum_sq - self.__sum * self.__sum / self.count) / (self.count - 1)
+        return math.sqrt(variance) if variance > 0.0 else 0.0
+
+    @property
+    def upper(self) -> float:
+        return self.sma + self.std * self.std_dev_factor
+
+    @property
+    def lower(self) -> float:
+        return self.sma - self.std * self.std_dev_factor
+
+    @property
+    def last(self) -> float:
+        return self.__values[self.__head] if self.count else math.nan
+
+    def reset(self, open_time: int, closes):
+        """Rebuilds the state from the given closes (oldest to newest) ending at `open_time`."""
+        closes = [float(close) for close in closes][-self.window:]
+        self.open_time = open_time
+        self.count = len(closes)
+        self.__values = closes + [0.0] * (self.window - len(closes))
+        self.__head = len(closes) - 1
+        self.__rolls = 0
+        self.__reanchor()
+
+    def update(self, open_time: int, close: float):
+        """Replaces the in-progress close, or shifts the window when `open_time` opens a new candle."""
+        if open_time == self.open_time:
+            self.replace(close)
+        elif self.open_time is None or open_time > self.open_time:
+            self.push(open_time, close)
+
+    def replace(self, close: float):
+        if self.count == 0:
+            return
+        delta_old = self.__values[self.__head] - self.__shift
+        delta_new = close - self.__shift
+        self.__values[self.__head] = close
+        self.__sum += delta_new - delta_old
+        self.__sum_sq += delta_new * delta_new - delta_old * delta_old
+
+    def push(self, open_time: int, close: float):
+        self.open_time = open_time
+        self.__head = (self.__head + 1) % self.window
+        if self.count == self.window:
+            delta_old = self.__values[self.__head] - self.__shift
+            self.__sum -= delta_old
+            self.__sum_sq -= delta_old * delta_old
+        else:
+            self.count += 1
+        self.__values[self.__head] = close
+        delta_new = close - self.__shift
+        self.__sum += delta_new
+        self.__sum_sq += delta_new * delta_new
+        self.__rolls += 1
+        if self.__rolls >= self.window or self.count == 1:
+            self.__rolls = 0
+            self.__reanchor()
+
+    def __reanchor(self):
+        if self.count == 0:
+            self.__shift = self.__sum = self.__sum_sq = 0.0
+            return
+        values = self.__values if self.count == self.window else self.__values[:self.count]
+        self.__shift = values[self.__head]
+        deltas = [value - self.__shift for value in values]
+        self.__sum = math.fsum(deltas)
+        self.__sum_sq = math.fsum(delta * delta for delta in deltas)
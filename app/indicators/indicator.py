@@ -0,0 +1,52 @@
+import functools
+import numpy as np
+
+INDICATORS = {}
+
+def register_indicator(cls):
+    """Class decorator making an indicator available by its `name` to `create_indicator`."""
+    INDICATORS[cls.name] = cls
+    return cls
+
+def create_indicator(name: str, **params):
+    cls = INDICATORS.get(name)
+    if cls is None:
+        raise ValueError(f"Unsupported indicator {name}")
+    return cls(**params)
+
+@functools.lru_cache(maxsize=None)
+def recursive_weights(length: int, alpha: float) -> np.ndarray:
+    """
+    Weights turning the recursion e[k] = alpha * x[k] + (1 - alpha) * e[k - 1], seeded
+    with e[0] = x[0], into one dot product over the last `length` values.
+    """
+    weights = alpha * (1 - alpha) ** np.arange(length - 1, -1, -1, dtype=np.float64)
+    weights[0] = (1 - alpha) ** (length - 1)
+    weights.setflags(write=False)
+    return weights
+
+class Indicator:
+    """
+    Vectorized indicator over (n_symbols, window) candle matrices ordered from oldest
+    to newest. `inputs` lists the candle fields read, `depends` the indicators whose
+    results must be computed first, `outputs` the metrics produced (stored as
+    'name.output', or just 'name' for a single unnamed output).
+    """
+    name: str = None
+    inputs: tuple = ('close',)
+    outputs: tuple = ('',)
+    depends: tuple = ()
+
+    def __init__(self, window: int):
+        self.window = window
+
+    @property
+    def fields(self) -> list:
+        return [f"{self.name}.{output}" if output else self.name for output in self.outputs]
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        """
+        Returns {field: vector} given {candle field: matrix} and the results computed so far.
+        Runs with floating point warnings silenced, missing candles simply propagate NaN.
+        """
+        raise NotImplementedError
@@ -0,0 +1,63 @@
+import numpy as np
+
+from app.model import CandleBlock
+from app.indicators.indicator import Indicator
+
+# Metrics taken from the latest candle, next to the indicator outputs
+CANDLE_FIELDS = ['open_time', 'close']
+
+class IndicatorEngine:
+    """
+    Evaluates a set of indicators in one pass: every candle field any indicator reads
+    is gathered once for the longest window, each indicator then works on a view of
+    the trailing columns it needs. Indicators run after the ones they depend on.
+    """
+
+    def __init__(self, indicators: list):
+        self.indicators = self.__ordered(indicators)
+        self.window = max((indicator.window for indicator in self.indicators), default=1)
+        self.inputs = list(dict.fromkeys(['close'] + [field for indicator in self.indicators for field in indicator.inputs]))
+        self.fields = CANDLE_FIELDS + [field for indicator in self.indicators for field in indicator.fields]
+
+    def evaluate(self, block: CandleBlock, rows: np.ndarray) -> dict:
+        """Returns {field: vector over `rows`} for all fields of the engine."""
+        matrices = block.matrices(self.inputs, self.window, rows)
+        return self.compute(matrices, block.candles['open_time'][rows, block.head[rows]])
+
+    def compute(self, matrices: dict, open_time: np.ndarray) -> dict:
+        """
+        Evaluates all indicators over {input field: (rows, window) matrix}, where a
+        row is a symbol, or in a backtest one point in time of a single symbol.
+        """
+        results = {
+            'open_time': open_time,
+            'close': matrices['close'][:, -1],
+        }
+        with np.errstate(all='ignore'):
+            for indicator in self.indicators:
+                inputs = {field: matrices[field][:, self.window - indicator.window:] for field in indicator.inputs}
+                results.update(indicator.compute(inputs, results))
+        return results
+
+    @staticmethod
+    def __ordered(indicators: list) -> list:
+        by_name = {indicator.name: indicator for indicator in indicators}
+        ordered = []
+        visiting = set()
+
+        def visit(indicator: Indicator):
+            if indicator in ordered:
+                return
+            if indicator.name in visiting:
+                raise ValueError(f"Unsupported circular dependency on indicator {indicator.name}")
+            visiting.add(indicator.name)
+            for name in indicator.depends:
+                if name not in by_name:
+                    raise ValueError(f"Unsupported indicator dependency {name} of {indicator.name}")
+                visit(by_name[name])
+            visiting.discard(indicator.name)
+            ordered.append(indicator)
+
+        for indicator in indicators:
+            visit(indicator)
+        return ordered
@@ -0,0 +1,103 @@
+import numpy as np
+
+from app.indicators.indicator import Indicator, register_indicator, recursive_weights
+
+def _mean_std(values: np.ndarray) -> tuple:
+    # Plain reductions: mean()/std() add noticeable overhead for small matrices
+    count = values.shape[1]
+    mean = np.add.reduce(values, axis=1) / count
+    deviations = values - mean[:, None]
+    return mean, np.sqrt(np.add.reduce(deviations * deviations, axis=1) / (count - 1))
+
+@register_indicator
+class BollingerBands(Indicator):
+    name = 'bb'
+    outputs = ('upper', 'sma', 'lower', 'std', 'width')
+
+    def __init__(self, window: int = 20, std_dev_factor: float = 2.0):
+        super().__init__(window)
+        self.std_dev_factor = std_dev_factor
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        sma, std = _mean_std(inputs['close'])
+        upper = sma + std * self.std_dev_factor
+        lower = sma - std * self.std_dev_factor
+        return {
+            'bb.upper': upper,
+            'bb.sma': sma,
+            'bb.lower': lower,
+            'bb.std': std,
+            'bb.width': np.abs(upper - lower) / upper * 100,
+        }
+
+@register_indicator
+class ExponentialMovingAverage(Indicator):
+    name = 'ema'
+
+    def __init__(self, period: int = 20, window: int = None):
+        super().__init__(window or 2 * period + 10)
+        self.period = period
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        return {'ema': inputs['close'] @ recursive_weights(self.window, 2.0 / (self.period + 1))}
+
+@register_indicator
+class RelativeStrengthIndex(Indicator):
+    """Wilder's RSI, smoothing seeded with the first change of the window."""
+    name = 'rsi'
+
+    def __init__(self, period: int = 14, window: int = None):
+        super().__init__(window or 3 * period + 1)
+        self.period = period
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        changes = np.diff(inputs['close'], axis=1)
+        weights = recursive_weights(self.window - 1, 1.0 / self.period)
+        gain = np.maximum(changes, 0.0) @ weights
+        loss = np.maximum(-changes, 0.0) @ weights
+        # A window without losses gives gain / 0 = inf and so an RSI of 100
+        return {'rsi': 100.0 - 100.0 / (1.0 + gain / loss)}
+
+@register_indicator
+class AverageTrueRange(Indicator):
+    """Wilder's ATR."""
+    name = 'atr'
+    inputs = ('high', 'low', 'close')
+
+    def __init__(self, period: int = 14, window: int = None):
+        super().__init__(window or 3 * period + 1)
+        self.period = period
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        high, low = inputs['high'][:, 1:], inputs['low'][:, 1:]
+        previous_close = inputs['close'][:, :-1]
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+        return {'atr': true_range @ recursive_weights(self.window - 1, 1.0 / self.period)}
+
+@register_indicator
+class RollingVwap(Indicator):
+    """Volume weighted typical price over the last `window` candles."""
+    name = 'vwap'
+    inputs = ('high', 'low', 'close', 'volume')
+
+    def __init__(self, window: int = 20):
+        super().__init__(window)
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        typical = (inputs['high'] + inputs['low'] + inputs['close']) / 3.0
+        volume = inputs['volume']
+        return {'vwap': np.add.reduce(typical * volume, axis=1) / np.add.reduce(volume, axis=1)}
+
+@register_indicator
+class VolumeZScore(Indicator):
+    """How unusual the volume of the current candle is against the rolling window."""
+    name = 'volume_z'
+    inputs = ('volume',)
+
+    def __init__(self, window: int = 20):
+        super().__init__(window)
+
+    def compute(self, inputs: dict, results: dict) -> dict:
+        volume = inputs['volume']
+        mean, std = _mean_std(volume)
+        return {'volume_z': (volume[:, -1] - mean) / std}
@@ -0,0 +1,22 @@
+from .registry import MetricsRegistry, Metric, Counter, Gauge, Histogram, LATENCY_BUCKETS
+from .instruments import registry, \
+    PIPELINE_STAGE_SECONDS, \
+    STREAM_MESSAGES, \
+    SHARD_LAG_MS, \
+    WEBSOCKET_RECONNECTS, \
+    DISPATCH_QUEUE_DEPTH, \
+    DISPATCH_DROPPED, \
+    DISPATCH_ERRORS, \
+    HTTP_REQUEST_SECONDS, \
+    HTTP_REQUEST_WEIGHT, \
+    HTTP_USED_WEIGHT, \
+    SIGNALS, \
+    BATCH_SCAN_SECONDS, \
+    NOTIFICATIONS, \
+    SNAPSHOT_PUBLISH_SECONDS, \
+    SNAPSHOT_VERSION, \
+    EVENT_STREAM_CLIENTS, \
+    EVENT_STREAM_EVENTS, \
+    EVENT_STREAM_EVICTED, \
+    SPREAD_FETCH_SECONDS, \
+    SPREAD_FETCH_ERRORS
@@ -0,0 +1,95 @@
+from app.metrics.registry import MetricsRegistry
+
+registry = MetricsRegistry()
+
+# Hot path stages: receive_parse (dispatcher queue wait), parse_store, store_indicator, indicator_signal
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    'tei_pipeline_stage_seconds',
+    'Latency of the websocket frame processing stages',
+    labels=('stage',)
+)
+STREAM_MESSAGES = registry.counter(
+    'tei_stream_messages_total',
+    'Websocket frames received per stream',
+    labels=('stream',)
+)
+SHARD_LAG_MS = registry.gauge(
+    'tei_stream_shard_lag_ms',
+    'Delay between the exchange event time and the receive time of the last frame',
+    labels=('shard',)
+)
+WEBSOCKET_RECONNECTS = registry.counter(
+    'tei_websocket_reconnects_total',
+    'Websocket connections lost and retried'
+)
+DISPATCH_QUEUE_DEPTH = registry.gauge(
+    'tei_dispatch_queue_depth',
+    'Frames waiting in the dispatcher worker queues',
+    labels=('worker',)
+)
+DISPATCH_DROPPED = registry.counter(
+    'tei_dispatch_dropped_total',
+    'Frames discarded by the DROP_OLDEST backpressure policy'
+)
+DISPATCH_ERRORS = registry.counter(
+    'tei_dispatch_errors_total',
+    'Frames whose handler raised an exception'
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    'tei_http_request_seconds',
+    'Latency of REST requests',
+    labels=('path', 'status')
+)
+HTTP_REQUEST_WEIGHT = registry.counter(
+    'tei_http_request_weight_total',
+    'Request weight spent on REST requests'
+)
+HTTP_USED_WEIGHT = registry.gauge(
+    'tei_http_used_weight',
+    'Request weight used in the current minute window'
+)
+SIGNALS = registry.counter(
+    'tei_signals_total',
+    'Entry signals notified',
+    labels=('rule', 'side')
+)
+BATCH_SCAN_SECONDS = registry.histogram(
+    'tei_batch_scan_seconds',
+    'Duration of a vectorized scan over all symbols'
+)
+NOTIFICATIONS = registry.counter(
+    'tei_notifications_total',
+    'Signal notifications by outcome (queued, coalesced, dropped, delivered, failed)',
+    labels=('outcome',)
+)
+SNAPSHOT_PUBLISH_SECONDS = registry.histogram(
+    'tei_snapshot_publish_seconds',
+    'Time to capture and publish a state snapshot'
+)
+SNAPSHOT_VERSION = registry.gauge(
+    'tei_snapshot_version',
+    'Version of the latest published state snapshot'
+)
+EVENT_STREAM_CLIENTS = registry.gauge(
+    'tei_event_stream_clients',
+    'Connected server-sent event subscribers'
+)
+EVENT_STREAM_EVENTS = registry.counter(
+    'tei_event_stream_events_total',
+    'Events published to the server-sent event feed',
+    labels=('event',)
+)
+EVENT_STREAM_EVICTED = registry.counter(
+    'tei_event_stream_evicted_total',
+    'Subscribers disconnected for falling behind the event ring'
+)
+SPREAD_FETCH_SECONDS = registry.histogram(
+    'tei_spread_fetch_seconds',
+    'Latency of a ticker snapshot fetch per venue',
+    labels=('venue',)
+)
+SPREAD_FETCH_ERRORS = registry.counter(
+    'tei_spread_fetch_errors_total',
+    'Failed ticker snapshot fetches per venue',
+    labels=('venue',)
+)
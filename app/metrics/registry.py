@@ -0,0 +1,212 @@
+import bisect
+import threading
+
+from typing import Callable
+
+LATENCY_BUCKETS = (
+    0.000001, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: tuple, values: tuple, extra: str = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Metric:
+    """
+    Base of all metrics. A metric declared with label names is a family; `labels(...)`
+    returns (and caches) the child for a set of label values. Updates are plain
+    attribute writes without locking, a lost increment under contention is acceptable.
+    """
+    type = 'untyped'
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.children = {}
+        self.__lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            with self.__lock:
+                child = self.children.get(values)
+                if child is None:
+                    child = self._child()
+                    self.children[values] = child
+        return child
+
+    def _child(self):
+        raise NotImplementedError
+
+    def _lines(self, name: str, label_names: tuple, values: tuple) -> list:
+        raise NotImplementedError
+
+    def _state(self):
+        raise NotImplementedError
+
+    def _restore(self, state):
+        raise NotImplementedError
+
+    def sample(self) -> list:
+        """Picklable (label values, state) pairs of the series of this metric."""
+        if self.label_names:
+            return [(values, child._state()) for values, child in list(self.children.items())]
+        return [((), self._state())]
+
+    def render(self, remote: dict = None) -> str:
+        """
+        Renders the metric, followed by the series sampled in other processes: `remote`
+        maps a (label name, label value) pair, e.g. ('worker', '0'), to their `sample()`.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        if self.label_names:
+            for values, child in list(self.children.items()):
+                lines.extend(child._lines(self.name, self.label_names, values))
+        else:
+            lines.extend(self._lines(self.name, (), ()))
+        for (label, source), series in (remote or {}).items():
+            for values, state in series:
+                child = self._child()
+                child._restore(state)
+                lines.extend(child._lines(self.name, self.label_names + (label,), tuple(values) + (source,)))
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    type = 'counter'
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        super().__init__(name, help, labels)
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def _child(self):
+        return Counter(self.name, self.help)
+
+    def _state(self):
+        return self.value
+
+    def _restore(self, state):
+        self.value = state
+
+    def _lines(self, name: str, label_names: tuple, values: tuple) -> list:
+        return [f"{name}{_format_labels(label_names, values)} {self.value}"]
+
+class Gauge(Metric):
+    """Gauge holding a value, or reading it from `function` at scrape time."""
+    type = 'gauge'
+
+    def __init__(self, name: str, help: str, labels: tuple = (), function: Callable = None):
+        super().__init__(name, help, labels)
+        self.value = 0
+        self.function = function
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def _child(self):
+        return Gauge(self.name, self.help)
+
+    def _state(self):
+        return self.function() if self.function is not None else self.value
+
+    def _restore(self, state):
+        self.value = state
+
+    def _lines(self, name: str, label_names: tuple, values: tuple) -> list:
+        value = self.function() if self.function is not None else self.value
+        return [f"{name}{_format_labels(label_names, values)} {value}"]
+
+class Histogram(Metric):
+    """Histogram over preallocated buckets: `observe` is a bisect and two additions."""
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def _child(self):
+        return Histogram(self.name, self.help, buckets=self.buckets)
+
+    def _state(self):
+        return list(self.counts), self.sum
+
+    def _restore(self, state):
+        counts, self.sum = state
+        self.counts = list(counts)
+
+    def _lines(self, name: str, label_names: tuple, values: tuple) -> list:
+        lines = []
+        cumulative = 0
+        counts = list(self.counts)
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            bucket = _format_labels(label_names, values, f'le="{le}"')
+            lines.append(f"{name}_bucket{bucket} {cumulative}")
+        labels = _format_labels(label_names, values)
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.remote = {}
+        self.__lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self.__register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple = (), function: Callable = None) -> Gauge:
+        metric = self.__register(Gauge(name, help, labels))
+        if function is not None:
+            metric.function = function
+        return metric
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self.__register(Histogram(name, help, labels, buckets))
+
+    def sample(self) -> dict:
+        """Picklable state of all metrics, e.g. to expose a worker process' metrics from the coordinator."""
+        return {name: metric.sample() for name, metric in list(self.metrics.items())}
+
+    def include(self, label: str, source: str, sample: dict):
+        """Renders `sample` (from `sample()` in another process) along with the local metrics, labelled label=source."""
+        with self.__lock:
+            self.remote[(label, source)] = sample
+
+    def render(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        remote = dict(self.remote)
+        return '\n'.join(
+            metric.render({key: sample[name] for key, sample in remote.items() if name in sample})
+            for name, metric in list(self.metrics.items())
+        ) + '\n'
+
+    def __register(self, metric: Metric) -> Metric:
+        with self.__lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} is already registered as a {existing.type}")
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
@@ -1 +1,9 @@
-from .update_event import UpdateEvent
\ No newline at end of file
+from .update_event import UpdateEvent
+from .kline import Kline
+from .signal import Signal
+from .spread import Spread
+from .candle_buffer import CandleBuffer, CandleBlock, CANDLE_DTYPE
+from .candle_store import CandleStore
+from .candle_resampler import CandleResampler
+from .metrics_table import MetricsTable
+from .snapshot import Snapshot, SnapshotStore
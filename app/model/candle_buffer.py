@@ -0,0 +1,240 @@
+import threading
+# CANDLE_DTYPE is built at import, the NumPy import cost is accepted for everything importing app.model
+import numpy as np
+
+from app.enums import MarketType, TimeFrame
+
+CANDLE_DTYPE = np.dtype([
+    ('open_time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+class CandleBlock:
+    """
+    Fixed-capacity candle rings (one row per symbol) for a single market/interval.
+    Writes and snapshots hold the block lock, so a snapshot never sees a half
+    written candle or a ring moved on between copying its position and its candles.
+    """
+
+    def __init__(self, capacity: int, rows: int):
+        self.capacity = capacity
+        self.candles = np.zeros((rows, capacity), dtype=CANDLE_DTYPE)
+        self.head = np.full(rows, -1, dtype=np.int64)
+        self.size = np.zeros(rows, dtype=np.int64)
+        self.__lock = threading.Lock()
+
+    @property
+    def rows(self) -> int:
+        return len(self.head)
+
+    def reserve(self, rows: int):
+        with self.__lock:
+            self.__reserve(rows)
+
+    def __reserve(self, rows: int):
+        if rows <= self.rows:
+            return
+        candles = np.zeros((rows, self.capacity), dtype=CANDLE_DTYPE)
+        head = np.full(rows, -1, dtype=np.int64)
+        size = np.zeros(rows, dtype=np.int64)
+        candles[:self.rows] = self.candles
+        head[:self.rows] = self.head
+        size[:self.rows] = self.size
+        self.candles, self.head, self.size = candles, head, size
+
+    def snapshot(self, rows: int) -> 'CandleBlock':
+        """Read-only copy of the first `rows` rings."""
+        copy = CandleBlock.__new__(CandleBlock)
+        copy.capacity = self.capacity
+        with self.__lock:
+            copy.head = self.head[:rows].copy()
+            copy.size = self.size[:rows].copy()
+            copy.candles = self.candles[:rows].copy()
+        copy.__lock = threading.Lock()
+        for array in (copy.head, copy.size, copy.candles):
+            array.setflags(write=False)
+        return copy
+
+    def upsert(self, row: int, record: tuple) -> bool:
+        """Writes a candle into the ring, returns True when it started a new candle."""
+        with self.__lock:
+            return self.__upsert(row, record)
+
+    def __upsert(self, row: int, record: tuple) -> bool:
+        size = self.size[row]
+        if size == 0:
+            self.candles[row, 0] = record
+            self.head[row] = 0
+            self.size[row] = 1
+            return True
+        head = self.head[row]
+        latest = self.candles[row, head]['open_time']
+        if record[0] == latest:
+            self.candles[row, head] = record
+            return False
+        if record[0] > latest:
+            slot = (head + 1) % self.capacity
+            self.candles[row, slot] = record
+            self.head[row] = slot
+            if size < self.capacity:
+                self.size[row] = size + 1
+            return True
+        self.__insert_history(row, record)
+        return False
+
+    def assign(self, row: int, candles: np.ndarray):
+        """Replaces the ring of `row` with the given candles (ordered from oldest to newest)."""
+        candles = candles[-self.capacity:]
+        with self.__lock:
+            self.candles[row, :len(candles)] = candles
+            self.head[row] = len(candles) - 1
+            self.size[row] = len(candles)
+
+    def clear(self, row: int):
+        with self.__lock:
+            self.head[row] = -1
+            self.size[row] = 0
+
+    def slots(self, row: int, count: int = None) -> np.ndarray:
+        size = self.size[row]
+        count = size if count is None else min(count, size)
+        return (self.head[row] - count + 1 + np.arange(count)) % self.capacity
+
+    def window(self, row: int, count: int = None) -> np.ndarray:
+        """Returns a copy of the last `count` candles ordered from oldest to newest."""
+        return self.candles[row, self.slots(row, count)]
+
+    def latest(self, row: int):
+        if self.size[row] == 0:
+            return None
+        return self.candles[row, self.head[row]].copy()
+
+    def matrix(self, field: str, count: int, rows: np.ndarray = None) -> np.ndarray:
+        """
+        Gathers the last `count` values of `field` for many rows at once, as a
+        (len(rows), count) matrix ordered from oldest to newest. Rows holding
+        fewer than `count` candles are NaN-padded on the left.
+        """
+        if rows is None:
+            rows = np.arange(self.rows)
+        offsets = np.arange(count) - count + 1
+        slots = (self.head[rows, None] + offsets) % self.capacity
+        values = self.candles[field][rows[:, None], slots].astype(np.float64)
+        values[offsets < -self.size[rows, None] + 1] = np.nan
+        return values
+
+    def matrices(self, fields: list, count: int, rows: np.ndarray) -> dict:
+        """Same as `matrix` for several float fields, computing the ring slots only once."""
+        offsets = np.arange(count) - count + 1
+        slots = (self.head[rows, None] + offsets) % self.capacity
+        rows = rows[:, None]
+        missing = offsets < -self.size[rows] + 1
+        padded = missing.any()
+        matrices = {}
+        for field in fields:
+            values = self.candles[field][rows, slots]
+            if padded:
+                values[missing] = np.nan
+            matrices[field] = values
+        return matrices
+
+    def __insert_history(self, row: int, record: tuple):
+        # Older candles only arrive from history backfill, so an O(capacity) merge is fine here
+        slots = self.slots(row)
+        ordered = self.candles[row, slots]
+        position = np.searchsorted(ordered['open_time'], record[0])
+        if position < len(ordered) and ordered['open_time'][position] == record[0]:
+            self.candles[row, slots[position]] = record
+            return
+        if len(ordered) == self.capacity and position == 0:
+            return
+        merged = np.insert(ordered, position, np.array(record, dtype=CANDLE_DTYPE))[-self.capacity:]
+        self.candles[row, :len(merged)] = merged
+        self.head[row] = len(merged) - 1
+        self.size[row] = len(merged)
+
+class CandleBuffer:
+    """
+    Array-backed OHLCV store: every market/interval pair owns a CandleBlock and
+    symbols share the same row index across all intervals of a market.
+    `capacities` overrides the ring capacity of single intervals.
+    """
+
+    def __init__(self, capacity: int, rows: int = 64, capacities: dict = None):
+        self.capacity = capacity
+        self.capacities = dict(capacities or {})
+        self.rows = rows
+        self.__lock = threading.Lock()
+        self.__symbols: dict[MarketType, dict[str, int]] = {}
+        self.__blocks: dict[tuple[MarketType, TimeFrame], CandleBlock] = {}
+
+    def register(self, market: MarketType, symbols: list):
+        """Assigns rows to the given symbols up-front, so that ingest never has to grow the blocks."""
+        for symbol in symbols:
+            self.symbol_index(market, symbol)
+
+    def symbol_index(self, market: MarketType, symbol: str) -> int:
+        index = self.__symbols.get(market)
+        if index is not None:
+            row = index.get(symbol)
+            if row is not None:
+                return row
+        with self.__lock:
+            index = self.__symbols.setdefault(market, {})
+            row = index.get(symbol)
+            if row is None:
+                row = len(index)
+                index[symbol] = row
+                for (block_market, _), block in self.__blocks.items():
+                    if block_market == market and row >= block.rows:
+                        block.reserve(max(block.rows * 2, row + 1))
+            return row
+
+    def symbols(self, market: MarketType) -> list:
+        return list(self.__symbols.get(market, {}))
+
+    def block(self, market: MarketType, interval: TimeFrame) -> CandleBlock:
+        block = self.__blocks.get((market, interval))
+        if block is None:
+            with self.__lock:
+                block = self.__blocks.get((market, interval))
+                if block is None:
+                    rows = max(self.rows, len(self.__symbols.get(market, {})))
+                    block = CandleBlock(self.capacities.get(interval, self.capacity), rows)
+                    self.__blocks[(market, interval)] = block
+        return block
+
+    def clear(self, market: MarketType, symbol: str):
+        """Empties the rings of a symbol in all intervals, its row stays assigned."""
+        row = self.symbol_index(market, symbol)
+        for (block_market, _), block in list(self.__blocks.items()):
+            if block_market == market:
+                block.clear(row)
+
+    def upsert(
+        self,
+        market: MarketType,
+        symbol: str,
+        interval: TimeFrame,
+        open_time: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0
+    ) -> bool:
+        row = self.symbol_index(market, symbol)
+        return self.block(market, interval).upsert(row, (open_time, open, high, low, close, volume))
+
+    def size(self, market: MarketType, symbol: str, interval: TimeFrame) -> int:
+        return int(self.block(market, interval).size[self.symbol_index(market, symbol)])
+
+    def window(self, market: MarketType, symbol: str, interval: TimeFrame, count: int = None) -> np.ndarray:
+        return self.block(market, interval).window(self.symbol_index(market, symbol), count)
+
+    def latest(self, market: MarketType, symbol: str, interval: TimeFrame):
+        return self.block(market, interval).latest(self.symbol_index(market, symbol))
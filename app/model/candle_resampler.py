@@ -0,0 +1,136 @@
+import numpy as np
+
+from app.enums import MarketType, TimeFrame, EventType
+from app.model.update_event import UpdateEvent
+from app.model.candle_buffer import CandleBuffer, CANDLE_DTYPE
+from app.utils import seconds
+
+class _Bucket:
+    """Running aggregate of the derived candle being built for one symbol/interval."""
+    __slots__ = ('open_time', 'open', 'high', 'low', 'volume', 'base_open_time', 'base_high', 'base_low', 'base_volume')
+
+    def __init__(self):
+        self.open_time = None
+        self.base_open_time = None
+
+    def start(self, open_time: int, open: float):
+        self.open_time = open_time
+        self.open = open
+        self.high = -np.inf
+        self.low = np.inf
+        self.volume = 0.0
+        self.base_open_time = None
+
+class CandleResampler:
+    """
+    Derives higher timeframes from the base (1m) candles held in a CandleBuffer.
+    Derived candles are aligned to multiples of `seconds(interval)` since the epoch,
+    the same boundaries `previous_moment` uses, and written to the buffer's blocks of
+    those intervals, so that readers do not tell them apart from streamed candles.
+
+    Every base tick updates the derived candles in O(1): finished base candles are
+    folded into the bucket aggregate, the in-progress one is combined on top of it.
+    """
+
+    def __init__(self, buffer: CandleBuffer, intervals: list, base: TimeFrame = TimeFrame.MIN_1):
+        self.buffer = buffer
+        self.base = base
+        self.intervals = [interval for interval in intervals if interval != base]
+        base_seconds = seconds(base)
+        for interval in self.intervals:
+            if seconds(interval) % base_seconds:
+                raise ValueError(f"Unsupported interval {interval}, not a multiple of {base}")
+        self.__base_millis = base_seconds * 1000
+        self.__millis = [seconds(interval) * 1000 for interval in self.intervals]
+        self.__buckets: dict[tuple, _Bucket] = {}
+
+    def update(self, update_event: UpdateEvent) -> list:
+        """
+        Applies the latest base candle of the event's symbol to all derived intervals,
+        returns their update events (CANDLE_CLOSED when the base candle ends the bucket).
+        """
+        if update_event.interval != self.base or not self.intervals:
+            return []
+        market, symbol = update_event.market_type, update_event.symbol
+        row = self.buffer.symbol_index(market, symbol)
+        latest = self.buffer.block(market, self.base).latest(row)
+        if latest is None:
+            return []
+        open_time, open, high, low, close, volume = latest.tolist()
+        base_closed = update_event.event_type == EventType.CANDLE_CLOSED
+        events = []
+        for interval, millis in zip(self.intervals, self.__millis):
+            bucket = self.__buckets.get((market, row, interval))
+            if bucket is None:
+                bucket = self.__buckets[(market, row, interval)] = _Bucket()
+            bucket_open_time = open_time - open_time % millis
+            if bucket.open_time != bucket_open_time:
+                if bucket.open_time is not None and bucket_open_time < bucket.open_time:
+                    continue
+                bucket.start(bucket_open_time, open)
+            elif bucket.base_open_time is not None and open_time != bucket.base_open_time:
+                if open_time < bucket.base_open_time:
+                    continue
+                # The previous base candle is final, fold it into the bucket
+                bucket.high = max(bucket.high, bucket.base_high)
+                bucket.low = min(bucket.low, bucket.base_low)
+                bucket.volume += bucket.base_volume
+            elif open_time == bucket_open_time:
+                bucket.open = open
+            bucket.base_open_time = open_time
+            bucket.base_high = high
+            bucket.base_low = low
+            bucket.base_volume = volume
+            self.buffer.block(market, interval).upsert(row, (
+                bucket_open_time,
+                bucket.open,
+                max(bucket.high, high),
+                min(bucket.low, low),
+                close,
+                bucket.volume + volume
+            ))
+            closed = base_closed and open_time + self.__base_millis == bucket_open_time + millis
+            events.append(UpdateEvent.create_update_event(
+                EventType.CANDLE_CLOSED if closed else EventType.CANDLE_TICK,
+                market,
+                symbol,
+                interval
+            ))
+        return events
+
+    def rebuild(self, market: MarketType, symbol: str):
+        """Recomputes all derived candles of a symbol from its base history (after backfill or warm start)."""
+        row = self.buffer.symbol_index(market, symbol)
+        candles = self.buffer.block(market, self.base).window(row)
+        if len(candles) == 0:
+            return
+        open_times = candles['open_time']
+        for interval, millis in zip(self.intervals, self.__millis):
+            bucket_open_times = open_times - open_times % millis
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_open_times)) + 1))
+            ends = np.concatenate((starts[1:], [len(candles)])) - 1
+            derived = np.zeros(len(starts), dtype=CANDLE_DTYPE)
+            derived['open_time'] = bucket_open_times[starts]
+            derived['open'] = candles['open'][starts]
+            derived['high'] = np.maximum.reduceat(candles['high'], starts)
+            derived['low'] = np.minimum.reduceat(candles['low'], starts)
+            derived['close'] = candles['close'][ends]
+            derived['volume'] = np.add.reduceat(candles['volume'], starts)
+            if open_times[0] != bucket_open_times[0]:
+                # The oldest bucket is only partially covered by the base history
+                derived = derived[1:]
+            self.buffer.block(market, interval).assign(row, derived)
+
+            bucket = self.__buckets.get((market, row, interval))
+            if bucket is None:
+                bucket = self.__buckets[(market, row, interval)] = _Bucket()
+            last = candles[starts[-1]:]
+            bucket.start(int(bucket_open_times[-1]), float(last['open'][0]))
+            if len(last) > 1:
+                bucket.high = float(last['high'][:-1].max())
+                bucket.low = float(last['low'][:-1].min())
+                bucket.volume = float(last['volume'][:-1].sum())
+            bucket.base_open_time = int(last['open_time'][-1])
+            bucket.base_high = float(last['high'][-1])
+            bucket.base_low = float(last['low'][-1])
+            bucket.base_volume = float(last['volume'][-1])
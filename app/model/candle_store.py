@@ -0,0 +1,91 @@
+import os
+import threading
+import numpy as np
+
+from app.enums import MarketType, TimeFrame
+from app.model.candle_buffer import CandleBuffer, CANDLE_DTYPE
+
+class CandleStore:
+    """
+    Append-only on-disk candle history with one file of fixed-width CANDLE_DTYPE
+    records per market/interval/symbol. Files are read back zero-copy through
+    NumPy memory maps; only closed candles newer than the last record are appended.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.__lock = threading.Lock()
+        self.__last_open_times = {}
+
+    def path(self, market: MarketType, symbol: str, interval: TimeFrame) -> str:
+        return os.path.join(self.directory, market.value, interval.value, f"{symbol}.bin")
+
+    def symbols(self, market: MarketType, interval: TimeFrame) -> list:
+        """Symbols with stored history for market/interval, sorted by name."""
+        directory = os.path.join(self.directory, market.value, interval.value)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            name[:-4] for name in os.listdir(directory)
+            if name.endswith('.bin') and os.path.getsize(os.path.join(directory, name)) >= CANDLE_DTYPE.itemsize
+        )
+
+    def load(self, market: MarketType, symbol: str, interval: TimeFrame) -> np.ndarray:
+        path = self.path(market, symbol, interval)
+        count = os.path.getsize(path) // CANDLE_DTYPE.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(path, dtype=CANDLE_DTYPE, mode='r', shape=(count,))
+
+    def last_open_time(self, market: MarketType, symbol: str, interval: TimeFrame) -> int:
+        key = (market, symbol, interval)
+        if key not in self.__last_open_times:
+            candles = self.load(market, symbol, interval)
+            self.__last_open_times[key] = int(candles['open_time'][-1]) if len(candles) else None
+        return self.__last_open_times[key]
+
+    def append(self, market: MarketType, symbol: str, interval: TimeFrame, candles) -> int:
+        """Appends closed candles (a record, or an array ordered from oldest to newest), returns the count written."""
+        candles = np.array(candles, dtype=CANDLE_DTYPE).reshape(-1)
+        with self.__lock:
+            last_open_time = self.last_open_time(market, symbol, interval)
+            if last_open_time is not None:
+                candles = candles[candles['open_time'] > last_open_time]
+            if len(candles) == 0:
+                return 0
+            path = self.path(market, symbol, interval)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'ab') as file:
+                # Drop a partially written trailing record left behind by a crash
+                file.truncate(file.tell() - file.tell() % CANDLE_DTYPE.itemsize)
+                file.write(candles.tobytes())
+            self.__last_open_times[(market, symbol, interval)] = int(candles['open_time'][-1])
+            return len(candles)
+
+    def write(self, market: MarketType, symbol: str, interval: TimeFrame, candles) -> int:
+        """Replaces the stored history with `candles` (ordered from oldest to newest), returns the count written."""
+        candles = np.array(candles, dtype=CANDLE_DTYPE).reshape(-1)
+        with self.__lock:
+            path = self.path(market, symbol, interval)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", 'wb') as file:
+                file.write(candles.tobytes())
+            os.replace(f"{path}.tmp", path)
+            self.__last_open_times[(market, symbol, interval)] = int(candles['open_time'][-1]) if len(candles) else None
+            return len(candles)
+
+    def warm_start(self, buffer: CandleBuffer, market: MarketType, symbols: list, intervals: list) -> dict:
+        """
+        Loads the most recent stored candles into the buffer and returns the last
+        stored open time of every symbol/interval pair that had any history.
+        """
+        last_open_times = {}
+        for interval in intervals:
+            block = buffer.block(market, interval)
+            for symbol in symbols:
+                candles = self.load(market, symbol, interval)
+                if len(candles) == 0:
+                    continue
+                block.assign(buffer.symbol_index(market, symbol), candles[-block.capacity:])
+                last_open_times[(symbol, interval)] = int(candles['open_time'][-1])
+        return last_open_times
@@ -0,0 +1,16 @@
+from typing import NamedTuple
+
+from app.enums import TimeFrame
+
+class Kline(NamedTuple):
+    """Typed kline record holding only the fields the platform reads."""
+    symbol: str
+    interval: TimeFrame
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    closed: bool
+    event_time: int
@@ -0,0 +1,84 @@
+import threading
+import numpy as np
+
+from app.enums import TimeFrame
+
+class MetricsTable:
+    """
+    Latest metric values in one float64 array of shape (symbols, intervals, fields),
+    addressed by the candle buffer's symbol row, the interval index and the field
+    index. Missing values are NaN. Writes hold a lock, so growing the table never
+    loses a concurrent write; readers take no lock.
+
+    With `buffer` (e.g. a shared memory block) the values live in that buffer
+    as-is and the table cannot grow beyond `rows`.
+    """
+
+    def __init__(self, intervals: list, fields: list, rows: int = 64, buffer=None):
+        self.intervals = list(intervals)
+        self.fields = list(fields)
+        self.interval_index = {interval: index for index, interval in enumerate(self.intervals)}
+        self.field_index = {field: index for index, field in enumerate(self.fields)}
+        self.shape = (len(self.intervals), len(self.fields))
+        self.fixed = buffer is not None
+        if self.fixed:
+            self.values = np.ndarray((rows, *self.shape), dtype=np.float64, buffer=buffer)
+        else:
+            self.values = np.full((rows, *self.shape), np.nan)
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def nbytes(intervals: list, fields: list, rows: int) -> int:
+        """Buffer size needed for a table of `rows` symbols."""
+        return rows * len(intervals) * len(fields) * np.dtype(np.float64).itemsize
+
+    @property
+    def rows(self) -> int:
+        return len(self.values)
+
+    def reserve(self, rows: int):
+        with self.__lock:
+            self.__reserve(rows)
+
+    def update(self, rows: np.ndarray, interval: TimeFrame, results: dict):
+        """Writes {field: vector over `rows`} for one interval."""
+        column = self.interval_index[interval]
+        with self.__lock:
+            self.__reserve(int(rows.max()) + 1 if len(rows) else 0)
+            if len(results) == len(self.fields):
+                self.values[rows, column] = np.array([results[field] for field in self.fields]).T
+                return
+            for field, vector in results.items():
+                self.values[rows, column, self.field_index[field]] = vector
+
+    def assign(self, row: int, interval: TimeFrame, results: dict):
+        """Writes {field: value} for a single row and interval."""
+        with self.__lock:
+            self.__reserve(row + 1)
+            values = self.values[row, self.interval_index[interval]]
+            for field, value in results.items():
+                values[self.field_index[field]] = value
+
+    def clear(self, rows: np.ndarray, interval: TimeFrame):
+        with self.__lock:
+            self.__reserve(int(rows.max()) + 1 if len(rows) else 0)
+            self.values[rows, self.interval_index[interval]] = np.nan
+
+    def __reserve(self, rows: int):
+        # Writers hold the lock, none of them can write into the array being replaced
+        if rows <= self.rows:
+            return
+        if self.fixed:
+            raise ValueError(f"Metrics table is full ({self.rows} rows)")
+        values = np.full((max(rows, self.rows * 2), *self.shape), np.nan)
+        values[:self.rows] = self.values
+        self.values = values
+
+    def get(self, row: int, interval: TimeFrame, field: str) -> float:
+        if row >= self.rows:
+            return np.nan
+        return float(self.values[row, self.interval_index[interval], self.field_index[field]])
+
+    def column(self, interval: TimeFrame, field: str, rows: int = None) -> np.ndarray:
+        """Returns the values of `field` for all symbols (a view, the first `rows` only if given)."""
+        return self.values[:rows, self.interval_index[interval], self.field_index[field]]
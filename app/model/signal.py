@@ -0,0 +1,16 @@
+from typing import NamedTuple
+
+class Signal(NamedTuple):
+    """Entry signal raised by a signal rule, delivered through the notification sinks."""
+    symbol: str
+    side: str
+    open_time: int
+    timestamp: int
+    width_1m: float
+    width_5m: float
+    rank: int = 0
+    total: int = 0
+    rule: str = ''
+
+    def to_dict(self) -> dict:
+        return self._asdict()
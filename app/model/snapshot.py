@@ -0,0 +1,123 @@
+import threading
+import time
+import numpy as np
+
+from app.enums import MarketType, TimeFrame
+from app.model.candle_buffer import CandleBuffer
+from app.model.metrics_table import MetricsTable
+
+class Snapshot:
+    """
+    Immutable, versioned view of one market: symbols, the metrics table and the
+    candle rings copied at publish time, all as read-only arrays. Readers may keep
+    and share it freely while ingest goes on writing the live structures.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        market: MarketType,
+        symbols: tuple,
+        intervals: tuple,
+        fields: tuple,
+        metrics: np.ndarray,
+        blocks: dict,
+        signals: tuple
+    ):
+        self.version = version
+        self.created = int(time.time() * 1000)
+        self.market = market
+        self.symbols = symbols
+        self.symbol_index = {symbol: row for row, symbol in enumerate(symbols)}
+        self.intervals = intervals
+        self.interval_index = {interval: index for index, interval in enumerate(intervals)}
+        self.fields = fields
+        self.field_index = {field: index for index, field in enumerate(fields)}
+        self.metrics = metrics
+        self.blocks = blocks
+        self.signals = signals
+        self.__rankings = {}
+
+    @staticmethod
+    def capture(
+        version: int,
+        market: MarketType,
+        buffer: CandleBuffer,
+        table: MetricsTable,
+        intervals: list,
+        signals: list = ()
+    ):
+        """`signals` are (sequence, Signal) pairs as kept by the memory notification sink."""
+        symbols = tuple(buffer.symbols(market))
+        blocks = {interval: buffer.block(market, interval).snapshot(len(symbols)) for interval in intervals}
+        metrics = np.full((len(symbols), len(table.intervals), len(table.fields)), np.nan)
+        rows = min(len(symbols), table.rows)
+        metrics[:rows] = table.values[:rows]
+        metrics.setflags(write=False)
+        return Snapshot(
+            version,
+            market,
+            symbols,
+            tuple(table.intervals),
+            tuple(table.fields),
+            metrics,
+            blocks,
+            tuple(signals)
+        )
+
+    def metric(self, symbol: str, interval: TimeFrame, field: str) -> float:
+        return float(self.metrics[self.symbol_index[symbol], self.interval_index[interval], self.field_index[field]])
+
+    def column(self, interval: TimeFrame, field: str) -> np.ndarray:
+        return self.metrics[:, self.interval_index[interval], self.field_index[field]]
+
+    def window(self, symbol: str, interval: TimeFrame, count: int = None) -> np.ndarray:
+        return self.blocks[interval].window(self.symbol_index[symbol], count)
+
+    def values(self, interval: TimeFrame, key: str) -> np.ndarray:
+        """
+        Metric column, or for `<field>_distance` keys the distance of the close to
+        that metric in percent of the close (e.g. 'bb.upper_distance').
+        """
+        if key in self.field_index:
+            return self.column(interval, key)
+        if key.endswith('_distance') and key[:-9] in self.field_index:
+            close = self.column(interval, 'close')
+            with np.errstate(all='ignore'):
+                return np.abs(close - self.column(interval, key[:-9])) / close * 100
+        raise ValueError(f"Unsupported metric {key}")
+
+    def rank(self, interval: TimeFrame, key: str, descending: bool = False) -> np.ndarray:
+        """Symbol rows sorted by `key` (missing values last), computed once per snapshot."""
+        ranking = self.__rankings.get((interval, key, descending))
+        if ranking is None:
+            values = self.values(interval, key)
+            ranking = np.argsort(-values if descending else values, kind='stable')
+            ranking.setflags(write=False)
+            self.__rankings[(interval, key, descending)] = ranking
+        return ranking
+
+class SnapshotStore:
+    """
+    Holds the latest snapshot per market. Publishing swaps a single reference, so
+    readers never take a lock and always see one complete version.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.__snapshots: dict[MarketType, Snapshot] = {}
+        self.__lock = threading.Lock()
+
+    def next_version(self) -> int:
+        with self.__lock:
+            self.version += 1
+            return self.version
+
+    def publish(self, snapshot: Snapshot):
+        with self.__lock:
+            snapshots = dict(self.__snapshots)
+            snapshots[snapshot.market] = snapshot
+            self.__snapshots = snapshots
+
+    def current(self, market: MarketType) -> Snapshot:
+        return self.__snapshots.get(market)
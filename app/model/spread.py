@@ -0,0 +1,13 @@
+from typing import NamedTuple
+
+class Spread(NamedTuple):
+    """Price gap of one symbol between the most and the least expensive venue, relative to their mid price."""
+    symbol: str
+    high_venue: str
+    high: float
+    low_venue: str
+    low: float
+    spread: float
+
+    def to_dict(self) -> dict:
+        return self._asdict()
@@ -0,0 +1,2 @@
+from .sinks import NotificationSink, ConsoleSink, SoundSink, WebhookSink, MemorySink
+from .notification_dispatcher import NotificationDispatcher
@@ -0,0 +1,108 @@
+import collections
+import threading
+import time
+import traceback
+
+from app.model import Signal
+from app.metrics import NOTIFICATIONS
+from app.notifications.sinks import NotificationSink
+
+class NotificationDispatcher:
+    """
+    Single consumer for signal notifications. `notify` never blocks: signals are
+    coalesced per symbol (a newer signal replaces one still waiting), the number of
+    pending symbols is bounded and delivery is capped at `rate` signals per second.
+    Sinks run one after another on the consumer thread, a failing sink does not
+    affect the others.
+    """
+
+    def __init__(self, sinks: list = None, max_pending: int = 1000, rate: float = 10.0):
+        self.sinks: list[NotificationSink] = list(sinks or [])
+        self.max_pending = max_pending
+        self.rate = rate
+        self.thread = None
+        self.running = False
+        self.__deadline = None
+        self.__order = collections.deque()
+        self.__pending: dict[str, Signal] = {}
+        self.__condition = threading.Condition()
+        self.__queued = NOTIFICATIONS.labels('queued')
+        self.__coalesced = NOTIFICATIONS.labels('coalesced')
+        self.__dropped = NOTIFICATIONS.labels('dropped')
+        self.__delivered = NOTIFICATIONS.labels('delivered')
+        self.__failed = NOTIFICATIONS.labels('failed')
+
+    def add_sink(self, sink: NotificationSink):
+        self.sinks.append(sink)
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.__consume, daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Delivers what is still pending without the rate cap for at most `timeout`
+        seconds and drops the rest, then stops the consumer and closes the sinks.
+        """
+        with self.__condition:
+            self.running = False
+            self.__deadline = time.monotonic() + timeout
+            self.__condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        for sink in self.sinks:
+            sink.close()
+
+    def notify(self, signal: Signal) -> bool:
+        with self.__condition:
+            if signal.symbol in self.__pending:
+                self.__pending[signal.symbol] = signal
+                self.__coalesced.inc()
+                return True
+            if len(self.__pending) >= self.max_pending:
+                self.__dropped.inc()
+                return False
+            self.__pending[signal.symbol] = signal
+            self.__order.append(signal.symbol)
+            self.__queued.inc()
+            self.__condition.notify()
+            return True
+
+    def pending(self) -> int:
+        return len(self.__pending)
+
+    def __next(self) -> Signal:
+        with self.__condition:
+            while not self.__order and self.running:
+                self.__condition.wait()
+            if not self.__order:
+                return None
+            if not self.running and time.monotonic() >= self.__deadline:
+                self.__dropped.inc(len(self.__order))
+                self.__order.clear()
+                self.__pending.clear()
+                return None
+            return self.__pending.pop(self.__order.popleft())
+
+    def __consume(self):
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        next_delivery = 0.0
+        while True:
+            delay = next_delivery - time.monotonic()
+            if delay > 0 and self.running:
+                # Signals arriving meanwhile keep coalescing in the pending map
+                time.sleep(delay)
+            signal = self.__next()
+            if signal is None:
+                break
+            next_delivery = time.monotonic() + interval
+            for sink in self.sinks:
+                try:
+                    sink.send(signal)
+                    self.__delivered.inc()
+                except Exception:
+                    self.__failed.inc()
+                    traceback.print_exc()
@@ -0,0 +1,108 @@
+import collections
+import math
+import queue
+import threading
+import urllib.request
+
+from datetime import datetime
+
+from app.model import Signal
+from app.utils import dumps
+
+class NotificationSink:
+    """Destination of delivered signals. `send` runs on the notification consumer thread."""
+
+    def send(self, signal: Signal):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class ConsoleSink(NotificationSink):
+    def send(self, signal: Signal):
+        formatted_date = datetime.fromtimestamp(signal.open_time / 1000).strftime('%Y-%m-%d %H:%M')
+        print(f"({signal.rank}/{signal.total}) {signal.symbol} [{formatted_date}]: {signal.side}{f' ({signal.rule})' if signal.rule else ''} | WH/2: {signal.width_1m/2.0:.2f}% (1m), {signal.width_5m/2.0:.2f}% (5m)")
+
+class SoundSink(NotificationSink):
+    """
+    Plays the alert on one dedicated thread. While a sound is playing at most one
+    more is kept pending, a burst of signals rings the bell once more, not once per signal.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pending = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self.__play_forever, daemon=True)
+        self.thread.start()
+
+    def send(self, signal: Signal):
+        try:
+            self.pending.put_nowait(self.path)
+        except queue.Full:
+            pass
+
+    def close(self):
+        # Never blocks the caller: a pending sound gives way to the stop marker
+        while True:
+            try:
+                self.pending.put_nowait(None)
+                return
+            except queue.Full:
+                try:
+                    self.pending.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def __play_forever(self):
+        from playsound import playsound
+        while True:
+            path = self.pending.get()
+            if path is None:
+                break
+            try:
+                playsound(path)
+            except Exception as e:
+                print(f"Cannot play {path}: {e}")
+
+class WebhookSink(NotificationSink):
+    """POSTs every signal as JSON to `url` (e.g. a local bot or a stand-in server)."""
+
+    def __init__(self, url: str, timeout: float = 2):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, signal: Signal):
+        # Widths are NaN before warm-up: not valid JSON, and ujson refuses to serialize them
+        payload = {
+            key: None if isinstance(value, float) and math.isnan(value) else value
+            for key, value in signal.to_dict().items()
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=dumps(payload),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class MemorySink(NotificationSink):
+    """
+    Ring of the most recent signals, read by the REST API. It keeps every signal,
+    so it is fed directly where signals are raised rather than through the
+    coalescing, rate-capped NotificationDispatcher.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.signals = collections.deque(maxlen=capacity)
+        self.sequence = 0
+        self.__lock = threading.Lock()
+
+    def send(self, signal: Signal):
+        with self.__lock:
+            self.sequence += 1
+            self.signals.append((self.sequence, signal))
+
+    def recent(self, since: int = 0) -> list:
+        """Returns (sequence, signal) pairs with a sequence above `since`, oldest first."""
+        return [(sequence, signal) for sequence, signal in list(self.signals) if sequence > since]
@@ -0,0 +1,2 @@
+from .recorder import FrameRecorder
+from .player import read_frames, replay_frames, serve_frames
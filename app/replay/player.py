@@ -0,0 +1,92 @@
+import asyncio
+import gzip
+import json
+import time
+
+from typing import Callable, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+from app.client.message_dispatcher import stream_name
+
+def read_frames(path: str) -> Iterator[tuple]:
+    """Yields (receive time ns, frame) pairs from a FrameRecorder file."""
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        for line in file:
+            timestamp, _, frame = line.rstrip('\n').partition('\t')
+            yield int(timestamp), frame
+
+def __delay(first: int, timestamp: int, started: float, speed: float) -> float:
+    return started + (timestamp - first) / 1e9 / speed - time.perf_counter()
+
+def replay_frames(path: str, message_handler: Callable, speed: float = 1.0) -> int:
+    """
+    Feeds recorded frames to `message_handler` keeping the recorded pacing scaled
+    by `speed` (1 for real time, N for N times faster, 0 for as fast as possible).
+    Returns the number of frames replayed.
+    """
+    count = 0
+    first = None
+    started = time.perf_counter()
+    for timestamp, frame in read_frames(path):
+        if speed > 0:
+            first = timestamp if first is None else first
+            delay = __delay(first, timestamp, started, speed)
+            if delay > 0:
+                time.sleep(delay)
+        message_handler(frame)
+        count += 1
+    return count
+
+async def serve_frames(path: str, host: str = '127.0.0.1', port: int = 9443, speed: float = 1.0):
+    """
+    Local stand-in for the Binance combined stream endpoint. Every connection gets
+    the recorded frames of the streams in its `streams=` query (all frames without
+    one), and SUBSCRIBE/UNSUBSCRIBE/LIST_SUBSCRIPTIONS requests are answered and
+    applied to that connection's streams, so sharded clients see each frame once.
+    """
+    import websockets
+
+    async def answer(websocket, streams: set):
+        async for message in websocket:
+            try:
+                request = json.loads(message)
+                method, params = request.get('method'), request.get('params') or []
+            except (ValueError, AttributeError):
+                continue
+            result = None
+            if method == 'SUBSCRIBE':
+                streams.update(params)
+            elif method == 'UNSUBSCRIBE':
+                streams.difference_update(params)
+            elif method == 'LIST_SUBSCRIPTIONS':
+                result = sorted(streams)
+            await websocket.send(json.dumps({'result': result, 'id': request.get('id')}, separators=(',', ':')))
+
+    async def stream(websocket, *args):
+        # websockets < 13 passes the request path, later versions expose the request
+        query = parse_qs(urlsplit(args[0] if args else websocket.request.path).query)
+        everything = 'streams' not in query
+        streams = set() if everything else set(query['streams'][0].split('/'))
+        answering = asyncio.ensure_future(answer(websocket, streams))
+        try:
+            first = None
+            started = time.perf_counter()
+            for timestamp, frame in read_frames(path):
+                if not everything and stream_name(frame) not in streams:
+                    continue
+                if speed > 0:
+                    first = timestamp if first is None else first
+                    delay = __delay(first, timestamp, started, speed)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await websocket.send(frame)
+            # Keep the connection open like a quiet live stream, so clients do not reconnect and replay again
+            await answering
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            answering.cancel()
+
+    async with websockets.serve(stream, host, port):
+        print(f"Replaying {path} on ws://{host}:{port}/stream at {'max speed' if speed <= 0 else f'{speed}x speed'}")
+        await asyncio.Future()
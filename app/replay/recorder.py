@@ -0,0 +1,27 @@
+import gzip
+import threading
+import time
+
+class FrameRecorder:
+    """
+    Captures raw websocket frames with their receive timestamp into a gzip
+    compressed file, one '<receive time ns>\\t<frame>' line per frame.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.frames = 0
+        self.__file = gzip.open(path, 'at', encoding='utf-8', compresslevel=6)
+        self.__lock = threading.Lock()
+
+    def record(self, message):
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        line = f"{time.time_ns()}\t{message}\n"
+        with self.__lock:
+            self.__file.write(line)
+            self.frames += 1
+
+    def close(self):
+        with self.__lock:
+            self.__file.close()
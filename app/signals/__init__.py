@@ -0,0 +1,2 @@
+from .rule_compiler import CompiledRule, compile_rule
+from .rule_engine import SignalRule, RuleEngine
@@ -0,0 +1,141 @@
+import ast
+import re
+
+import numpy as np
+
+from app.enums import TimeFrame
+
+# `bb.upper[1m]` -> `bb.upper['1m']`, `2%` -> `(2)` (widths are already expressed in percent)
+__INTERVAL_SUFFIX = re.compile(r"\[\s*(\d+[mh])\s*\]")
+__PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+_COMPARISONS = (ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq)
+_ARITHMETIC = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+
+class CompiledRule:
+    """
+    Rule expression compiled to a single NumPy expression over the metrics table
+    values (symbols, intervals, fields). `columns` are the (interval, field) indexes
+    it reads; symbols with any of them missing (NaN) never match.
+    """
+
+    def __init__(self, expression: str, code, columns: list):
+        self.expression = expression
+        self.code = code
+        self.columns = columns
+        self.__intervals = np.array([interval for interval, _ in columns], dtype=np.intp)
+        self.__fields = np.array([field for _, field in columns], dtype=np.intp)
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        with np.errstate(all='ignore'):
+            matched = eval(self.code, {'__builtins__': {}}, {'values': values, 'abs': np.abs})
+            ready = np.isfinite(values[:, self.__intervals, self.__fields]).all(axis=1)
+        # A constant rule evaluates to a scalar, & broadcasts it over the rows
+        return matched & ready
+
+class _RuleTransformer(ast.NodeTransformer):
+    def __init__(self, intervals: dict, fields: dict, default_interval: TimeFrame):
+        self.intervals = intervals
+        self.fields = fields
+        self.default_interval = default_interval
+        self.columns = []
+
+    def visit_Expression(self, node):
+        return ast.Expression(body=self.visit(node.body))
+
+    def visit_BoolOp(self, node):
+        operator = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        values = [self.visit(value) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(left=result, op=operator, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=self.visit(node.operand))
+        if isinstance(node.op, (ast.USub, ast.UAdd)):
+            return ast.UnaryOp(op=node.op, operand=self.visit(node.operand))
+        raise ValueError(f"Unsupported operator {type(node.op).__name__}")
+
+    def visit_Compare(self, node):
+        # a < b <= c -> (a < b) & (b <= c)
+        operands = [self.visit(node.left)] + [self.visit(comparator) for comparator in node.comparators]
+        result = None
+        for index, operator in enumerate(node.ops):
+            if not isinstance(operator, _COMPARISONS):
+                raise ValueError(f"Unsupported comparison {type(operator).__name__}")
+            comparison = ast.Compare(left=operands[index], ops=[operator], comparators=[operands[index + 1]])
+            result = comparison if result is None else ast.BinOp(left=result, op=ast.BitAnd(), right=comparison)
+        return result
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _ARITHMETIC):
+            raise ValueError(f"Unsupported operator {type(node.op).__name__}")
+        return ast.BinOp(left=self.visit(node.left), op=node.op, right=self.visit(node.right))
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id != 'abs' or len(node.args) != 1 or node.keywords:
+            raise ValueError(f"Unsupported function call {ast.unparse(node)}")
+        return ast.Call(func=ast.Name(id='abs', ctx=ast.Load()), args=[self.visit(node.args[0])], keywords=[])
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        return self.__column(node.id, self.default_interval)
+
+    def visit_Attribute(self, node):
+        return self.__column(self.__field_name(node), self.default_interval)
+
+    def visit_Subscript(self, node):
+        if not isinstance(node.slice, ast.Constant) or not isinstance(node.slice.value, str):
+            raise ValueError(f"Unsupported subscript {ast.unparse(node)}")
+        return self.__column(self.__field_name(node.value), TimeFrame.from_string(node.slice.value))
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax {type(node).__name__}")
+
+    def __field_name(self, node) -> str:
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return f"{self.__field_name(node.value)}.{node.attr}"
+        raise ValueError(f"Unsupported field reference {ast.unparse(node)}")
+
+    def __column(self, field: str, interval: TimeFrame):
+        if field not in self.fields:
+            raise ValueError(f"Unsupported metric {field}")
+        if interval not in self.intervals:
+            raise ValueError(f"Unsupported interval {interval}")
+        column = (self.intervals[interval], self.fields[field])
+        if column not in self.columns:
+            self.columns.append(column)
+        # values[:, interval, field]
+        return ast.Subscript(
+            value=ast.Name(id='values', ctx=ast.Load()),
+            slice=ast.Tuple(elts=[
+                ast.Slice(),
+                ast.Constant(value=column[0]),
+                ast.Constant(value=column[1])
+            ], ctx=ast.Load()),
+            ctx=ast.Load()
+        )
+
+def compile_rule(expression: str, intervals: dict, fields: dict, default_interval: TimeFrame = TimeFrame.MIN_1) -> CompiledRule:
+    """
+    Compiles a rule such as `close >= bb.upper[1m] and bb.width[1m] > 2%` against the
+    interval and field indexes of a metrics table. Metrics without an interval refer
+    to `default_interval`. Supported: and/or/not, comparisons (chained too), + - * /,
+    abs() and numeric constants.
+    """
+    source = __PERCENT.sub(r"(\1)", __INTERVAL_SUFFIX.sub(r"['\1']", expression))
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Unsupported rule expression {expression!r}: {e.msg}") from None
+    transformer = _RuleTransformer(intervals, fields, default_interval)
+    body = ast.fix_missing_locations(transformer.visit(tree))
+    return CompiledRule(expression, compile(body, f"<rule {expression}>", 'eval'), transformer.columns)
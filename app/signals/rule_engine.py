@@ -0,0 +1,62 @@
+import threading
+import numpy as np
+
+from app.enums import TimeFrame
+from app.model import MetricsTable
+from app.signals.rule_compiler import compile_rule
+
+class SignalRule:
+    def __init__(self, name: str, side: str, when: str):
+        self.name = name
+        self.side = side
+        self.when = when
+
+    @staticmethod
+    def from_config(config: dict):
+        return SignalRule(config['name'], config['side'], config['when'])
+
+    def __str__(self):
+        return f"SignalRule(name={self.name}, side={self.side}, when={self.when})"
+
+class RuleEngine:
+    """
+    Evaluates compiled signal rules against a metrics table, for all symbols at once
+    or a subset of rows. A symbol signals at most once per debounce period, whichever
+    rule matches first: the last period it fired in is kept in an array indexed by
+    symbol row.
+    """
+
+    def __init__(self, rules: list, table: MetricsTable, default_interval: TimeFrame = TimeFrame.MIN_1):
+        self.rules = list(rules)
+        self.compiled = [
+            compile_rule(rule.when, table.interval_index, table.field_index, default_interval)
+            for rule in self.rules
+        ]
+        self.fired = np.zeros(table.rows, dtype=np.int64)
+        self.__lock = threading.Lock()
+
+    def evaluate(self, table: MetricsTable, period: int, rows: np.ndarray = None) -> list:
+        """
+        Returns (rule, fired rows) pairs for the rules matching in debounce `period`
+        (e.g. the current minute) for symbols that did not fire in it yet.
+        """
+        if rows is None:
+            rows = np.arange(table.rows)
+        values = table.values[rows]
+        matched = [rows[compiled(values)] for compiled in self.compiled]
+        matches = []
+        # Evaluation runs unlocked, the check-and-set of the debounce does not
+        with self.__lock:
+            if table.rows > len(self.fired):
+                fired = np.zeros(table.rows, dtype=np.int64)
+                fired[:len(self.fired)] = self.fired
+                self.fired = fired
+            for rule, rule_rows in zip(self.rules, matched):
+                if len(rule_rows) == 0:
+                    continue
+                rule_rows = rule_rows[self.fired[rule_rows] != period]
+                if len(rule_rows) == 0:
+                    continue
+                self.fired[rule_rows] = period
+                matches.append((rule, rule_rows))
+        return matches
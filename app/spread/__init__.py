@@ -0,0 +1,2 @@
+from .venues import TickerVenue, BinanceVenue, BybitVenue, OkxVenue, create_venue, VENUES
+from .spread_scanner import SpreadScanner, SymbolIndex
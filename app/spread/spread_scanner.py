@@ -0,0 +1,123 @@
+import asyncio
+import time
+import traceback
+import numpy as np
+
+from app.model import Spread
+from app.metrics import SPREAD_FETCH_SECONDS, SPREAD_FETCH_ERRORS
+from app.spread.venues import TickerVenue
+
+class SymbolIndex:
+    """
+    Canonical symbols of all venues, one column each. Every venue keeps a native
+    symbol -> column map (-1 for instruments that are not USDT perpetuals), built
+    on first sight and only extended when a venue lists something new.
+    """
+
+    def __init__(self, venues: list):
+        self.venues = venues
+        self.symbols = []
+        self.columns = {}
+        self.venue_columns = [{} for _ in venues]
+
+    def map(self, venue_index: int, symbols: list) -> np.ndarray:
+        mapping = self.venue_columns[venue_index]
+        try:
+            return np.array([mapping[symbol] for symbol in symbols], dtype=np.int64)
+        except KeyError:
+            pass
+        venue = self.venues[venue_index]
+        for symbol in symbols:
+            if symbol not in mapping:
+                canonical = venue.canonical(symbol)
+                if canonical is None:
+                    mapping[symbol] = -1
+                    continue
+                if canonical not in self.columns:
+                    self.columns[canonical] = len(self.symbols)
+                    self.symbols.append(canonical)
+                mapping[symbol] = self.columns[canonical]
+        return np.array([mapping[symbol] for symbol in symbols], dtype=np.int64)
+
+class SpreadScanner:
+    """
+    Fetches the tickers of all venues concurrently on a fixed schedule and computes
+    the spread of every symbol listed on at least two venues in one vectorized pass:
+    (highest - lowest) / mid, reported when above `threshold` (0.002 = 0.2%).
+    A venue that fails a fetch is left out of that scan.
+    """
+
+    def __init__(self, venues: list, threshold: float = 0.002, interval: float = 5.0):
+        self.venues = list(venues)
+        self.threshold = threshold
+        self.interval = interval
+        self.index = SymbolIndex(self.venues)
+        self.prices = np.zeros((len(self.venues), 0))
+        self.latency = {venue.name: None for venue in self.venues}
+        self.common = 0
+
+    async def scan(self) -> list:
+        """Runs one concurrent fetch of all venues, returns the spreads above the threshold, widest first."""
+        results = await asyncio.gather(*(self.__fetch(index, venue) for index, venue in enumerate(self.venues)))
+        prices = np.full((len(self.venues), len(self.index.symbols)), np.nan)
+        for index, result in enumerate(results):
+            if result is not None:
+                columns, values = result
+                listed = columns >= 0
+                prices[index, columns[listed]] = values[listed]
+        self.prices = prices
+        return self.spreads(prices)
+
+    def spreads(self, prices: np.ndarray) -> list:
+        quoted = prices > 0
+        common = np.flatnonzero(quoted.sum(axis=0) >= 2)
+        self.common = len(common)
+        if not len(common):
+            return []
+        quoted = quoted[:, common]
+        high_venues = np.where(quoted, prices[:, common], -np.inf).argmax(axis=0)
+        low_venues = np.where(quoted, prices[:, common], np.inf).argmin(axis=0)
+        high = prices[high_venues, common]
+        low = prices[low_venues, common]
+        spreads = (high - low) / ((high + low) / 2)
+        hits = np.flatnonzero(spreads > self.threshold)
+        hits = hits[np.argsort(-spreads[hits], kind='stable')]
+        return [
+            Spread(
+                self.index.symbols[common[hit]],
+                self.venues[high_venues[hit]].name,
+                float(high[hit]),
+                self.venues[low_venues[hit]].name,
+                float(low[hit]),
+                float(spreads[hit])
+            )
+            for hit in hits.tolist()
+        ]
+
+    async def run(self, on_scan, iterations: int = None):
+        """Scans every `interval` seconds (`iterations` times, forever by default) and passes the spreads to `on_scan`."""
+        count = 0
+        while iterations is None or count < iterations:
+            started = time.monotonic()
+            try:
+                on_scan(await self.scan())
+            except Exception:
+                traceback.print_exc()
+            count += 1
+            if iterations is None or count < iterations:
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def __fetch(self, index: int, venue: TickerVenue) -> tuple:
+        started = time.perf_counter()
+        try:
+            symbols, prices = await venue.fetch()
+        except Exception as e:
+            self.latency[venue.name] = None
+            SPREAD_FETCH_ERRORS.labels(venue.name).inc()
+            print(f"Cannot fetch {venue.name} tickers: {e}")
+            return None
+        elapsed = time.perf_counter() - started
+        self.latency[venue.name] = elapsed
+        SPREAD_FETCH_SECONDS.labels(venue.name).observe(elapsed)
+        # Fresh listings can quote an empty last price
+        return self.index.map(index, symbols), np.array([float(price) if price else np.nan for price in prices])
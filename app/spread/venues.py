@@ -0,0 +1,68 @@
+import abc
+
+from app.api import fetch_tickers_24h
+from app.client import http_client
+from app.enums import MarketType
+
+class TickerVenue(abc.ABC):
+    """
+    One exchange's USDT perpetual tickers. `fetch` returns native symbols and last
+    prices, `canonical` maps a native symbol to the shared 'BTCUSDT' form (None when
+    the instrument is not a USDT perpetual). `url` can point at a local stand-in server.
+    """
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url.rstrip('/')
+
+    @abc.abstractmethod
+    async def fetch(self) -> tuple:
+        ...
+
+    def canonical(self, symbol: str) -> str:
+        return symbol if symbol.endswith('USDT') else None
+
+class BinanceVenue(TickerVenue):
+    def __init__(self, url: str = 'https://fapi.binance.com/fapi/v1', market: MarketType = MarketType.FUTURES):
+        super().__init__('binance', url)
+        self.market = market
+
+    async def fetch(self) -> tuple:
+        tickers = await fetch_tickers_24h(self.market, self.url)
+        return [ticker['symbol'] for ticker in tickers], [ticker['lastPrice'] for ticker in tickers]
+
+class BybitVenue(TickerVenue):
+    def __init__(self, url: str = 'https://api.bybit.com'):
+        super().__init__('bybit', url)
+
+    async def fetch(self) -> tuple:
+        # Bybit and OKX do not count Binance request weight
+        response = await http_client.request('GET', f"{self.url}/v5/market/tickers?category=linear", weight=0)
+        tickers = response['result']['list']
+        return [ticker['symbol'] for ticker in tickers], [ticker['lastPrice'] for ticker in tickers]
+
+class OkxVenue(TickerVenue):
+    def __init__(self, url: str = 'https://www.okx.com'):
+        super().__init__('okx', url)
+
+    async def fetch(self) -> tuple:
+        response = await http_client.request('GET', f"{self.url}/api/v5/market/tickers?instType=SWAP", weight=0)
+        tickers = response['data']
+        return [ticker['instId'] for ticker in tickers], [ticker['last'] for ticker in tickers]
+
+    def canonical(self, symbol: str) -> str:
+        # 'BTC-USDT-SWAP' -> 'BTCUSDT'
+        base, _, rest = symbol.partition('-USDT-')
+        return f"{base}USDT" if rest == 'SWAP' else None
+
+VENUES = {
+    'binance': BinanceVenue,
+    'bybit': BybitVenue,
+    'okx': OkxVenue,
+}
+
+def create_venue(name: str, url: str = None) -> TickerVenue:
+    venue_class = VENUES.get(name)
+    if venue_class is None:
+        raise ValueError(f"Unsupported venue {name}")
+    return venue_class(url) if url else venue_class()
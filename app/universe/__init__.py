@@ -0,0 +1 @@
+from .symbol_universe import SymbolUniverse
@@ -0,0 +1,95 @@
+import heapq
+import threading
+
+class SymbolUniverse:
+    """
+    Top `size` symbols by 24h quote volume, kept current from ticker updates
+    (the REST /ticker/24hr payload or the !miniTicker@arr stream). Members sit in
+    a min-heap and all other symbols in a max-heap, stale heap entries are dropped
+    lazily, so an update costs O(log n) per changed symbol instead of a full sort.
+
+    A symbol only replaces the weakest member once its volume is `hysteresis`
+    (0.1 = 10%) above it, symbols around the cutoff do not flap in and out.
+    """
+
+    def __init__(self, size: int = 400, hysteresis: float = 0.1, quote: str = 'USDT'):
+        self.size = size
+        self.hysteresis = hysteresis
+        self.quote = quote
+        self.volumes = {}
+        self.members = set()
+        self.__members = []
+        self.__candidates = []
+        self.__lock = threading.Lock()
+
+    def update(self, tickers: list) -> tuple:
+        """Applies ticker payloads, returns the (added, removed) symbols of the top `size`."""
+        with self.__lock:
+            for ticker in tickers:
+                symbol = ticker['s'] if 's' in ticker else ticker['symbol']
+                if not symbol.endswith(self.quote):
+                    continue
+                volume = float(ticker['q'] if 'q' in ticker else ticker['quoteVolume'])
+                if self.volumes.get(symbol) == volume:
+                    continue
+                self.volumes[symbol] = volume
+                if symbol in self.members:
+                    heapq.heappush(self.__members, (volume, symbol))
+                else:
+                    heapq.heappush(self.__candidates, (-volume, symbol))
+
+            changes = {}
+            while len(self.members) < self.size:
+                best = self.__top(self.__candidates, False)
+                if best is None:
+                    break
+                self.__move(best, True, changes)
+            while True:
+                weakest = self.__top(self.__members, True)
+                best = self.__top(self.__candidates, False)
+                if weakest is None or best is None or self.volumes[best] <= self.volumes[weakest] * (1 + self.hysteresis):
+                    break
+                self.__move(weakest, False, changes)
+                self.__move(best, True, changes)
+            self.__compact()
+            return (
+                [symbol for symbol, added in changes.items() if added],
+                [symbol for symbol, added in changes.items() if not added]
+            )
+
+    def ranking(self) -> list:
+        """Members ordered by volume, highest first."""
+        with self.__lock:
+            return sorted(self.members, key=self.volumes.__getitem__, reverse=True)
+
+    def __top(self, heap: list, member: bool) -> str:
+        while heap:
+            key, symbol = heap[0]
+            if (symbol in self.members) == member and self.volumes[symbol] == (key if member else -key):
+                return symbol
+            heapq.heappop(heap)
+        return None
+
+    def __move(self, symbol: str, member: bool, changes: dict):
+        volume = self.volumes[symbol]
+        if member:
+            heapq.heappop(self.__candidates)
+            self.members.add(symbol)
+            heapq.heappush(self.__members, (volume, symbol))
+        else:
+            heapq.heappop(self.__members)
+            self.members.discard(symbol)
+            heapq.heappush(self.__candidates, (-volume, symbol))
+        # A symbol that enters and leaves within one update is no change
+        if changes.get(symbol) == (not member):
+            del changes[symbol]
+        else:
+            changes[symbol] = member
+
+    def __compact(self):
+        # Volume updates leave stale entries behind, rebuild the heaps once they dominate
+        if len(self.__members) + len(self.__candidates) > 4 * len(self.volumes) + 64:
+            self.__members = [(self.volumes[symbol], symbol) for symbol in self.members]
+            self.__candidates = [(-volume, symbol) for symbol, volume in self.volumes.items() if symbol not in self.members]
+            heapq.heapify(self.__members)
+            heapq.heapify(self.__candidates)
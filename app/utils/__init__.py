@@ -2,4 +2,5 @@ from .console_utils import print_order_book
 from .threading_utils import run_until_complete, handle_task_result
 from .datetime_utils import previous_moment, unix_millis, seconds
 from .dictionary_utils import nested_dict
+from .json_utils import loads, dumps, JSON_BACKEND
 
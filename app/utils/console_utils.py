@@ -1,8 +1,9 @@
-import pandas as pd
-
 from app.enums import MarketType
 
 def print_order_book(storage: dict):
+    # pandas is only needed here, importing it costs more than the rest of the application
+    import pandas as pd
+
     bids = pd.DataFrame(storage['bids'].items(), columns=['Price', 'Quantity'])
     asks = pd.DataFrame(storage['asks'].items(), columns=['Price', 'Quantity'])
     
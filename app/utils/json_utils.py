@@ -0,0 +1,32 @@
+# Fastest available JSON backend: orjson, then ujson, then the standard library
+try:
+    import orjson
+
+    JSON_BACKEND = 'orjson'
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    try:
+        import ujson
+
+        JSON_BACKEND = 'ujson'
+
+        def loads(data):
+            return ujson.loads(data)
+
+        def dumps(obj) -> bytes:
+            return ujson.dumps(obj).encode()
+    except ImportError:
+        import json
+
+        JSON_BACKEND = 'json'
+
+        def loads(data):
+            return json.loads(data)
+
+        def dumps(obj) -> bytes:
+            return json.dumps(obj, separators=(',', ':')).encode()
@@ -1,13 +1,5 @@
 import asyncio
 
-def __get_event_loop():
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop;
-
 def handle_task_result(task, success_handler, failure_handler):
     try:
         success_handler(task.result())
@@ -15,5 +7,20 @@ def handle_task_result(task, success_handler, failure_handler):
         failure_handler()
 
 def run_until_complete(method_name):
-    loop = __get_event_loop()
-    loop.run_until_complete(method_name())
\ No newline at end of file
+    """
+    Runs the coroutine returned by `method_name` on a new event loop and returns its
+    result. The shared HTTP client's session of that loop is closed with the loop.
+    """
+    from app.client import http_client
+    
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(method_name())
+    finally:
+        try:
+            loop.run_until_complete(http_client.close())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,21 @@
+import importlib
+
+# Only the broadcaster works without Flask, everything else is imported on first use
+_EXPORTS = {
+    'metrics_api': '.metrics_api',
+    'ResponseCache': '.response_cache',
+    'create_query_api': '.query_api',
+    'EventBroadcaster': '.event_broadcaster',
+    'create_event_stream_api': '.event_stream',
+}
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'app.web' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,87 @@
+import collections
+import itertools
+import threading
+
+from app.enums import EventType, TimeFrame
+from app.metrics import EVENT_STREAM_CLIENTS, EVENT_STREAM_EVENTS, EVENT_STREAM_EVICTED
+from app.utils import dumps
+
+class EventBroadcaster:
+    """
+    Fan-out of pipeline events to server-sent event subscribers. Every event is
+    serialized once into a shared ring of the last `capacity` events; each
+    subscriber only keeps a cursor into it, so publishing costs the same for one
+    or fifty subscribers. A subscriber that falls more than `capacity` events
+    behind (a stalled dashboard) is evicted instead of holding events back.
+    """
+
+    def __init__(self, capacity: int = 4096, heartbeat: float = 15.0):
+        self.capacity = capacity
+        self.heartbeat = heartbeat
+        self.events = collections.deque(maxlen=capacity)
+        self.sequence = 0
+        self.subscribers = 0
+        self.__condition = threading.Condition()
+        EVENT_STREAM_CLIENTS.function = lambda: self.subscribers
+
+    def publish(self, event_type: EventType, payload: dict, symbol: str = None, interval: TimeFrame = None) -> int:
+        """Queues one event for all subscribers, returns its sequence (0 when nobody listens)."""
+        if not self.subscribers:
+            return 0
+        data = dumps(payload)
+        name = event_type.value
+        with self.__condition:
+            self.sequence += 1
+            chunk = b'id: %d\nevent: %s\ndata: %s\n\n' % (self.sequence, name.encode(), data)
+            self.events.append((self.sequence, name, symbol, interval, chunk))
+            self.__condition.notify_all()
+        EVENT_STREAM_EVENTS.labels(name).inc()
+        return self.sequence
+
+    def read(self, after: int, timeout: float) -> tuple:
+        """
+        Waits up to `timeout` seconds for events newer than `after`, returns
+        (events, lagged) where `lagged` tells the newer events already left the ring.
+        """
+        with self.__condition:
+            if self.sequence <= after:
+                self.__condition.wait(timeout)
+            if self.sequence <= after:
+                return [], False
+            oldest = self.events[0][0]
+            if after + 1 < oldest:
+                return [], True
+            return list(itertools.islice(self.events, after + 1 - oldest, None)), False
+
+    def stream(self, symbols: set = None, intervals: set = None, events: set = None, after: int = None):
+        """
+        Generator of SSE chunks matching the filters (None accepts everything).
+        `after` resumes from a Last-Event-ID while that event is still in the ring.
+        """
+        with self.__condition:
+            self.subscribers += 1
+            oldest = self.events[0][0] if self.events else self.sequence + 1
+            cursor = after if after is not None and oldest - 1 <= after <= self.sequence else self.sequence
+        try:
+            yield b'retry: 3000\n\n'
+            while True:
+                entries, lagged = self.read(cursor, self.heartbeat)
+                if lagged:
+                    EVENT_STREAM_EVICTED.inc()
+                    yield b'event: EVICTED\ndata: {}\n\n'
+                    return
+                if not entries:
+                    yield b': keepalive\n\n'
+                    continue
+                cursor = entries[-1][0]
+                chunks = [
+                    chunk for _, name, symbol, interval, chunk in entries
+                    if (events is None or name in events)
+                    and (symbols is None or symbol is None or symbol in symbols)
+                    and (intervals is None or interval is None or interval in intervals)
+                ]
+                if chunks:
+                    yield b''.join(chunks)
+        finally:
+            with self.__condition:
+                self.subscribers -= 1
@@ -0,0 +1,35 @@
+from flask import Blueprint, Response, request
+
+from app.enums import EventType, TimeFrame
+from app.utils import dumps
+from app.web.event_broadcaster import EventBroadcaster
+
+def _argument_set(name: str, parse=str) -> set:
+    value = request.args.get(name)
+    if not value:
+        return None
+    return {parse(item.strip()) for item in value.split(',') if item.strip()}
+
+def create_event_stream_api(broadcaster: EventBroadcaster) -> Blueprint:
+    """
+    `/stream` pushes SIGNAL, METRIC_UPDATE and CANDLE_CLOSED events as server-sent
+    events, optionally filtered with comma separated `symbols`, `intervals` and `events`.
+    """
+    event_stream_api = Blueprint('event_stream_api', __name__)
+
+    @event_stream_api.route('/stream')
+    def stream():
+        try:
+            symbols = _argument_set('symbols', str.upper)
+            intervals = _argument_set('intervals', TimeFrame.from_string)
+            events = _argument_set('events', lambda name: EventType(name.upper()).value)
+        except ValueError as e:
+            return Response(dumps({'error': str(e)}), status=400, content_type='application/json')
+        after = request.headers.get('Last-Event-ID', type=int)
+        return Response(
+            broadcaster.stream(symbols, intervals, events, after),
+            content_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    return event_stream_api
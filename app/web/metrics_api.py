@@ -0,0 +1,10 @@
+from flask import Blueprint, Response
+
+from app.metrics import registry
+
+metrics_api = Blueprint('metrics_api', __name__)
+
+@metrics_api.route('/metrics')
+def metrics():
+    """Prometheus text exposition of all registered metrics."""
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
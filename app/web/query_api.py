@@ -0,0 +1,122 @@
+import math
+
+from flask import Blueprint, Response, request
+
+from app.enums import MarketType, TimeFrame
+from app.model import SnapshotStore, Snapshot
+from app.utils import dumps
+from app.web.response_cache import ResponseCache
+
+def _clean(values: list) -> list:
+    # NaN is not valid JSON
+    return [None if isinstance(value, float) and math.isnan(value) else value for value in values]
+
+def _metric_key(key: str, fields: dict) -> str:
+    # bb_width -> bb.width and bb_upper_distance -> bb.upper_distance, while
+    # keeping field names like volume_z intact
+    if key in fields:
+        return key
+    suffix = '_distance' if key.endswith('_distance') else ''
+    field = key[:len(key) - len(suffix)]
+    if field not in fields:
+        field = field.replace('_', '.', 1)
+    return field + suffix
+
+def _json(body: bytes, status: int = 200) -> Response:
+    return Response(body, status=status, content_type='application/json')
+
+def _error(message: str, status: int) -> Response:
+    return _json(dumps({'error': message}), status)
+
+def create_query_api(snapshots: SnapshotStore, market: MarketType, max_limit: int = 1000) -> Blueprint:
+    """
+    Read endpoints over the latest published snapshot of `market`. Nothing here
+    touches the live buffers: responses are rendered from the immutable snapshot
+    and cached per snapshot version and query string.
+    """
+    query_api = Blueprint('query_api', __name__)
+    cache = ResponseCache()
+
+    def cached(render) -> Response:
+        snapshot = snapshots.current(market)
+        if snapshot is None:
+            return _error('No data published yet', 503)
+        try:
+            return _json(cache.get(snapshot.version, request.full_path, lambda: render(snapshot)))
+        except (KeyError, ValueError) as e:
+            return _error(str(e).strip("'"), 400)
+
+    def limit_argument(default: int) -> int:
+        return max(0, min(request.args.get('limit', default, type=int), max_limit))
+
+    @query_api.route('/symbols')
+    def symbols():
+        return cached(lambda snapshot: dumps({
+            'version': snapshot.version,
+            'created': snapshot.created,
+            'symbols': list(snapshot.symbols),
+        }))
+
+    @query_api.route('/candles/<symbol>/<interval>')
+    def candles(symbol: str, interval: str):
+        def render(snapshot: Snapshot) -> bytes:
+            time_frame = TimeFrame.from_string(interval)
+            if symbol.upper() not in snapshot.symbol_index:
+                raise ValueError(f"Unsupported symbol {symbol}")
+            if time_frame not in snapshot.blocks:
+                raise ValueError(f"Unsupported interval {interval}")
+            window = snapshot.window(symbol.upper(), time_frame, limit_argument(max_limit))
+            return dumps({
+                'version': snapshot.version,
+                'symbol': symbol.upper(),
+                'interval': time_frame.value,
+                'candles': [
+                    [int(open_time), open, high, low, close, volume]
+                    for open_time, open, high, low, close, volume in window.tolist()
+                ],
+            })
+        return cached(render)
+
+    @query_api.route('/metrics')
+    def metrics():
+        def render(snapshot: Snapshot) -> bytes:
+            time_frame = TimeFrame.from_string(request.args.get('interval', TimeFrame.MIN_1.value))
+            if time_frame not in snapshot.interval_index:
+                raise ValueError(f"Unsupported interval {time_frame}")
+            rows = range(len(snapshot.symbols))
+            key = request.args.get('sort')
+            if key is not None:
+                key = _metric_key(key, snapshot.field_index)
+                descending = request.args.get('order', 'desc' if key.endswith('width') else 'asc') == 'desc'
+                rows = snapshot.rank(time_frame, key, descending)
+            rows = rows[:limit_argument(50)]
+            values = snapshot.metrics[list(rows), snapshot.interval_index[time_frame]].tolist()
+            return dumps({
+                'version': snapshot.version,
+                'interval': time_frame.value,
+                'sort': key,
+                'fields': list(snapshot.fields),
+                'items': [
+                    {'symbol': snapshot.symbols[row], 'values': _clean(row_values)}
+                    for row, row_values in zip(rows, values)
+                ],
+            })
+        return cached(render)
+
+    @query_api.route('/signals')
+    def signals():
+        def render(snapshot: Snapshot) -> bytes:
+            since = request.args.get('since', 0, type=int)
+            items = [
+                {'sequence': sequence, **signal.to_dict()}
+                for sequence, signal in snapshot.signals
+                if sequence > since
+            ]
+            return dumps({
+                'version': snapshot.version,
+                'last': snapshot.signals[-1][0] if snapshot.signals else since,
+                'signals': [{key: _clean([value])[0] for key, value in item.items()} for item in items],
+            })
+        return cached(render)
+
+    return query_api
@@ -0,0 +1,27 @@
+import threading
+
+class ResponseCache:
+    """Serialized responses of one snapshot version; moving to a newer version drops the old entries."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.version = None
+        self.entries = {}
+        self.__lock = threading.Lock()
+
+    def get(self, version: int, key: str, render):
+        entries = self.entries
+        if self.version == version:
+            body = entries.get(key)
+            if body is not None:
+                return body
+        body = render()
+        with self.__lock:
+            if self.version != version:
+                if self.version is not None and version < self.version:
+                    return body
+                self.version = version
+                self.entries = {}
+            if len(self.entries) < self.max_entries:
+                self.entries[key] = body
+        return body
@@ -0,0 +1 @@
+from .worker_pool import WorkerPool, attach_metrics_table, partition_symbols
@@ -0,0 +1,147 @@
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+import traceback
+import numpy as np
+
+from multiprocessing import shared_memory
+from typing import Callable
+
+from app.enums import MarketType
+from app.metrics import registry
+from app.model import MetricsTable
+
+def partition_symbols(symbols: list, workers: int) -> list:
+    """Deals volume-ranked symbols out round robin, so every worker gets a similar share of the busy ones."""
+    return [symbols[index::workers] for index in range(workers)]
+
+def attach_metrics_table(name: str, intervals: list, fields: list, rows: int) -> tuple:
+    """Opens the coordinator's shared metrics table from a worker process, returns (memory, table)."""
+    # Spawned workers share the coordinator's resource tracker, the block is unlinked once by the coordinator
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, MetricsTable(intervals, fields, rows, buffer=memory.buf)
+
+def _report_metrics(index: int, samples, interval: float):
+    while True:
+        time.sleep(interval)
+        _send_sample(index, samples)
+
+def _send_sample(index: int, samples):
+    try:
+        samples.put_nowait((index, registry.sample()))
+    except queue.Full:
+        pass
+
+def _work(target: Callable, samples, metrics_interval: float, index: int, *args):
+    # Ctrl+C reaches the whole process group, the coordinator stops the workers through the stop event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    threading.Thread(target=_report_metrics, args=(index, samples, metrics_interval), daemon=True).start()
+    target(index, *args)
+    _send_sample(index, samples)
+
+class WorkerPool:
+    """
+    Coordinator of K worker processes. Every worker owns one partition of the
+    symbols (its websocket shards, candle rings and indicator state) and writes
+    metrics straight into a MetricsTable in shared memory, at the symbol's row in
+    the full symbol list. Signals come back over a multiprocessing queue and are
+    handed to `on_signal` on a coordinator thread. Every `metrics_interval` seconds
+    the workers send their metrics, which the coordinator's registry renders with
+    a worker label.
+
+    `target(index, symbols, universe, market, memory_name, rows, signals, stopping, *args)`
+    is the worker entry point; it must be importable by the spawned processes and
+    return once the `stopping` event is set.
+    """
+
+    def __init__(self, workers: int, target: Callable, intervals: list, fields: list, rows: int, max_signals: int = 10000, metrics_interval: float = 5.0):
+        self.workers = workers
+        self.target = target
+        self.rows = rows
+        self.context = multiprocessing.get_context('spawn')
+        self.memory = shared_memory.SharedMemory(create=True, size=MetricsTable.nbytes(intervals, fields, rows))
+        self.table = MetricsTable(intervals, fields, rows, buffer=self.memory.buf)
+        self.table.values.fill(np.nan)
+        self.signals = self.context.Queue(maxsize=max_signals)
+        self.samples = self.context.Queue(maxsize=workers * 2)
+        self.metrics_interval = metrics_interval
+        self.stopping = self.context.Event()
+        self.__drained = threading.Event()
+        self.processes = []
+        self.thread = None
+        self.collector = None
+
+    def start(self, symbols: list, market: MarketType, on_signal: Callable, *args):
+        if len(symbols) > self.rows:
+            raise ValueError(f"Cannot track {len(symbols)} symbols in a {self.rows} rows metrics table")
+        for index, partition in enumerate(partition_symbols(symbols, self.workers)):
+            process = self.context.Process(
+                target=_work,
+                args=(self.target, self.samples, self.metrics_interval, index, partition, list(symbols), market, self.memory.name, self.rows, self.signals, self.stopping, *args),
+                name=f"tei-worker-{index}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        self.thread = threading.Thread(target=self.__drain, args=(on_signal,), daemon=True)
+        self.thread.start()
+        self.collector = threading.Thread(target=self.__collect, daemon=True)
+        self.collector.start()
+        print(f"Started {len(self.processes)} worker processes for {len(symbols)} symbols")
+
+    def alive(self) -> list:
+        return [process.is_alive() for process in self.processes]
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Asks the workers to exit and waits up to `timeout` seconds for them. Only
+        workers that hang are terminated, since a terminated worker can leave the
+        signal queue or its table rows half written.
+        """
+        self.stopping.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in self.processes:
+            if process.is_alive():
+                print(f"Terminating {process.name}, it did not exit within {timeout}s")
+                process.terminate()
+                process.join()
+        self.processes = []
+        if self.thread is not None:
+            # Workers are gone, the drain ends once their last signals are delivered
+            self.__drained.set()
+            self.thread.join()
+            self.thread = None
+        if self.collector is not None:
+            self.collector.join()
+            self.collector = None
+        # The table view must go before the block can be closed
+        self.table.values = None
+        self.memory.close()
+        self.memory.unlink()
+
+    def __drain(self, on_signal: Callable):
+        while True:
+            try:
+                item = self.signals.get(timeout=0.5)
+            except queue.Empty:
+                if self.__drained.is_set():
+                    break
+                continue
+            try:
+                on_signal(item)
+            except Exception:
+                traceback.print_exc()
+
+    def __collect(self):
+        while True:
+            try:
+                index, sample = self.samples.get(timeout=0.5)
+            except queue.Empty:
+                if self.__drained.is_set():
+                    break
+                continue
+            registry.include('worker', str(index), sample)
@@ -0,0 +1,82 @@
+import argparse
+import csv
+import json
+import time
+
+from app.api import fetch_tickers_24h
+from app.backtest import load_history, run_backtest
+from app.enums import MarketType
+from app.model import CandleStore
+from app.universe import SymbolUniverse
+from app.utils import run_until_complete
+
+from scripts.config import CONFIG, BASE_INTERVAL, INTERVALS
+
+MARKET = MarketType.FUTURES
+
+async def top_symbols(count: int) -> list:
+    universe = SymbolUniverse(count)
+    universe.update(await fetch_tickers_24h(MARKET))
+    return universe.ranking()
+
+def write_signals(path: str, report):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['symbol', 'rule', 'side', 'open_time', 'close'] + [f"return_{horizon}" for horizon in report.horizons])
+        for symbol, rule, side, open_time, close, returns in report.signals():
+            writer.writerow([symbol, rule, side, open_time, close] + returns)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest of the signal rules over stored or downloaded base candles")
+    parser.add_argument('--symbols', type=int, default=400, help='Top symbols by 24h quote volume (ignored with --offline, which uses every cached symbol)')
+    parser.add_argument('--symbol', action='append', help='Explicit symbol (repeatable), instead of the top --symbols')
+    parser.add_argument('--days', type=float, default=90, help='History length')
+    parser.add_argument('--store', metavar='DIR', default='data/backtest', help='Candle cache directory')
+    parser.add_argument('--offline', action='store_true', help='Use the cached candles only')
+    parser.add_argument('--rules', metavar='FILE', help='JSON list of signal rules ({"name", "side", "when"}) replacing the default ones')
+    parser.add_argument('--horizons', default='5,15,60', help='Forward return horizons in base candles')
+    parser.add_argument('--processes', type=int, help='Worker processes (CPU count by default)')
+    parser.add_argument('--download-workers', type=int, default=8, help='Concurrent history downloads')
+    parser.add_argument('--output', metavar='FILE', help='Write every signal with its forward returns to a CSV FILE')
+    args = parser.parse_args()
+
+    rules = CONFIG['rules']
+    if args.rules:
+        with open(args.rules) as file:
+            rules = json.load(file)
+    horizons = tuple(int(horizon) for horizon in args.horizons.split(','))
+    store = CandleStore(args.store)
+    start = int((time.time() - args.days * 86400) * 1000)
+
+    if args.symbol:
+        symbols = args.symbol
+    elif args.offline:
+        # No ticker request offline, the cache directory is the universe
+        symbols = store.symbols(MARKET, BASE_INTERVAL)
+        if not symbols:
+            parser.error(f"No cached {BASE_INTERVAL.value} candles in {args.store}")
+    else:
+        symbols = run_until_complete(lambda: top_symbols(args.symbols))
+    if not args.offline:
+        started = time.perf_counter()
+        loaded = run_until_complete(lambda: load_history(store, MARKET, symbols, BASE_INTERVAL, start, args.download_workers))
+        print(f"History of {len(symbols)} symbols up to date in {time.perf_counter() - started:.1f}s, {sum(count for count in loaded.values() if count > 0)} candles fetched")
+
+    report = run_backtest(
+        store,
+        MARKET,
+        symbols,
+        start,
+        CONFIG['indicators'],
+        rules,
+        INTERVALS,
+        BASE_INTERVAL,
+        horizons,
+        args.processes
+    )
+    print(report)
+    if args.output:
+        write_signals(args.output, report)
+
+if __name__ == "__main__":
+    main()
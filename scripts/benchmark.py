@@ -0,0 +1,179 @@
+import argparse
+import contextlib
+import os
+import random
+import resource
+import sys
+import time
+import numpy as np
+
+from app.enums import MarketType, TimeFrame, EventType
+from app.api import process_ws_message
+from app.api.binance_ws_decoder import decode_message
+from app.client import MessageDispatcher
+from app.replay import FrameRecorder, read_frames
+from app.utils import seconds
+
+import scripts.main as pipeline
+
+MARKET = MarketType.FUTURES
+
+def synthetic_frames(symbols: int, minutes: int, ticks_per_minute: int, intervals: list) -> list:
+    """Builds kline frames for a random walk of `symbols` symbols, shaped like Binance combined stream frames."""
+    frames = []
+    prices = [random.uniform(1, 1000) for _ in range(symbols)]
+    started = (int(time.time()) // 3600) * 3600 * 1000
+    for minute in range(minutes):
+        for tick in range(ticks_per_minute):
+            now = started + minute * 60000 + tick * (60000 // ticks_per_minute)
+            for index in range(symbols):
+                prices[index] *= 1 + random.gauss(0, 0.001)
+                price = prices[index]
+                for interval in intervals:
+                    millis = seconds(interval) * 1000
+                    open_time = now - now % millis
+                    closed = tick == ticks_per_minute - 1 and (minute + 1) % (millis // 60000) == 0
+                    symbol = f"SYM{index}USDT"
+                    frames.append(
+                        f'{{"stream":"{symbol.lower()}@kline_{interval.value}","data":{{"e":"kline","E":{now},'
+                        f'"s":"{symbol}","k":{{"t":{open_time},"T":{open_time + millis - 1},"s":"{symbol}",'
+                        f'"i":"{interval.value}","f":1,"L":2,"o":"{price:.6f}","c":"{price:.6f}",'
+                        f'"h":"{price * 1.001:.6f}","l":"{price * 0.999:.6f}","v":"100.0","n":10,'
+                        f'"x":{"true" if closed else "false"},"q":"1000.0","V":"50.0","Q":"500.0","B":"0"}}}}}}'
+                    )
+    return frames
+
+def prefill(frames: list):
+    """Seeds a full ring of history before the first frame of every stream, so indicators are warm."""
+    seen = set()
+    for frame in frames:
+        data = decode_message(frame)['data']
+        k = data['k']
+        key = (k['s'], k['i'])
+        if key in seen:
+            continue
+        seen.add(key)
+        interval = TimeFrame(k['i'])
+        millis = seconds(interval) * 1000
+        price = float(k['o'])
+        for index in range(pipeline.model['ohlc'].block(MARKET, interval).capacity, 0, -1):
+            price *= 1 + random.gauss(0, 0.002)
+            pipeline.model['ohlc'].upsert(MARKET, k['s'], interval, k['t'] - index * millis, price, price, price, price, 1.0)
+        pipeline.model['resampler'].rebuild(MARKET, k['s'])
+    pipeline.model['symbols'] = sorted({symbol for symbol, _ in seen})
+
+def percentiles(samples: np.ndarray) -> str:
+    if len(samples) == 0:
+        return "n/a"
+    p50, p90, p99, p999 = np.percentile(samples, [50, 90, 99, 99.9]) / 1000
+    return f"p50={p50:8.2f}us p90={p90:8.2f}us p99={p99:8.2f}us p99.9={p999:8.2f}us max={samples.max() / 1000:9.2f}us"
+
+def run_stages(frames: list) -> dict:
+    """Runs every frame through the handler stages one by one, timing each stage separately."""
+    count = len(frames)
+    timings = {stage: np.zeros(count, dtype=np.int64) for stage in ('decode', 'parse_store', 'resample', 'cleanup', 'indicator')}
+    closed = np.zeros(count, dtype=bool)
+    clock = time.perf_counter_ns
+    for index, frame in enumerate(frames):
+        started = clock()
+        message = decode_message(frame)
+        decoded = clock()
+        update_event = process_ws_message(MARKET, message, pipeline.model)
+        stored = clock()
+        update_events = pipeline.model['resampler'].update(update_event) + [update_event]
+        resampled = clock()
+        for event in update_events:
+            if event.event_type == EventType.CANDLE_CLOSED:
+                pipeline.execute_candle_history_cleanup(
+                    event.event_type,
+                    event.market_type,
+                    event.symbol,
+                    event.interval
+                )
+                closed[index] = True
+        cleaned = clock()
+        if not pipeline.model['config']['batch_mode']:
+            for event in update_events:
+                pipeline.calculate_metrics(
+                    event.market_type,
+                    event.symbol,
+                    event.interval,
+                    event.event_type
+                )
+        finished = clock()
+        timings['decode'][index] = decoded - started
+        timings['parse_store'][index] = stored - decoded
+        timings['resample'][index] = resampled - stored
+        timings['cleanup'][index] = cleaned - resampled
+        timings['indicator'][index] = finished - cleaned
+    timings['cleanup'] = timings['cleanup'][closed]
+    return timings
+
+def run_pipeline(frames: list, workers: int) -> float:
+    """Pushes all frames through the dispatcher and the real message handler, returns msgs/s."""
+    handler = getattr(pipeline, '__ws_message_received')
+    dispatcher = MessageDispatcher(lambda message: handler(message, MARKET), workers=workers)
+    dispatcher.start()
+    started = time.perf_counter()
+    for frame in frames:
+        dispatcher.submit(frame)
+    dispatcher.stop()
+    return len(frames) / (time.perf_counter() - started)
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot path throughput benchmark over recorded or synthetic websocket frames")
+    parser.add_argument('--frames', metavar='FILE', help='Frames recorded with --record (synthetic frames are used otherwise)')
+    parser.add_argument('--symbols', type=int, default=400, help='Synthetic symbols')
+    parser.add_argument('--minutes', type=int, default=10, help='Synthetic minutes of traffic')
+    parser.add_argument('--ticks', type=int, default=4, help='Synthetic ticks per symbol and minute')
+    parser.add_argument('--workers', type=int, default=4, help='Dispatcher workers for the pipeline run')
+    parser.add_argument('--batch', action='store_true', help='Skip per-message indicators and time the batch scan instead')
+    parser.add_argument('--save', metavar='FILE', help='Write the synthetic frames to FILE in recorder format')
+    args = parser.parse_args()
+
+    options = {'sound_enabled': False, 'batch_mode': args.batch}
+    pipeline.model = pipeline.create_model(options)
+
+    if args.frames:
+        frames = [frame for _, frame in read_frames(args.frames)]
+    else:
+        frames = synthetic_frames(args.symbols, args.minutes, args.ticks, [pipeline.model['base_interval']])
+        if args.save:
+            recorder = FrameRecorder(args.save)
+            for frame in frames:
+                recorder.record(frame)
+            recorder.close()
+    print(f"Loaded {len(frames)} frames, peak RSS {peak_rss_mb():.1f} MB")
+    prefill(frames)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        timings = run_stages(frames)
+        elapsed = time.perf_counter() - started
+        scans = np.zeros(0, dtype=np.int64)
+        if args.batch:
+            scans = np.zeros(100, dtype=np.int64)
+            for index in range(len(scans)):
+                scan_started = time.perf_counter_ns()
+                pipeline.scan_signals(MARKET)
+                scans[index] = time.perf_counter_ns() - scan_started
+        # The stage run already ingested the frames, replaying them into the same rings would
+        # only take the out-of-order history path, so the pipeline run starts from fresh state
+        pipeline.model = pipeline.create_model(options)
+        prefill(frames)
+        throughput = run_pipeline(frames, args.workers)
+
+    print(f"Sequential handler: {len(frames) / elapsed:,.0f} msgs/s")
+    print(f"Dispatcher pipeline ({args.workers} workers): {throughput:,.0f} msgs/s")
+    for stage, samples in timings.items():
+        print(f"  {stage:<12} {percentiles(samples)}")
+    if args.batch:
+        print(f"  {'batch_scan':<12} {percentiles(scans)}")
+    print(f"Peak RSS: {peak_rss_mb():.1f} MB")
+
+if __name__ == "__main__":
+    main()
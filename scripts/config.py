@@ -0,0 +1,69 @@
+from app.enums import TimeFrame, BackpressurePolicy
+
+# Define percent threshold
+THRESHOLD = 0.002  # 0.2%
+
+# Only the base interval is streamed and backfilled, the others are resampled from it
+BASE_INTERVAL = TimeFrame.MIN_1
+INTERVALS = [
+    TimeFrame.MIN_1, 
+    TimeFrame.MIN_5
+]
+
+CONFIG = {
+    "max_candles": 50,
+    # Symbols followed, ranked by 24h quote volume; a challenger needs 10% more volume than the weakest member
+    "universe_size": 400,
+    "universe_hysteresis": 0.1,
+    "indicators": {
+        "bb": {"window": 20, "std_dev_factor": 2},
+        "ema": {"period": 20},
+        "rsi": {"period": 14},
+        "atr": {"period": 14},
+        "vwap": {"window": 20},
+        "volume_z": {"window": 20}
+    },
+    # Metrics without [interval] refer to the base interval, widths are in percent
+    "rules": [
+        {
+            "name": "bb_upper_1m_5m",
+            "side": "SELL",
+            "when": "bb.width[1m] > 0.02% and bb.lower[1m] > 0 and bb.lower[5m] > 0 and close > 0 "
+                    "and close >= bb.upper[1m] and close >= bb.upper[5m]"
+        },
+        {
+            "name": "bb_lower_1m_5m",
+            "side": "BUY",
+            "when": "bb.width[1m] > 0.02% and bb.lower[1m] > 0 and bb.lower[5m] > 0 and close > 0 "
+                    "and close <= bb.lower[1m] and close <= bb.lower[5m]"
+        }
+    ],
+    "batch_mode": False,
+    "scan_interval": 0.25,
+    # Rankings served by the REST API, sorted once per snapshot
+    "ranked_metrics": ["bb.width", "bb.upper_distance", "bb.lower_distance"],
+    # Band width change (percentage points) since the last pushed value that is pushed as METRIC_UPDATE
+    "width_change_threshold": 0.05,
+    "event_stream_capacity": 4096,
+    "backfill_workers": 16,
+    "backfill_retries": 3,
+    "streams_per_connection": 200,
+    "dispatch_workers": 4,
+    "dispatch_queue_size": 10000,
+    "dispatch_backpressure": BackpressurePolicy.BLOCK,
+    "ws_base_uri": "wss://fstream.binance.com/stream",
+    "sound_enabled": True,
+    "sound_path": "app/assets/wav/ringbell_001.wav",
+    "notification_rate": 10,
+    "notification_queue_size": 1000,
+    "notification_history": 1000,
+    "webhook_url": None,
+    # Ticker endpoints of the cross-exchange spread scanner (stand-in servers can be set with --venue)
+    "spread_venues": {
+        "binance": "https://fapi.binance.com/fapi/v1",
+        "bybit": "https://api.bybit.com",
+        "okx": "https://www.okx.com"
+    },
+    "spread_threshold": THRESHOLD,
+    "spread_interval": 5
+}
@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = ['app', 'app.model', 'app.api', 'scripts.main', 'scripts.backtest']
+
+def import_times(module: str) -> dict:
+    """Runs `python -X importtime -c 'import <module>'` in a fresh interpreter, returns {module: cumulative us}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')]))}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Cannot import {module}: {result.stderr.strip().splitlines()[-1]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == 'site':
+            # Interpreter start-up ends with site, only what follows is imported by the module
+            times = {}
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the application entry points (python -X importtime)")
+    parser.add_argument('modules', nargs='*', default=MODULES, help='Modules to import')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module, the median is reported')
+    parser.add_argument('--top', type=int, default=10, help='Heaviest imports listed per module')
+    parser.add_argument('--save', metavar='FILE', help='Write the medians to a JSON FILE')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare against medians saved with --save')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    medians = {}
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.runs)]
+        total = statistics.median(run.get(module, 0) for run in runs)
+        medians[module] = total
+        change = ''
+        if module in baseline and baseline[module] > 0:
+            change = f" ({(total - baseline[module]) / baseline[module] * 100:+.0f}% vs baseline {baseline[module] / 1000:.1f}ms)"
+        print(f"{module}: {total / 1000:.1f}ms{change}")
+        heaviest = sorted(
+            ((statistics.median(run.get(name, 0) for run in runs), name) for name in runs[0] if name != module),
+            reverse=True
+        )
+        for cumulative, name in heaviest[:args.top]:
+            print(f"  {cumulative / 1000:8.1f}ms  {name}")
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(medians, file, indent=2)
+
+if __name__ == "__main__":
+    main()
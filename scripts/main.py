@@ -1,251 +1,586 @@
-import asyncio
 import argparse
-import websockets
-import pandas as pd
+import copy
+import os
+# Eager on purpose: every mode needs NumPy, only --help pays its ~80ms import without using it
 import numpy as np
 import json
-import ccxt
 import time
 import threading
+import queue
 import traceback
-import sys
-import os
 
-from playsound import playsound
-from datetime import datetime
-from flask import Flask, jsonify, request
-from concurrent.futures import ThreadPoolExecutor
-from collections import defaultdict
-
-from app.model import UpdateEvent
-from app.client.websocket_client import WebSocketClient
-from app.enums import MarketType, TimeFrame, MessageType, EventType
+from app.model import UpdateEvent, CandleBlock, CandleBuffer, CandleStore, CandleResampler, MetricsTable, Signal, Snapshot, SnapshotStore
+from app.indicators import IndicatorEngine, IncrementalBollinger, create_indicator
+from app.client import StreamManager, MessageDispatcher
+from app.replay import FrameRecorder, replay_frames
+from app.metrics import PIPELINE_STAGE_SECONDS, SIGNALS, BATCH_SCAN_SECONDS, SNAPSHOT_PUBLISH_SECONDS, SNAPSHOT_VERSION
+from app.web import EventBroadcaster
+from app.signals import SignalRule, RuleEngine
+from app.spread import SpreadScanner, create_venue
+from app.universe import SymbolUniverse
+from app.workers import WorkerPool, attach_metrics_table
+from app.notifications import NotificationDispatcher, ConsoleSink, SoundSink, WebhookSink, MemorySink
+from app.enums import MarketType, TimeFrame, EventType
 from app.utils import nested_dict, \
     run_until_complete, \
-    handle_task_result, \
-    seconds, previous_moment
+    seconds, previous_moment, unix_millis, loads
         
 from app.api import fetch_tickers_24h, \
-    fetch_candles, \
-    process_http_message, \
+    backfill_candles, \
     process_ws_message, \
-    STREAM_KLINE
-    
+    STREAM_KLINE, \
+    STREAM_MINI_TICKER_ARR
+
+from scripts.config import CONFIG, BASE_INTERVAL, INTERVALS
+
+PARSE_STORE_SECONDS = PIPELINE_STAGE_SECONDS.labels('parse_store')
+STORE_INDICATOR_SECONDS = PIPELINE_STAGE_SECONDS.labels('store_indicator')
+INDICATOR_SIGNAL_SECONDS = PIPELINE_STAGE_SECONDS.labels('indicator_signal')
+
+# Built by main() and run_worker() with create_model(), importing this module builds nothing
+model: dict = None
+
+def __base_capacity(config: dict, intervals: list, base_interval: TimeFrame) -> int:
+    """Base candles needed to derive `max_candles` candles of the longest interval (plus one partial bucket)."""
+    ratio = max(seconds(interval) for interval in intervals) // seconds(base_interval)
+    return config['max_candles'] * ratio + ratio
+
+def create_model(config: dict = None) -> dict:
+    """Pipeline state over a copy of the default CONFIG, with `config` overriding its top level keys."""
+    config = {**copy.deepcopy(CONFIG), **(config or {})}
+    ohlc = CandleBuffer(
+        config['max_candles'],
+        capacities={BASE_INTERVAL: __base_capacity(config, INTERVALS, BASE_INTERVAL)}
+    )
+    return {
+        "config": config,
+        "symbols": [],
+        # Universe members whose history is still loading, they are subscribed once it is in place
+        "backfilling": set(),
+        "base_interval": BASE_INTERVAL,
+        "intervals": list(INTERVALS),
+        "ohlc": ohlc,
+        "resampler": CandleResampler(ohlc, INTERVALS, BASE_INTERVAL),
+        "indicators": IndicatorEngine([
+            create_indicator(name, **params) 
+            for name, params in config['indicators'].items()
+        ]),
+        "universe": SymbolUniverse(config['universe_size'], config['universe_hysteresis']),
+        "metrics": {},
+        # Incremental Bollinger Bands refreshed on every tick, per market, symbol row and interval
+        "bands": {},
+        "rules": {},
+        "snapshots": SnapshotStore(),
+        # Last band widths pushed to the event stream, per market and interval
+        "pushed_widths": {},
+        "signals": MemorySink(config['notification_history']),
+        "notifier": NotificationDispatcher(
+            [ConsoleSink()],
+            max_pending=config['notification_queue_size'],
+            rate=config['notification_rate']
+        ),
+        "events": EventBroadcaster(config['event_stream_capacity']),
+        "store": None,
+        "recorder": None,
+        # Worker processes: the symbol rows this process evaluates (all when None) and the queue signals go to
+        "rows": None,
+        "signal_queue": None,
+        "workers": None,
+        "last_prices": nested_dict(),
+    }
+
+def create_app():
+    """REST API application; Flask is only imported when the API is actually served."""
+    from flask import Flask
+    from app.web import metrics_api, create_query_api, create_event_stream_api
     
-# Initialize exchanges
-bybit = ccxt.bybit()
-okx = ccxt.okx()
-
-# Define percent threshold
-THRESHOLD = 0.002  # 0.4%
-
-app = Flask(__name__)
-
-model = {
-    "config": {
-        "max_candles": 50
-    },
-    "symbols": [],
-    "intervals": [
-        TimeFrame.MIN_1, 
-        TimeFrame.MIN_5
-    ],
-    "ohlc": nested_dict(),
-    "metrics": nested_dict(),
-    "last_prices": nested_dict(),
-    "notifications": nested_dict(),
-}
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(metrics_api)
+    # Under /api: /metrics already serves the Prometheus exposition
+    flask_app.register_blueprint(create_query_api(model['snapshots'], MarketType.FUTURES), url_prefix='/api')
+    flask_app.register_blueprint(create_event_stream_api(model['events']), url_prefix='/api')
+    return flask_app
+
+stream_manager: StreamManager = None
+
+UNIVERSE_FRAME = f'{{"stream":"{STREAM_MINI_TICKER_ARR}"'
 
 def __fetch_symbols(market_type: MarketType):
     global model 
-    tasks = [
-        fetch_tickers_24h(market_type) 
-    ]
-    loop = asyncio.get_event_loop()
-    results = loop.run_until_complete(asyncio.gather(*tasks)) 
-    usdt_pairs = [ticker for ticker in results[0] if ticker["symbol"].endswith("USDT")]
-    
-    #usdt_pairs = results[0]
+    tickers = run_until_complete(lambda: fetch_tickers_24h(market_type))
     
-    # Compute quote volume in float
-    for ticker in usdt_pairs: ticker["quoteVolume"] = float(ticker["quoteVolume"])
-    
-    # Sort by quoteVolume (24h traded volume in quote asset, e.g. USDC)
-    sorted_by_volume = sorted(usdt_pairs, key=lambda x: x["quoteVolume"], reverse=True)[:400]
-
-    model['symbols'] = [
-        ticker['symbol'] for ticker in sorted_by_volume
-    ]
-    
-    model['symbols'] = model['symbols']
+    # Seeds the universe, the ticker stream keeps it ranked from here on
+    model['universe'].update(tickers)
+    model['symbols'] = model['universe'].ranking()
+    model['ohlc'].register(market_type, model['symbols'])
     
     print(model['symbols']) 
 
-async def __fetch_candles(market: MarketType):
+async def __fetch_candles(market: MarketType, symbols: list = None):
     global model
-    max_candles = model['config']['max_candles']
+    base_interval = model['base_interval']
     
-    symbols = model['symbols']
-    errored_symbols = set()
+    symbols = model['symbols'] if symbols is None else symbols
+    
+    since = None
+    if model['store'] is not None:
+        since = model['store'].warm_start(model['ohlc'], market, symbols, [base_interval])
+        for symbol, _ in since:
+            model['resampler'].rebuild(market, symbol)
+        print(f"Warm start: {len(since)} symbol/interval pairs loaded from {model['store'].directory}")
     
     print(f"Loading historical candle data for {len(symbols)} symbols")
     
-    i = 0
-    for symbol in symbols:
-        for interval in model['intervals']:
-            try:
-                data = await fetch_candles(
-                    market, 
-                    symbol, 
-                    interval, 
-                    limit=max_candles
-                )
-                update_event = process_http_message(
-                    MessageType.CANDLE_HISTORY, 
-                    market, 
-                    symbol, 
-                    interval, 
-                    data, 
-                    model
-                )
-                cleanup_event = execute_candle_history_cleanup(
-                    update_event.event_type,
-                    update_event.market_type,
-                    update_event.symbol,
-                    update_event.interval,
-                )
-            
-            except Exception as e:
-                errored_symbols.add(symbol)
-
-            await asyncio.sleep(0.01)
-            
-        percentage = ((i + 1) / len(symbols)) * 100
-            
-        #print(f"({i + 1}/{len(symbols)}, {percentage:.2f}%) {symbol}: Historical OHLC data loaded w/ {'ERROR' if symbol in errored_symbols else 'SUCCESS'}")  
-        i += 1
-            
+    report = await backfill_candles(
+        market,
+        symbols,
+        [base_interval],
+        model,
+        limit=model['ohlc'].block(market, base_interval).capacity,
+        workers=model['config']['backfill_workers'],
+        retries=model['config']['backfill_retries'],
+        on_loaded=__candle_history_loaded,
+        since=since
+    )
+    
+    errored_symbols = {symbol for symbol, _ in report.failed}
     print(f"OHLC buffer loading complete: ({len(symbols) - len(errored_symbols)} OK, {len(errored_symbols)} NOK, {len(symbols)} TOTAL)")
+    print(report)
+
+def __candle_history_loaded(update_event: UpdateEvent):
+    market, symbol, interval = update_event.market_type, update_event.symbol, update_event.interval
+    model['resampler'].rebuild(market, symbol)
+    __drop_bands(market, model['ohlc'].symbol_index(market, symbol))
+    if model['store'] is not None:
+        candles = model['ohlc'].window(market, symbol, interval)
+        closed = candles['open_time'] < unix_millis(previous_moment(interval))
+        model['store'].append(market, symbol, interval, candles[closed])
+    execute_candle_history_cleanup(
+        update_event.event_type,
+        update_event.market_type,
+        update_event.symbol,
+        update_event.interval,
+    )
  
-def __ws_connection_reset(market_type: MarketType):
-    global model
-    streams = [
-        STREAM_KLINE(symbol, timeframe)
-        for symbol in model['symbols'] 
-        for timeframe in model['intervals']
+def __ws_connection_reset(market_type: MarketType, symbols: list = None):
+    global model, stream_manager
+    # Workers stream their own partition only. Worker mode keeps the universe fixed at
+    # startup: the coordinator opens no stream and nothing re-partitions the symbols
+    streams = [STREAM_MINI_TICKER_ARR] if symbols is None else []
+    streams += [
+        STREAM_KLINE(symbol, model['base_interval'])
+        for symbol in (model['symbols'] if symbols is None else symbols)
+        if symbol not in model['backfilling']
     ]
-    uri = f"wss://fstream.binance.com/stream?streams={'/'.join(streams)}"
-    print(f"Connecting to {(uri[:47] + '...') if len(uri) > 50 else uri} to listen {len(streams)} websocket streams")
-    client = WebSocketClient(uri, lambda message: __ws_message_received(message, market_type))
-    client.restart()
+    if stream_manager is None:
+        stream_manager = StreamManager(
+            model['config']['ws_base_uri'],
+            lambda message: __ws_message_received(message, market_type),
+            streams_per_connection=model['config']['streams_per_connection'],
+            max_workers=model['config']['dispatch_workers'],
+            max_queue=model['config']['dispatch_queue_size'],
+            backpressure=model['config']['dispatch_backpressure'],
+            recorder=model['recorder']
+        )
+        stream_manager.start(streams)
+    else:
+        stream_manager.update_streams(streams)
         
+def __ws_replay(market_type: MarketType, path: str, speed: float):
+    dispatcher = MessageDispatcher(
+        lambda message: __ws_message_received(message, market_type),
+        workers=model['config']['dispatch_workers'],
+        max_queue=model['config']['dispatch_queue_size'],
+        backpressure=model['config']['dispatch_backpressure']
+    )
+    dispatcher.start()
+    __start_scanner(market_type)
+    
+    print(f"Replaying websocket frames from {path} at {'max speed' if speed <= 0 else f'{speed}x speed'}")
+    started = time.perf_counter()
+    count = replay_frames(path, dispatcher.submit, speed)
+    dispatcher.stop()
+    elapsed = time.perf_counter() - started
+    print(f"Replayed {count} frames in {elapsed:.2f}s ({count / elapsed if elapsed > 0 else 0:.0f} msgs/s), {dispatcher.stats()}")
+
 def __ws_message_received(message, market_type: MarketType):
-    data = json.loads(message)
+    if message.startswith(UNIVERSE_FRAME):
+        __universe_update(message, market_type)
+        return
+    started = time.perf_counter()
     update_event = process_ws_message(
         market_type, 
-        data, 
+        message, 
         model
     )
-    cleanup_event = execute_candle_history_cleanup(
-        update_event.event_type,
-        update_event.market_type,
-        update_event.symbol,
-        update_event.interval
-    )
-    calculate_bb_metrics(
-        update_event.market_type,
-        update_event.symbol,
-        update_event.interval
-    )
+    # Derived intervals come first, the base interval rule reads their metrics
+    update_events = model['resampler'].update(update_event) + [update_event]
+    stored = time.perf_counter()
+    PARSE_STORE_SECONDS.observe(stored - started)
+    if update_event.event_type == EventType.CANDLE_CLOSED and model['store'] is not None:
+        model['store'].append(
+            update_event.market_type,
+            update_event.symbol,
+            update_event.interval,
+            model['ohlc'].latest(update_event.market_type, update_event.symbol, update_event.interval)
+        )
+    for event in update_events:
+        if event.event_type == EventType.CANDLE_CLOSED:
+            cleanup_event = execute_candle_history_cleanup(
+                event.event_type,
+                event.market_type,
+                event.symbol,
+                event.interval
+            )
+            if model['events'].subscribers:
+                __push_candle_closed(event)
+    if not model['config']['batch_mode']:
+        for event in update_events:
+            calculate_metrics(
+                event.market_type,
+                event.symbol,
+                event.interval,
+                event.event_type
+            )
+        STORE_INDICATOR_SECONDS.observe(time.perf_counter() - stored)
+
+def __universe_update(message, market_type: MarketType):
+    added, removed = model['universe'].update(loads(message)['data'])
+    model['symbols'] = model['universe'].ranking()
+    if added or removed:
+        __universe_changed(market_type, added, removed)
+
+def __universe_changed(market: MarketType, added: list, removed: list):
+    """
+    Moves streams, candle rings and metrics over to the new members of the universe.
+    Added symbols are only subscribed once their history is loaded, so ingest and
+    backfill never write the same rows at the same time.
+    """
+    print(f"Universe changed: +{added} -{removed}")
+    model['ohlc'].register(market, added)
+    model['backfilling'].update(added)
+    if stream_manager is not None:
+        __ws_connection_reset(market)
+    if removed:
+        rows = np.array([model['ohlc'].symbol_index(market, symbol) for symbol in removed])
+        for symbol, row in zip(removed, rows.tolist()):
+            model['ohlc'].clear(market, symbol)
+            __drop_bands(market, row)
+        for interval in model['intervals']:
+            __metrics_table(market).clear(rows, interval)
+    if added:
+        threading.Thread(target=__universe_backfill, args=(market, added), daemon=True).start()
+
+def __universe_backfill(market: MarketType, symbols: list):
+    try:
+        run_until_complete(lambda: __fetch_candles(market, symbols))
+    finally:
+        model['backfilling'].difference_update(symbols)
+        if stream_manager is not None:
+            __ws_connection_reset(market)
+
+def __push_candle_closed(update_event: UpdateEvent):
+    candle = model['ohlc'].latest(update_event.market_type, update_event.symbol, update_event.interval)
+    if candle is None:
+        return
+    open_time, open, high, low, close, volume = candle.tolist()
+    model['events'].publish(EventType.CANDLE_CLOSED, {
+        'symbol': update_event.symbol,
+        'interval': update_event.interval.value,
+        'candle': [int(open_time), open, high, low, close, volume],
+    }, update_event.symbol, update_event.interval)
+
+def __metrics_table(market: MarketType) -> MetricsTable:
+    table = model['metrics'].get(market)
+    if table is None:
+        table = model['metrics'].setdefault(market, MetricsTable(
+            model['intervals'], 
+            model['indicators'].fields, 
+            max(64, len(model['ohlc'].symbols(market)))
+        ))
+    return table
+
+def __rule_engine(market: MarketType) -> RuleEngine:
+    engine = model['rules'].get(market)
+    if engine is None:
+        engine = model['rules'].setdefault(market, RuleEngine(
+            [SignalRule.from_config(rule) for rule in model['config']['rules']],
+            __metrics_table(market),
+            model['base_interval']
+        ))
+    return engine
+
+def __drop_bands(market: MarketType, row: int):
+    """Forgets the tick state of a symbol whose candles were replaced (backfill, universe change)."""
+    for interval in model['intervals']:
+        model['bands'].pop((market, row, interval), None)
+
+def __update_bands(
+    market: MarketType,
+    row: int,
+    interval: TimeFrame,
+    block: CandleBlock) -> IncrementalBollinger:
+    key = (market, row, interval)
+    bands = model['bands'].get(key)
+    if bands is None:
+        bands = model['bands'][key] = IncrementalBollinger(**model['config']['indicators']['bb'])
+    
+    head = block.head[row]
+    open_time, _, _, _, close, _ = block.candles[row, head].tolist()
+    
+    if open_time == bands.open_time:
+        # In-progress candle: O(1) replacement of the last close
+        bands.replace(close)
+    elif bands.open_time is not None and open_time - bands.open_time == seconds(interval) * 1000:
+        # New candle: settle the final close of the previous one, then shift the window
+        bands.replace(float(block.candles['close'][row, (head - 1) % block.capacity]))
+        bands.push(open_time, close)
+    else:
+        bands.reset(open_time, block.window(row, bands.window)['close'])
+    return bands
 
-def calculate_bb_metrics(
+def calculate_metrics(
     market: MarketType,
     symbol: str,
-    interval: TimeFrame):
+    interval: TimeFrame,
+    event_type: EventType = EventType.CANDLE_CLOSED):
+    """
+    Refreshes the metrics of one symbol/interval. A tick only updates the close and the
+    Bollinger Bands in O(1), a closed candle evaluates all indicators. Signal rules run on
+    every base interval event, so a close crossing the bands is caught mid-candle; rules
+    on other indicators see their values as of the last closed candle.
+    """
     global model
     
     max_candles = model['config']['max_candles']
-    ohlc_data = model['ohlc'][market.value][symbol][interval.value]
     
-    if (len(ohlc_data) >= max_candles):
-        
-        close_prices = [ohlc_data[key]['close'] for key in ohlc_data]
+    row = model['ohlc'].symbol_index(market, symbol)
+    block = model['ohlc'].block(market, interval)
+    if block.size[row] < max_candles:
+        return
+    table = __metrics_table(market)
+    rows = np.array([row])
+    if event_type == EventType.CANDLE_CLOSED:
+        table.update(rows, interval, model['indicators'].evaluate(block, rows))
+    elif 'bb' not in model['config']['indicators']:
+        open_time, _, _, _, close, _ = block.candles[row, block.head[row]].tolist()
+        table.assign(row, interval, {'open_time': open_time, 'close': close})
+    else:
+        bands = __update_bands(market, row, interval, block)
+        upper, lower = bands.upper, bands.lower
+        table.assign(row, interval, {
+            'open_time': bands.open_time,
+            'close': bands.last,
+            'bb.upper': upper,
+            'bb.sma': bands.sma,
+            'bb.lower': lower,
+            'bb.std': bands.std,
+            'bb.width': abs(upper - lower) / upper * 100 if upper else float('nan'),
+        })
+    # Derived intervals are refreshed before the base interval event, the debounce keeps
+    # it to one signal per symbol and base candle
+    if interval == model['base_interval']:
+        check_signals(market, rows)
 
-        # Convert to pandas Series for easier calculations
-        close_series = pd.Series(close_prices)
+def check_signals(market: MarketType, rows: np.ndarray = None) -> list:
+    """Evaluates the signal rules for the given symbol rows (all symbols by default) and notifies matches."""
+    table = __metrics_table(market)
+    current_timestamp = int(previous_moment(model['base_interval']).timestamp())
+    matches = __rule_engine(market).evaluate(table, current_timestamp, rows)
+    if matches:
+        symbols = model['ohlc'].symbols(market)
+        for rule, matched in matches:
+            for row in matched:
+                __notify_signal(rule, symbols[row], row, table, current_timestamp)
+    return matches
 
-        # Step 2: Set the period and standard deviation factor for Bollinger Bands
-        window = 20  # Rolling window for moving average
-        std_dev_factor = 2  # Typically, Bollinger Bands use 2 standard deviations
+def evaluate_metrics(market: MarketType) -> MetricsTable:
+    """Evaluates all indicators for all symbols and intervals in one vectorized pass per interval."""
+    global model
+    
+    max_candles = model['config']['max_candles']
+    rows = model['rows'] if model['rows'] is not None else np.arange(len(model['ohlc'].symbols(market)))
+    table = __metrics_table(market)
+    for interval in model['intervals']:
+        block = model['ohlc'].block(market, interval)
+        ready = block.size[rows] >= max_candles
+        results = model['indicators'].evaluate(block, rows[ready])
+        table.update(rows[ready], interval, results)
+    return table
 
-        # Step 3: Calculate the Simple Moving Average (SMA)
-        sma = close_series.rolling(window=window).mean()
+def scan_signals(market: MarketType) -> list:
+    """Evaluates all indicators and signal rules for all symbols in one vectorized pass."""
+    if not model['ohlc'].symbols(market):
+        return []
+    evaluate_metrics(market)
+    return check_signals(market, model['rows'])
 
-        # Step 4: Calculate the rolling standard deviation
-        rolling_std = close_series.rolling(window=window).std()
+def publish_snapshot(market: MarketType) -> Snapshot:
+    """Captures the current candles, metrics and recent signals into a new immutable snapshot version."""
+    started = time.perf_counter()
+    snapshot = Snapshot.capture(
+        model['snapshots'].next_version(),
+        market,
+        model['ohlc'],
+        __metrics_table(market),
+        model['intervals'],
+        model['signals'].recent()
+    )
+    for interval in model['intervals']:
+        for key in model['config']['ranked_metrics']:
+            snapshot.rank(interval, key, key.endswith('width'))
+    model['snapshots'].publish(snapshot)
+    SNAPSHOT_PUBLISH_SECONDS.observe(time.perf_counter() - started)
+    SNAPSHOT_VERSION.set(snapshot.version)
+    if model['events'].subscribers:
+        push_width_changes(snapshot)
+    return snapshot
 
-        # Step 5: Calculate Bollinger Bands
-        upper_band = sma + (rolling_std * std_dev_factor)
-        lower_band = sma - (rolling_std * std_dev_factor)
+def push_width_changes(snapshot: Snapshot):
+    """Pushes METRIC_UPDATE for band widths that moved past the threshold since their last pushed value."""
+    threshold = model['config']['width_change_threshold']
+    pushed = model['pushed_widths'].setdefault(snapshot.market, {})
+    for interval in snapshot.intervals:
+        widths = snapshot.column(interval, 'bb.width')
+        last = pushed.get(interval)
+        if last is None or len(last) != len(widths):
+            last = pushed[interval] = np.full(len(widths), np.nan)
+        with np.errstate(invalid='ignore'):
+            changed = np.flatnonzero(~np.isnan(widths) & ~(np.abs(widths - last) < threshold))
+        for row in changed.tolist():
+            symbol = snapshot.symbols[row]
+            model['events'].publish(EventType.METRIC_UPDATE, {
+                'symbol': symbol,
+                'interval': interval.value,
+                'metric': 'bb.width',
+                'value': float(widths[row]),
+                'previous': None if np.isnan(last[row]) else float(last[row]),
+                'version': snapshot.version,
+            }, symbol, interval)
+        last[changed] = widths[changed]
 
-        # Combine into a DataFrame for clearer presentation
-        pd_bb = pd.DataFrame({
-            'Close': close_series,
-            'SMA': sma,
-            'Upper': upper_band,
-            'Lower': lower_band
-        })
-        
-        upper_band = pd_bb['Upper'].iloc[-1]
-        sma = pd_bb['SMA'].iloc[-1]
-        lower_band = pd_bb['Lower'].iloc[-1]
-        
-        model['metrics']['bb_last_candle'][market.value][symbol][interval.value]['upper_band'] = upper_band
-        model['metrics']['bb_last_candle'][market.value][symbol][interval.value]['sma'] = sma
-        model['metrics']['bb_last_candle'][market.value][symbol][interval.value]['lower_band'] = lower_band
-        
-        latest_timestamp = max(ohlc_data.keys())
-        latest_close = ohlc_data[latest_timestamp]['close']
-        current_timestamp = int(previous_moment(TimeFrame.MIN_1).timestamp())
-        
-        close_price = latest_close
-        upper_band_1m = model['metrics']['bb_last_candle'][market.value][symbol][TimeFrame.MIN_1.value]['upper_band']
-        upper_band_5m = model['metrics']['bb_last_candle'][market.value][symbol][TimeFrame.MIN_5.value]['upper_band']
-        lower_band_1m = model['metrics']['bb_last_candle'][market.value][symbol][TimeFrame.MIN_1.value]['lower_band']
-        lower_band_5m = model['metrics']['bb_last_candle'][market.value][symbol][TimeFrame.MIN_5.value]['lower_band']
-        
-        close_price = float(close_price)
-        upper_band_1m = float(0) if (isinstance(upper_band_1m, defaultdict) or upper_band_1m is None) else float(upper_band_1m)
-        upper_band_5m = float(0) if (isinstance(upper_band_5m, defaultdict) or upper_band_5m is None) else float(upper_band_5m)
-        lower_band_1m = float(0) if (isinstance(lower_band_1m, defaultdict) or lower_band_1m is None) else float(lower_band_1m)
-        lower_band_5m = float(0) if (isinstance(lower_band_5m, defaultdict) or lower_band_5m is None) else float(lower_band_5m)
+def __scan_loop(market: MarketType, scan: bool, publish: bool):
+    scan_interval = model['config']['scan_interval']
+    while True:
+        started = time.monotonic()
+        try:
+            if scan:
+                scan_signals(market)
+                BATCH_SCAN_SECONDS.observe(time.monotonic() - started)
+            if publish:
+                publish_snapshot(market)
+        except Exception:
+            traceback.print_exc()
+        time.sleep(max(0.0, scan_interval - (time.monotonic() - started)))
+
+def __start_scanner(market: MarketType, scan: bool = None, publish: bool = True):
+    scan = model['config']['batch_mode'] if scan is None else scan
+    if scan:
+        print(f"Starting batch signal scanner (every {model['config']['scan_interval']}s)")
+    if scan or publish:
+        threading.Thread(target=__scan_loop, args=(market, scan, publish), daemon=True).start()
+
+def __notify_signal(
+    rule: SignalRule,
+    symbol: str,
+    row: int,
+    table: MetricsTable,
+    current_timestamp: int):
+    global model
     
-        
-        dt_object = datetime.fromtimestamp(latest_timestamp / 1000)
-        formatted_date = dt_object.strftime('%Y-%m-%d %H:%M')
-        
-        wh_1m = percentage_difference(upper_band_1m, lower_band_1m)
-        wh_5m = percentage_difference(upper_band_5m, lower_band_5m)
-        
-        symbol_qv24h_index = model['symbols'].index(symbol) + 1
-        total_symbols = len(model['symbols'])
-        
-        formatted_symbol = symbol
-        
-        notified_timestamp = model['notifications'][symbol]
-        notified_timestamp = 0 if (isinstance(notified_timestamp, defaultdict) or notified_timestamp is None) else notified_timestamp
-        
-        if (interval == TimeFrame.MIN_1 and wh_1m > 0.02):
-            if (current_timestamp != notified_timestamp):
-                if (close_price > 0.0 and upper_band_1m > 0.0 and upper_band_5m > 0.0 and lower_band_1m > 0.0 and lower_band_5m > 0.0):
-                    if (close_price >= upper_band_1m and close_price >= upper_band_5m):
-                        play_sound_async('app/assets/wav/ringbell_001.wav')
-                        print(f"({symbol_qv24h_index}/{total_symbols}) {formatted_symbol} [{formatted_date}]: SELL | WH/2: {wh_1m/2.0:.2f}% (1m), {wh_5m/2.0:.2f}% (5m)")
-                        model['notifications'][symbol] = current_timestamp
-                    elif (close_price <= lower_band_1m and close_price <= lower_band_5m):
-                        play_sound_async('app/assets/wav/ringbell_001.wav')
-                        print(f"({symbol_qv24h_index}/{total_symbols}) {formatted_symbol} [{formatted_date}]: BUY | WH/2: {wh_1m/2.0:.2f}% (1m), {wh_5m/2.0:.2f}% (5m)")
-                        model['notifications'][symbol] = current_timestamp
+    started = time.perf_counter()
+    symbol_qv24h_index = model['symbols'].index(symbol) + 1 if symbol in model['symbols'] else 0
+    total_symbols = len(model['symbols'])
+    
+    width = lambda interval: table.get(row, interval, 'bb.width') if interval in table.interval_index else float('nan')
+    signal = Signal(
+        symbol, 
+        rule.side, 
+        int(table.get(row, model['base_interval'], 'open_time')), 
+        current_timestamp, 
+        width(TimeFrame.MIN_1), 
+        width(TimeFrame.MIN_5), 
+        symbol_qv24h_index, 
+        total_symbols,
+        rule.name
+    )
+    if model['signal_queue'] is not None:
+        try:
+            model['signal_queue'].put_nowait(signal)
+        except queue.Full:
+            print(f"Signal queue full, {symbol} {rule.side} dropped")
+    else:
+        deliver_signal(signal)
+    INDICATOR_SIGNAL_SECONDS.observe(time.perf_counter() - started)
+
+def deliver_signal(signal: Signal):
+    """Records a signal for the API and hands it to the notification sinks and the event stream subscribers."""
+    model['signals'].send(signal)
+    model['notifier'].notify(signal)
+    if model['events'].subscribers:
+        model['events'].publish(EventType.SIGNAL, {
+            key: None if isinstance(value, float) and np.isnan(value) else value
+            for key, value in signal.to_dict().items()
+        }, signal.symbol, model['base_interval'])
+    SIGNALS.labels(signal.rule, signal.side).inc()
+
+def run_worker(
+    index: int,
+    symbols: list,
+    universe: list,
+    market: MarketType,
+    memory_name: str,
+    rows: int,
+    signal_queue,
+    stopping,
+    config: dict,
+    store: str = None,
+    record: str = None):
+    """
+    Entry point of a worker process: streams, backfills and evaluates `symbols`
+    and writes their metrics into the shared table at their row in `universe`,
+    until the coordinator sets `stopping`. Closed candles go to the `store`
+    directory (every worker writes its own symbols' files) and frames to a
+    recording of its own next to `record`.
+    """
+    global model
+    model = create_model({**config, 'sound_enabled': False})
+    if store:
+        model['store'] = CandleStore(store)
+    if record:
+        root, extension = os.path.splitext(record)
+        model['recorder'] = FrameRecorder(f"{root}-worker{index}{extension}")
+    model['symbols'] = list(universe)
+    # Rows follow the universe order in every process, so they match the shared table
+    model['ohlc'].register(market, universe)
+    memory, model['metrics'][market] = attach_metrics_table(memory_name, model['intervals'], model['indicators'].fields, rows)
+    model['rows'] = np.array([model['ohlc'].symbol_index(market, symbol) for symbol in symbols], dtype=np.int64)
+    model['signal_queue'] = signal_queue
+    print(f"Worker {index} tracking {len(symbols)} symbols")
+    
+    run_until_complete(lambda: __fetch_candles(market, symbols))
+    __ws_connection_reset(market, symbols)
+    __start_scanner(market, publish=False)
+    stopping.wait()
+    # Stop streaming and raising signals, the queue is flushed when the process exits
+    stream_manager.stop()
+    model['signal_queue'] = None
+    if model['recorder'] is not None:
+        model['recorder'].close()
+    print(f"Worker {index} stopped")
+
+def __start_workers(market: MarketType, workers: int, store: str = None, record: str = None):
+    symbols = model['symbols']
+    pool = WorkerPool(
+        workers,
+        run_worker,
+        model['intervals'],
+        model['indicators'].fields,
+        max(64, len(symbols))
+    )
+    model['workers'] = pool
+    model['metrics'][market] = pool.table
+    pool.start(symbols, market, deliver_signal, model['config'], store, record)
                         
     
 def percentage_difference(price1, price2):
@@ -262,17 +597,7 @@ def execute_candle_history_cleanup(
     symbol: str,
     interval: TimeFrame,
 ) -> UpdateEvent:
-    global model
-    candles = model['ohlc'][market.value][symbol][interval.value]
-    max_candles = model['config']['max_candles']
-    if len(candles) > max_candles:
-        latest_candles = nested_dict()
-        latest_timestamps = sorted(candles.keys())[-max_candles:]
-        for ts in latest_timestamps:
-            latest_candles[ts] = candles[ts]
-        model['ohlc'][market.value][symbol][interval.value] = latest_candles
-        # print(f"{symbol} {interval.value}: Cleared")
-                
+    # Candle rings are bounded by 'max_candles', the oldest candle is overwritten on roll-over
     return UpdateEvent.create_update_event(
         EventType.CANDLE_CLEANUP, 
         market, 
@@ -280,78 +605,111 @@ def execute_candle_history_cleanup(
         interval
     )
     
-def play_sound_async(path):
-    threading.Thread(target=playsound, args=(path,), daemon=True).start()
-    
-    
-    
-
+def __start_notifications():
+    if model['config']['sound_enabled']:
+        model['notifier'].add_sink(SoundSink(model['config']['sound_path']))
+    if model['config']['webhook_url']:
+        model['notifier'].add_sink(WebhookSink(model['config']['webhook_url']))
+    model['notifier'].start()
     
-def fetch_perpetual_tickers(exchange, quote_currency):
-    tickers = exchange.fetch_tickers()
-    return {
-        symbol.replace(':USDT', ''): data['last']
-        for symbol, data in tickers.items()
-        if symbol.endswith(quote_currency) and data['last'] is not None
-    }
 
-def get_common_symbols(bybit_tickers, okx_tickers):
-    bybit_symbols = {s for s in bybit_tickers}
-    okx_symbols = {s for s in okx_tickers}
-    return bybit_symbols & okx_symbols
-
-def compare_prices():
-    print("Fetching prices...")
-    bybit_tickers = fetch_perpetual_tickers(bybit, 'USDT')
-    okx_tickers = fetch_perpetual_tickers(okx, 'USDT')
     
-    common_symbols = get_common_symbols(bybit_tickers, okx_tickers)
-
-    print(f"\n🔍 Comparing {len(common_symbols)} common perpetual futures...\n")
-
-    for sym in sorted(common_symbols):
-        bybit_sym = f"{sym}"
-        okx_sym = f"{sym}"
+def __spreads_scanned(scanner: SpreadScanner, spreads: list):
+    latency = ', '.join(
+        f"{name} {elapsed * 1000:.0f}ms" if elapsed is not None else f"{name} FAILED"
+        for name, elapsed in scanner.latency.items()
+    )
+    print(f"\n🔍 {len(spreads)} of {scanner.common} common perpetual futures above {scanner.threshold * 100:.2f}% | {latency}")
+    for spread in spreads:
+        print(f"📈 {spread.symbol}: {spread.high_venue} = {spread.high:.6g}, {spread.low_venue} = {spread.low:.6g}, Δ = {spread.spread * 100:.2f}%")
 
-        try:
-            price_bybit = bybit_tickers[bybit_sym]
-            price_okx = okx_tickers[okx_sym]
-        except KeyError:
-            continue
+def scan_spreads(iterations: int = None):
+    """Scans the cross-exchange spreads of all configured venues on a fixed schedule."""
+    scanner = SpreadScanner(
+        [create_venue(name, url) for name, url in model['config']['spread_venues'].items()],
+        model['config']['spread_threshold'],
+        model['config']['spread_interval']
+    )
+    run_until_complete(lambda: scanner.run(lambda spreads: __spreads_scanned(scanner, spreads), iterations))
 
-        spread_pct = abs(price_bybit - price_okx) / ((price_bybit + price_okx) / 2)
+def __start_spread_scanner():
+    """Runs the spread scanner on its own thread and event loop, next to the pipeline."""
+    threading.Thread(target=scan_spreads, name='spread-scanner', daemon=True).start()
 
-        if spread_pct > THRESHOLD:
-            print(f"📈 {sym}: Bybit = {price_bybit:.2f}, OKX = {price_okx:.2f}, Δ = {spread_pct * 100:.2f}%")
+def __initialize(args):
+    model['config']['batch_mode'] = args.batch
+    model['config']['sound_enabled'] = not args.mute
+    if args.store:
+        model['store'] = CandleStore(args.store)
+    if args.ws_uri:
+        model['config']['ws_base_uri'] = args.ws_uri
+    if args.record and not args.workers:
+        # Workers record their own streams, see run_worker
+        model['recorder'] = FrameRecorder(args.record)
+    if args.webhook:
+        model['config']['webhook_url'] = args.webhook
+    if args.rules:
+        with open(args.rules) as file:
+            model['config']['rules'] = json.load(file)
+    for venue in args.venue or []:
+        name, _, url = venue.partition('=')
+        model['config']['spread_venues'][name] = url
+    __start_notifications()
     
+    if args.replay:
+        __ws_replay(MarketType.FUTURES, args.replay, args.replay_speed)
+        return
     
-
-def __initialize(args):
-    compare_prices()
-     
-    # try:
-    #     __fetch_symbols(MarketType.FUTURES)
-    #     __ws_connection_reset(MarketType.FUTURES)
-        
-    #     executor = ThreadPoolExecutor(max_workers=1)
-    #     executor.submit(lambda: run_until_complete(lambda: __fetch_candles(MarketType.FUTURES)))
-    #     executor.shutdown(wait=True)
-    # finally:
-    #     print("Starting Flask application (REST API endpoints)...")
-    #     app.run(debug=args.debug, port=5003)
+    if args.workers:
+        __fetch_symbols(MarketType.FUTURES)
+        __start_workers(MarketType.FUTURES, args.workers, args.store, args.record)
+        # Workers scan and raise signals, this process only publishes snapshots for the API
+        __start_scanner(MarketType.FUTURES, scan=False)
+        __start_spread_scanner()
+        print("Starting Flask application (REST API endpoints)...")
+        create_app().run(debug=args.debug, port=5003, use_reloader=False)
+        return
+    
+    # History first: streams only start writing the rings once backfill is done with them
+    __fetch_symbols(MarketType.FUTURES)
+    __start_spread_scanner()
+    run_until_complete(lambda: __fetch_candles(MarketType.FUTURES))
+    __ws_connection_reset(MarketType.FUTURES)
+    __start_scanner(MarketType.FUTURES)
+    print("Starting Flask application (REST API endpoints)...")
+    create_app().run(debug=args.debug, port=5003, use_reloader=False)
 
 def main():
+    global model
+    model = create_model()
     try:
         print("Starting application...")
         
         # Configure argument parser
         parser = argparse.ArgumentParser(description="Default argument parser")
         parser.add_argument('--debug', action='store_true', help='Is debug mode enabled')
+        parser.add_argument('--store', metavar='DIR', help='Persist closed candles to DIR and warm start from it')
+        parser.add_argument('--batch', action='store_true', help='Evaluate indicators for all symbols on a fixed tick instead of per message')
+        parser.add_argument('--mute', action='store_true', help='Do not play sound alerts')
+        parser.add_argument('--webhook', metavar='URL', help='POST every signal as JSON to URL')
+        parser.add_argument('--rules', metavar='FILE', help='JSON list of signal rules ({"name", "side", "when"}) replacing the default ones')
+        parser.add_argument('--ws-uri', metavar='URI', help='Combined stream endpoint, e.g. a local replay server')
+        parser.add_argument('--record', metavar='FILE', help='Record raw websocket frames to a gzip FILE (FILE-worker<i> per worker process with --workers)')
+        parser.add_argument('--replay', metavar='FILE', help='Feed recorded frames through the pipeline instead of Binance')
+        parser.add_argument('--replay-speed', type=float, default=1.0, help='Replay speed multiplier, 0 for as fast as possible')
+        parser.add_argument('--workers', type=int, metavar='K', help='Partition the symbols over K worker processes sharing one metrics table')
+        parser.add_argument('--venue', action='append', metavar='NAME=URL', help='Ticker endpoint of a spread scanner venue (binance, bybit, okx), e.g. a local stand-in server')
 
         __initialize(parser.parse_args())
 
     except KeyboardInterrupt:
         print("[KeyboardInterrupt] caught in main. Exiting application...")
+    finally:
+        model['notifier'].stop()
+        if model['workers'] is not None:
+            model['workers'].stop()
+        if model['recorder'] is not None:
+            model['recorder'].close()
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,19 @@
+import argparse
+import asyncio
+
+from app.replay import serve_frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Local websocket stand-in that replays recorded Binance frames")
+    parser.add_argument('frames', metavar='FILE', help='Frames recorded with trade-entry-indicator --record')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9443)
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed multiplier, 0 for as fast as possible')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_frames(args.frames, args.host, args.port, args.speed))
+    except KeyboardInterrupt:
+        print("[KeyboardInterrupt] caught in main. Exiting replay server...")
+
+if __name__ == "__main__":
+    main()
@@ -48,7 +48,7 @@ setup(
         'werkzeug==3.0.3',
         'yarl==1.9.4',
     ],
-    py_modules=['scripts.main'],
+    py_modules=['scripts.config', 'scripts.main'],
     entry_points={
         'console_scripts': [
             'trade-entry-indicator=scripts.main:main',
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from app.backtest import as_of_candles, evaluate_series, debounce_signals
+from app.enums import TimeFrame
+from app.indicators import IndicatorEngine, create_indicator
+from app.model import CANDLE_DTYPE
+
+# Aligned to 5m, so the first bucket is complete
+STARTED = 1_700_000_100_000 - 1_700_000_100_000 % 300000
+
+def _candles(minutes: list, seed: int = 5) -> np.ndarray:
+    rng = random.Random(seed)
+    candles = np.zeros(len(minutes), dtype=CANDLE_DTYPE)
+    price = 30000.0
+    for index, minute in enumerate(minutes):
+        open = price
+        price *= 1 + rng.gauss(0, 0.002)
+        candles[index] = (
+            STARTED + minute * 60000, open, max(open, price) * 1.001, min(open, price) * 0.999, price, rng.uniform(1, 10)
+        )
+    return candles
+
+def test_as_of_candles_builds_the_partial_bucket_of_every_base_candle():
+    # Minute 3 is missing, minutes 5-6 start the second bucket
+    candles = _candles([0, 1, 2, 4, 5, 6])
+    partial, segment, ends = as_of_candles(candles, 300000)
+    assert segment.tolist() == [0, 0, 0, 0, 1, 1]
+    assert ends.tolist() == [3, 5]
+    assert partial['open_time'].tolist() == [STARTED] * 4 + [STARTED + 300000] * 2
+    for row in range(len(candles)):
+        first = 0 if row < 4 else 4
+        bucket = candles[first:row + 1]
+        assert partial['open'][row] == bucket['open'][0]
+        assert partial['high'][row] == bucket['high'].max()
+        assert partial['low'][row] == bucket['low'].min()
+        assert partial['close'][row] == bucket['close'][-1]
+        assert np.isclose(partial['volume'][row], bucket['volume'].sum())
+
+def test_evaluate_series_matches_pandas_and_the_live_5m_window():
+    candles = _candles(list(range(150)))
+    engine = IndicatorEngine([create_indicator('bb', window=20, std_dev_factor=2)])
+    table = evaluate_series(candles, engine, [TimeFrame.MIN_1, TimeFrame.MIN_5], TimeFrame.MIN_1, chunk=64)
+    closes = pd.Series(candles['close'])
+    sma = table.values[:, table.interval_index[TimeFrame.MIN_1], table.field_index['bb.sma']]
+    std = table.values[:, table.interval_index[TimeFrame.MIN_1], table.field_index['bb.std']]
+    assert np.allclose(sma[19:], closes.rolling(20).mean()[19:], rtol=1e-12)
+    assert np.allclose(std[19:], closes.rolling(20).std()[19:], rtol=1e-9)
+    assert np.isnan(sma[:19]).all()
+
+    # 5m: the closes of the closed buckets plus the partial bucket as of the row
+    five = table.interval_index[TimeFrame.MIN_5]
+    for row in (95, 99, 100, 103, 149):
+        bucket_closes = closes[4:row - row % 5:5].tolist()
+        window = (bucket_closes + [closes[row]])[-20:]
+        assert np.isclose(table.values[row, five, table.field_index['bb.sma']], np.mean(window), rtol=1e-12)
+        assert np.isclose(table.values[row, five, table.field_index['bb.std']], pd.Series(window).std(), rtol=1e-9)
+    # 18 closed 5m candles and the partial one as of row 94
+    assert np.isnan(table.values[94, five, table.field_index['bb.sma']])
+
+def test_debounce_fires_the_first_rule_once_per_period():
+    open_times = STARTED + np.arange(6) * 60000
+    first = np.array([False, True, True, False, False, False])
+    second = np.array([True, True, False, False, True, True])
+    fired = debounce_signals([first, second], open_times, 60000)
+    # Row 1 matches both rules and fires once, for the first one
+    assert [rows.tolist() for rows in fired] == [[1, 2], [0, 4, 5]]
+    # A 5m period lets a symbol fire once per bucket
+    fired = debounce_signals([first, second], open_times, 300000)
+    assert [rows.tolist() for rows in fired] == [[], [0, 5]]
+    assert debounce_signals([], open_times, 60000) == []
+    assert [rows.tolist() for rows in debounce_signals([np.zeros(6, dtype=bool)], open_times, 60000)] == [[]]
@@ -0,0 +1,68 @@
+import math
+import random
+
+import numpy as np
+import pandas as pd
+
+from app.indicators import IncrementalBollinger
+
+WINDOW = 20
+
+def _expected(closes: list) -> tuple:
+    rolling = pd.Series(closes, dtype=float).rolling(WINDOW)
+    return rolling.mean().iloc[-1], rolling.std().iloc[-1]
+
+def _assert_matches(bands: IncrementalBollinger, closes: list):
+    sma, std = _expected(closes)
+    assert math.isclose(bands.sma, sma, rel_tol=1e-9)
+    assert math.isclose(bands.std, std, rel_tol=1e-7, abs_tol=1e-9)
+    assert math.isclose(bands.upper, sma + 2 * std, rel_tol=1e-9)
+    assert math.isclose(bands.lower, sma - 2 * std, rel_tol=1e-9)
+
+def test_push_replace_and_reset_match_pandas_rolling():
+    rng = random.Random(7)
+    bands = IncrementalBollinger(WINDOW, 2)
+    closes = [30000.0 + rng.gauss(0, 5) for _ in range(WINDOW)]
+    bands.reset(0, closes)
+    _assert_matches(bands, closes)
+    open_time = 0
+    for step in range(2000):
+        close = closes[-1] * (1 + rng.gauss(0, 0.001))
+        action = rng.random()
+        if action < 0.6:
+            # Tick of the in-progress candle
+            closes[-1] = close
+            bands.replace(close)
+        elif action < 0.99:
+            open_time += 60000
+            closes.append(close)
+            bands.push(open_time, close)
+        else:
+            open_time += 60000
+            closes.append(close)
+            bands.reset(open_time, closes[-WINDOW:])
+        _assert_matches(bands, closes)
+
+def test_update_dispatches_on_open_time():
+    bands = IncrementalBollinger(WINDOW, 2)
+    closes = [float(value) for value in range(1, WINDOW + 1)]
+    bands.reset(WINDOW * 60000, closes)
+    bands.update(WINDOW * 60000, 42.0)
+    closes[-1] = 42.0
+    _assert_matches(bands, closes)
+    bands.update((WINDOW + 1) * 60000, 7.0)
+    closes.append(7.0)
+    _assert_matches(bands, closes)
+    # Candles older than the current one are ignored
+    bands.update(60000, 1000.0)
+    _assert_matches(bands, closes)
+
+def test_flat_window_and_warm_up():
+    bands = IncrementalBollinger(WINDOW, 2)
+    assert math.isnan(bands.sma) and math.isnan(bands.std)
+    bands.reset(0, [5.0] * 3)
+    assert not bands.ready
+    assert bands.sma == 5.0 and bands.std == 0.0
+    bands.reset(0, np.full(WINDOW, 0.1))
+    assert bands.ready
+    assert bands.std == 0.0 and bands.upper == bands.lower == bands.sma
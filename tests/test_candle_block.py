@@ -0,0 +1,97 @@
+import numpy as np
+
+from app.model import CandleBlock
+from app.model.candle_buffer import CANDLE_DTYPE
+
+def _candle(minute: int, close: float = None) -> tuple:
+    close = float(minute) if close is None else close
+    return (minute * 60000, close, close, close, close, 1.0)
+
+def _open_minutes(candles: np.ndarray) -> list:
+    return (candles['open_time'] // 60000).tolist()
+
+def test_ring_rolls_over_keeping_the_newest_candles():
+    block = CandleBlock(4, 2)
+    started = [block.upsert(0, _candle(minute)) for minute in range(7)]
+    assert started == [True] * 7
+    assert block.size[0] == 4
+    assert block.head[0] == 6 % 4
+    assert _open_minutes(block.window(0)) == [3, 4, 5, 6]
+    # The other row is untouched
+    assert block.size[1] == 0 and block.latest(1) is None
+
+def test_same_open_time_replaces_the_candle():
+    block = CandleBlock(4, 1)
+    block.upsert(0, _candle(1))
+    assert block.upsert(0, _candle(1, 5.0)) is False
+    assert block.size[0] == 1
+    assert block.latest(0)['close'] == 5.0
+
+def test_window_and_slots_are_ordered_oldest_to_newest():
+    block = CandleBlock(5, 1)
+    for minute in range(8):
+        block.upsert(0, _candle(minute))
+    assert block.slots(0).tolist() == [3, 4, 0, 1, 2]
+    assert block.slots(0, 2).tolist() == [1, 2]
+    assert _open_minutes(block.window(0, 3)) == [5, 6, 7]
+    # More than stored is clamped to the ring size
+    assert _open_minutes(block.window(0, 50)) == [3, 4, 5, 6, 7]
+
+def test_history_inserts_out_of_order_candles():
+    block = CandleBlock(5, 1)
+    for minute in (10, 12, 14):
+        block.upsert(0, _candle(minute))
+    # Older candles are merged into place without moving the head forward
+    assert block.upsert(0, _candle(11)) is False
+    assert block.upsert(0, _candle(13)) is False
+    assert _open_minutes(block.window(0)) == [10, 11, 12, 13, 14]
+    # An existing older candle is overwritten in place
+    block.upsert(0, _candle(12, 99.0))
+    assert block.window(0)['close'].tolist() == [10.0, 11.0, 99.0, 13.0, 14.0]
+    # A full ring drops history older than its oldest candle
+    block.upsert(0, _candle(9))
+    assert _open_minutes(block.window(0)) == [10, 11, 12, 13, 14]
+    # A new candle evicts the oldest one, which then no longer fits either
+    block.upsert(0, _candle(15))
+    block.upsert(0, _candle(10))
+    assert _open_minutes(block.window(0)) == [11, 12, 13, 14, 15]
+
+def test_matrix_pads_short_rings_with_nan():
+    block = CandleBlock(4, 2)
+    for minute in range(6):
+        block.upsert(0, _candle(minute))
+    block.upsert(1, _candle(1))
+    matrix = block.matrix('close', 3)
+    assert matrix[0].tolist() == [3.0, 4.0, 5.0]
+    assert np.isnan(matrix[1, :2]).all() and matrix[1, 2] == 1.0
+    matrices = block.matrices(['close', 'volume'], 3, np.array([1, 0]))
+    assert np.array_equal(matrices['close'], matrix[[1, 0]], equal_nan=True)
+
+def test_reserve_grows_rows_and_keeps_rings():
+    block = CandleBlock(3, 1)
+    for minute in range(5):
+        block.upsert(0, _candle(minute))
+    block.reserve(4)
+    assert block.rows == 4
+    assert _open_minutes(block.window(0)) == [2, 3, 4]
+    assert block.size[1:].tolist() == [0, 0, 0]
+    assert block.head[1:].tolist() == [-1, -1, -1]
+    block.upsert(3, _candle(7))
+    assert _open_minutes(block.window(3)) == [7]
+    # Shrinking is a no-op
+    block.reserve(2)
+    assert block.rows == 4
+
+def test_assign_clear_and_snapshot():
+    block = CandleBlock(3, 2)
+    history = np.array([_candle(minute) for minute in range(5)], dtype=CANDLE_DTYPE)
+    block.assign(1, history)
+    assert _open_minutes(block.window(1)) == [2, 3, 4]
+    snapshot = block.snapshot(2)
+    block.upsert(1, _candle(5))
+    block.clear(0)
+    # The snapshot is a read-only copy
+    assert _open_minutes(snapshot.window(1)) == [2, 3, 4]
+    assert not snapshot.candles.flags.writeable
+    assert _open_minutes(block.window(1)) == [3, 4, 5]
+    assert block.size[0] == 0
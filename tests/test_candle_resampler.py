@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+
+from app.enums import MarketType, TimeFrame, EventType
+from app.model import CandleBuffer, CandleResampler, UpdateEvent
+
+MARKET = MarketType.FUTURES
+SYMBOL = 'AAAUSDT'
+INTERVALS = [TimeFrame.MIN_1, TimeFrame.MIN_5]
+# Aligned to 5m, so the first bucket is complete
+STARTED = 1_700_000_100_000 - 1_700_000_100_000 % 300000
+
+def _pipeline() -> tuple:
+    buffer = CandleBuffer(20, capacities={TimeFrame.MIN_1: 100})
+    return buffer, CandleResampler(buffer, INTERVALS, TimeFrame.MIN_1)
+
+def _ticks(minutes: int, missing: set, seed: int = 3) -> list:
+    """(open_time, open, high, low, close, volume, closed) base candle updates, a few ticks per minute."""
+    rng = random.Random(seed)
+    price = 100.0
+    ticks = []
+    for minute in range(minutes):
+        if minute in missing:
+            continue
+        open_time = STARTED + minute * 60000
+        open = high = low = price
+        volume = 0.0
+        for tick in range(4):
+            price *= 1 + rng.gauss(0, 0.002)
+            high, low = max(high, price), min(low, price)
+            volume += rng.uniform(1, 10)
+            ticks.append((open_time, open, high, low, price, volume, tick == 3))
+    return ticks
+
+def _stream(buffer: CandleBuffer, resampler: CandleResampler, ticks: list) -> list:
+    closed = []
+    for open_time, open, high, low, close, volume, final in ticks:
+        buffer.upsert(MARKET, SYMBOL, TimeFrame.MIN_1, open_time, open, high, low, close, volume)
+        event = UpdateEvent.create_update_event(
+            EventType.CANDLE_CLOSED if final else EventType.CANDLE_TICK, MARKET, SYMBOL, TimeFrame.MIN_1
+        )
+        for derived in resampler.update(event):
+            if derived.event_type == EventType.CANDLE_CLOSED:
+                closed.append(buffer.latest(MARKET, SYMBOL, derived.interval)['open_time'])
+    return closed
+
+def _rebuilt(ticks: list) -> np.ndarray:
+    buffer, resampler = _pipeline()
+    for open_time, open, high, low, close, volume, _ in ticks:
+        buffer.upsert(MARKET, SYMBOL, TimeFrame.MIN_1, open_time, open, high, low, close, volume)
+    resampler.rebuild(MARKET, SYMBOL)
+    return buffer.window(MARKET, SYMBOL, TimeFrame.MIN_5)
+
+def _assert_same_candles(actual: np.ndarray, expected: np.ndarray):
+    assert actual['open_time'].tolist() == expected['open_time'].tolist()
+    for field in ('open', 'high', 'low', 'close', 'volume'):
+        assert np.allclose(actual[field], expected[field], rtol=1e-12), field
+
+def test_incremental_update_matches_rebuild_with_a_missing_minute():
+    # Minute 7 is missing, 32 leaves the last bucket in progress
+    ticks = _ticks(33, missing={7})
+    buffer, resampler = _pipeline()
+    closed = _stream(buffer, resampler, ticks)
+    _assert_same_candles(buffer.window(MARKET, SYMBOL, TimeFrame.MIN_5), _rebuilt(ticks))
+    assert len(buffer.window(MARKET, SYMBOL, TimeFrame.MIN_5)) == 7
+    # A bucket closes with its last base candle
+    assert closed == [STARTED + bucket * 300000 for bucket in range(6)]
+
+def test_every_tick_matches_rebuild():
+    ticks = _ticks(12, missing={4, 5})
+    buffer, resampler = _pipeline()
+    for index in range(len(ticks)):
+        _stream(buffer, resampler, ticks[index:index + 1])
+        _assert_same_candles(buffer.window(MARKET, SYMBOL, TimeFrame.MIN_5), _rebuilt(ticks[:index + 1]))
+
+def test_updates_continue_from_a_rebuild():
+    ticks = _ticks(23, missing={11})
+    buffer, resampler = _pipeline()
+    # Warm start mid-bucket, then stream the rest
+    head = 10 * 4 + 2
+    for open_time, open, high, low, close, volume, _ in ticks[:head]:
+        buffer.upsert(MARKET, SYMBOL, TimeFrame.MIN_1, open_time, open, high, low, close, volume)
+    resampler.rebuild(MARKET, SYMBOL)
+    _stream(buffer, resampler, ticks[head:])
+    _assert_same_candles(buffer.window(MARKET, SYMBOL, TimeFrame.MIN_5), _rebuilt(ticks))
@@ -0,0 +1,77 @@
+import pytest
+
+from app.enums import TimeFrame
+from app.model import MetricsTable
+from app.signals import compile_rule
+
+INTERVALS = [TimeFrame.MIN_1, TimeFrame.MIN_5]
+FIELDS = ['open_time', 'close', 'bb.upper', 'bb.lower', 'bb.width']
+
+def _table(rows: list) -> MetricsTable:
+    """`rows` are {(interval, field): value} dicts, missing values stay NaN."""
+    table = MetricsTable(INTERVALS, FIELDS, len(rows))
+    for row, values in enumerate(rows):
+        for (interval, field), value in values.items():
+            table.values[row, table.interval_index[interval], table.field_index[field]] = value
+    return table
+
+def _compile(expression: str, table: MetricsTable):
+    return compile_rule(expression, table.interval_index, table.field_index, TimeFrame.MIN_1)
+
+def test_interval_suffix_and_default_interval():
+    table = _table([
+        {(TimeFrame.MIN_1, 'close'): 10, (TimeFrame.MIN_1, 'bb.upper'): 9, (TimeFrame.MIN_5, 'bb.upper'): 11},
+        {(TimeFrame.MIN_1, 'close'): 12, (TimeFrame.MIN_1, 'bb.upper'): 9, (TimeFrame.MIN_5, 'bb.upper'): 11},
+    ])
+    rule = _compile("close >= bb.upper and close >= bb.upper[5m]", table)
+    assert rule(table.values).tolist() == [False, True]
+    assert sorted(rule.columns) == [(0, 1), (0, 2), (1, 2)]
+
+def test_percent_constants_compare_to_widths_in_percent():
+    table = _table([
+        {(TimeFrame.MIN_1, 'bb.width'): 0.01},
+        {(TimeFrame.MIN_1, 'bb.width'): 0.03},
+    ])
+    assert _compile("bb.width[1m] > 0.02%", table)(table.values).tolist() == [False, True]
+
+def test_chained_comparisons_boolean_operators_and_arithmetic():
+    table = _table([
+        {(TimeFrame.MIN_1, 'close'): close, (TimeFrame.MIN_1, 'bb.lower'): 8, (TimeFrame.MIN_1, 'bb.upper'): 12}
+        for close in (7, 10, 13)
+    ])
+    assert _compile("bb.lower < close < bb.upper", table)(table.values).tolist() == [False, True, False]
+    assert _compile("not (bb.lower < close < bb.upper)", table)(table.values).tolist() == [True, False, True]
+    assert _compile("close <= bb.lower or close >= bb.upper", table)(table.values).tolist() == [True, False, True]
+    assert _compile("abs(close - (bb.upper + bb.lower) / 2) > 2.5", table)(table.values).tolist() == [True, False, True]
+
+def test_missing_metrics_never_match():
+    table = _table([
+        {(TimeFrame.MIN_1, 'close'): 10, (TimeFrame.MIN_1, 'bb.upper'): 9},
+        {(TimeFrame.MIN_1, 'close'): 10},
+    ])
+    # NaN compares False, but even a negated comparison must not match on a missing input
+    rule = _compile("not close < bb.upper", table)
+    assert rule(table.values).tolist() == [True, False]
+
+def test_constant_rule_broadcasts_over_rows():
+    table = _table([{(TimeFrame.MIN_1, 'close'): 1}] * 3)
+    assert _compile("close > 0 or 1 > 0", table)(table.values).tolist() == [True, True, True]
+
+@pytest.mark.parametrize('expression', [
+    "close > rsi",
+    "close > bb.upper[4h]",
+    "close > bb.upper[15m]",
+    "close.__class__ > 0",
+    "__import__('os')",
+    "close > 'a'",
+    "close > True",
+    "close ** 2 > 1",
+    "close in bb.upper",
+    "max(close) > 1",
+    "close >",
+    "[close] > 1",
+])
+def test_unsupported_expressions_raise_value_error(expression: str):
+    table = _table([{}])
+    with pytest.raises(ValueError):
+        _compile(expression, table)
@@ -0,0 +1,72 @@
+import numpy as np
+
+from app.enums import MarketType, TimeFrame
+from app.model import MetricsTable
+from app.signals import SignalRule, RuleEngine
+
+INTERVALS = [TimeFrame.MIN_1]
+FIELDS = ['close', 'bb.upper', 'bb.lower']
+
+def _engine(rows: int) -> tuple:
+    table = MetricsTable(INTERVALS, FIELDS, rows)
+    table.values[:, 0, table.field_index['bb.upper']] = 10
+    table.values[:, 0, table.field_index['bb.lower']] = 5
+    engine = RuleEngine([
+        SignalRule('upper', 'SELL', 'close >= bb.upper'),
+        SignalRule('wide', 'SELL', 'close >= bb.lower'),
+    ], table)
+    return table, engine
+
+def _closes(table: MetricsTable, closes: list):
+    table.values[:len(closes), 0, table.field_index['close']] = closes
+
+def _fired(matches: list) -> dict:
+    return {rule.name: rows.tolist() for rule, rows in matches}
+
+def test_symbol_fires_once_per_period_across_rules():
+    table, engine = _engine(3)
+    _closes(table, [11, 6, 1])
+    # Row 0 matches both rules but signals once, for the first rule
+    assert _fired(engine.evaluate(table, 100)) == {'upper': [0], 'wide': [1]}
+    assert engine.evaluate(table, 100) == []
+    assert _fired(engine.evaluate(table, 160)) == {'upper': [0], 'wide': [1]}
+
+def test_subset_of_rows():
+    table, engine = _engine(3)
+    _closes(table, [11, 11, 11])
+    assert _fired(engine.evaluate(table, 100, np.array([1]))) == {'upper': [1]}
+    assert _fired(engine.evaluate(table, 100)) == {'upper': [0, 2]}
+
+def test_table_growth_keeps_debounce():
+    table, engine = _engine(2)
+    _closes(table, [11, 11])
+    assert _fired(engine.evaluate(table, 100)) == {'upper': [0, 1]}
+    table.reserve(5)
+    table.values[2:, 0, :] = [11, 10, 5]
+    assert _fired(engine.evaluate(table, 100)) == {'upper': [2, 3, 4]}
+
+def _kline(symbol: str, open_time: int, close: float, closed: bool) -> str:
+    """Combined stream 1m kline frame, shaped like Binance's."""
+    return (
+        f'{{"stream":"{symbol.lower()}@kline_1m","data":{{"e":"kline","E":{open_time + 30000},'
+        f'"s":"{symbol}","k":{{"t":{open_time},"T":{open_time + 59999},"s":"{symbol}",'
+        f'"i":"1m","f":1,"L":2,"o":"{close}","c":"{close}","h":"{close}","l":"{close}","v":"100.0","n":10,'
+        f'"x":{"true" if closed else "false"},"q":"1000.0","V":"50.0","Q":"500.0","B":"0"}}}}}}'
+    )
+
+def test_default_rules_signal_a_mid_candle_band_crossing(monkeypatch):
+    import scripts.main as pipeline
+
+    monkeypatch.setattr(pipeline, 'model', pipeline.create_model({'sound_enabled': False}))
+    handle = getattr(pipeline, '__ws_message_received')
+    started = 1_700_000_100_000 - 1_700_000_100_000 % 300000
+    # Enough closed 1m candles for max_candles 5m candles, alternating closes keep the bands open
+    minutes = pipeline.model['ohlc'].block(MarketType.FUTURES, TimeFrame.MIN_1).capacity
+    for minute in range(minutes):
+        handle(_kline('AAAUSDT', started + minute * 60000, 100.2 if minute % 2 else 100.0, True), MarketType.FUTURES)
+    assert pipeline.model['signals'].recent() == []
+
+    # A tick of the next, still open candle closes above the 1m and 5m upper bands
+    handle(_kline('AAAUSDT', started + minutes * 60000, 101.0, False), MarketType.FUTURES)
+    signals = [signal for _, signal in pipeline.model['signals'].recent()]
+    assert [(signal.symbol, signal.side, signal.rule) for signal in signals] == [('AAAUSDT', 'SELL', 'bb_upper_1m_5m')]
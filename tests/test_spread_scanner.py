@@ -0,0 +1,79 @@
+import asyncio
+import math
+
+import pytest
+from aiohttp import web
+
+from app.client import http_client
+from app.model import Spread
+from app.spread import SpreadScanner, TickerVenue, create_venue
+
+BINANCE = [
+    {'symbol': 'BTCUSDT', 'lastPrice': '100.0'},
+    {'symbol': 'ETHUSDT', 'lastPrice': '10.0'},
+    {'symbol': 'SOLUSDT', 'lastPrice': '5.0'},
+    {'symbol': 'BTCUSDC', 'lastPrice': '999.0'},
+]
+BYBIT = {'result': {'list': [
+    {'symbol': 'BTCUSDT', 'lastPrice': '100.1'},
+    {'symbol': 'ETHUSDT', 'lastPrice': '10.5'},
+    {'symbol': 'XRPUSDT', 'lastPrice': '1.0'},
+]}}
+OKX = {'data': [
+    {'instId': 'BTC-USDT-SWAP', 'last': '99.5'},
+    {'instId': 'XRP-USDT-SWAP', 'last': '1.0001'},
+    {'instId': 'ETH-USD-SWAP', 'last': '1.0'},
+    {'instId': 'SOL-USDT-SWAP', 'last': ''},
+]}
+
+def _json(payload):
+    async def handler(request):
+        return web.json_response(payload)
+    return handler
+
+async def _serve() -> tuple:
+    """Local stand-in for the ticker endpoints of all three venues, returns (runner, base url)."""
+    app = web.Application()
+    app.router.add_get('/binance/ticker/24hr', _json(BINANCE))
+    app.router.add_get('/bybit/v5/market/tickers', _json(BYBIT))
+    app.router.add_get('/okx/api/v5/market/tickers', _json(OKX))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+async def _scan(venues: dict, threshold: float) -> tuple:
+    """Scans `venues` (name -> url, None for the local stand-in) once, returns (scanner, spreads)."""
+    runner, url = await _serve()
+    try:
+        scanner = SpreadScanner([
+            create_venue(name, venue_url or f"{url}/{name}") for name, venue_url in venues.items()
+        ], threshold)
+        return scanner, await scanner.scan()
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+def test_spreads_across_local_venues():
+    scanner, spreads = asyncio.run(_scan({'binance': None, 'bybit': None, 'okx': None}, 0.002))
+    # BTC, ETH and XRP are quoted on two venues or more; SOL has no OKX price, USDC and USD pairs are skipped
+    assert scanner.common == 3
+    assert [spread.symbol for spread in spreads] == ['ETHUSDT', 'BTCUSDT']
+    eth, btc = spreads
+    assert (eth.high_venue, eth.high, eth.low_venue, eth.low) == ('bybit', 10.5, 'binance', 10.0)
+    assert math.isclose(eth.spread, 0.5 / 10.25)
+    assert (btc.high_venue, btc.high, btc.low_venue, btc.low) == ('bybit', 100.1, 'okx', 99.5)
+    assert math.isclose(btc.spread, 0.6 / 99.8)
+    assert all(isinstance(spread, Spread) for spread in spreads)
+
+def test_failing_venue_is_left_out():
+    # Nothing listens on the OKX url, the scan goes on with the other venues
+    scanner, spreads = asyncio.run(_scan({'binance': None, 'bybit': None, 'okx': 'http://127.0.0.1:9'}, 0.01))
+    assert scanner.latency['okx'] is None
+    assert scanner.common == 2
+    assert [spread.symbol for spread in spreads] == ['ETHUSDT']
+
+def test_venue_requires_fetch():
+    with pytest.raises(TypeError):
+        TickerVenue('stub', 'http://localhost')
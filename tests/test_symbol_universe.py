@@ -0,0 +1,69 @@
+from app.universe import SymbolUniverse
+
+def _tickers(volumes: dict) -> list:
+    """!miniTicker@arr items ('s' symbol, 'q' 24h quote volume as a string)."""
+    return [{'s': symbol, 'q': str(volume)} for symbol, volume in volumes.items()]
+
+def test_fills_up_to_size_with_the_highest_volumes():
+    universe = SymbolUniverse(size=3)
+    added, removed = universe.update(_tickers({'AUSDT': 10, 'BUSDT': 50, 'CUSDT': 30, 'DUSDT': 20, 'EUSDT': 40}))
+    assert sorted(added) == ['BUSDT', 'CUSDT', 'EUSDT']
+    assert removed == []
+    assert universe.ranking() == ['BUSDT', 'EUSDT', 'CUSDT']
+
+def test_rest_payload_and_other_quotes():
+    universe = SymbolUniverse(size=2)
+    universe.update([
+        {'symbol': 'AUSDT', 'quoteVolume': '10'},
+        {'symbol': 'BBTC', 'quoteVolume': '1000'},
+        {'symbol': 'CUSDT', 'quoteVolume': '20'},
+    ])
+    assert universe.ranking() == ['CUSDT', 'AUSDT']
+
+def test_challenger_replaces_the_weakest_member_only_above_hysteresis():
+    universe = SymbolUniverse(size=2, hysteresis=0.1)
+    universe.update(_tickers({'AUSDT': 100, 'BUSDT': 200, 'CUSDT': 50}))
+    # 9% above the weakest member: no change
+    assert universe.update(_tickers({'CUSDT': 109})) == ([], [])
+    # Exactly 10% above is still not enough
+    assert universe.update(_tickers({'CUSDT': 110})) == ([], [])
+    assert universe.update(_tickers({'CUSDT': 111})) == (['CUSDT'], ['AUSDT'])
+    assert universe.ranking() == ['BUSDT', 'CUSDT']
+
+def test_symbols_around_the_cutoff_do_not_flap():
+    universe = SymbolUniverse(size=2, hysteresis=0.1)
+    universe.update(_tickers({'AUSDT': 1000, 'BUSDT': 100, 'CUSDT': 100}))
+    member = 'BUSDT' if 'BUSDT' in universe.members else 'CUSDT'
+    other = 'CUSDT' if member == 'BUSDT' else 'BUSDT'
+    changes = 0
+    for step in range(100):
+        # The two symbols keep overtaking each other by 5%
+        ahead, behind = (member, other) if step % 2 else (other, member)
+        added, removed = universe.update(_tickers({ahead: 105 + step, behind: 100 + step}))
+        changes += len(added) + len(removed)
+    assert changes == 0
+    assert member in universe.members
+
+def test_deltas_report_only_membership_changes():
+    universe = SymbolUniverse(size=2, hysteresis=0.0)
+    universe.update(_tickers({'AUSDT': 30, 'BUSDT': 20, 'CUSDT': 10}))
+    # Volume changes inside the universe are no delta
+    assert universe.update(_tickers({'AUSDT': 15, 'BUSDT': 25})) == ([], [])
+    assert universe.update(_tickers({'AUSDT': 15, 'BUSDT': 25})) == ([], [])
+    # Two challengers replace both members at once
+    added, removed = universe.update(_tickers({'CUSDT': 40, 'DUSDT': 50}))
+    assert sorted(added) == ['CUSDT', 'DUSDT']
+    assert sorted(removed) == ['AUSDT', 'BUSDT']
+
+def test_matches_a_full_sort_without_hysteresis():
+    universe = SymbolUniverse(size=5, hysteresis=0.0)
+    volumes = {f"S{index}USDT": (index * 37) % 101 + 1 for index in range(40)}
+    members = set()
+    for round_ in range(20):
+        volumes = {symbol: (volume * 13 + round_) % 211 + 1 for symbol, volume in volumes.items()}
+        added, removed = universe.update(_tickers(volumes))
+        members = (members | set(added)) - set(removed)
+        expected = sorted(volumes, key=lambda symbol: (volumes[symbol], symbol), reverse=True)[:5]
+        # Ties may resolve to either symbol, so compare the volumes
+        assert sorted(volumes[symbol] for symbol in members) == sorted(volumes[symbol] for symbol in expected)
+        assert members == universe.members